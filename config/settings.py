@@ -14,12 +14,30 @@ class Settings:
     INVENTORY_SPREADSHEET_ID = os.getenv('INVENTORY_SPREADSHEET_ID', '1IMcXLIyOJOANhfxKfzYlwtBqtsXJfRMhCPmoKQdCtdY')
     MONITORS_SPREADSHEET_ID = os.getenv('MONITORS_SPREADSHEET_ID', '1hI6WWiH03AvXFxMCpPpYtIhQEU062C_k4utIE6YyctY')
     GOOGLE_CREDENTIALS_FILE = os.getenv('GOOGLE_CREDENTIALS_FILE', 'credentials.json')
+    SHEETS_HANDLE_TTL = int(os.getenv('SHEETS_HANDLE_TTL', '600'))
+    SHEETS_TOKEN_REFRESH_MARGIN = int(os.getenv('SHEETS_TOKEN_REFRESH_MARGIN', '300'))
+    SHEETS_POOL_CONNECTIONS = int(os.getenv('SHEETS_POOL_CONNECTIONS', '4'))
+    SHEETS_POOL_MAXSIZE = int(os.getenv('SHEETS_POOL_MAXSIZE', '16'))
+    SHEETS_SPOOL_FILE = os.getenv('SHEETS_SPOOL_FILE', '.cache/sheets_spool.jsonl')
+    SHEETS_BATCH_SIZE = int(os.getenv('SHEETS_BATCH_SIZE', '200'))
+    SHEETS_FLUSH_INTERVAL = float(os.getenv('SHEETS_FLUSH_INTERVAL', '5'))
+    SHEETS_WRITE_MAX_ATTEMPTS = int(os.getenv('SHEETS_WRITE_MAX_ATTEMPTS', '10'))
+    SHEETS_READ_QUOTA_PER_MINUTE = int(os.getenv('SHEETS_READ_QUOTA_PER_MINUTE', '60'))
+    SHEETS_WRITE_QUOTA_PER_MINUTE = int(os.getenv('SHEETS_WRITE_QUOTA_PER_MINUTE', '60'))
+    SHEETS_MAX_RETRIES = int(os.getenv('SHEETS_MAX_RETRIES', '5'))
+    SHEETS_BACKOFF_BASE = float(os.getenv('SHEETS_BACKOFF_BASE', '1.0'))
+    SHEETS_BACKOFF_MAX = float(os.getenv('SHEETS_BACKOFF_MAX', '64'))
     
     # JIRA
     JIRA_BASE_URL = os.getenv('JIRA_BASE_URL', 'https://nubank.atlassian.net')
     JIRA_EMAIL = os.getenv('JIRA_EMAIL', '')
     JIRA_API_TOKEN = os.getenv('JIRA_API_TOKEN', '')
     JIRA_PROJECT_KEY = os.getenv('JIRA_PROJECT_KEY', 'TS')
+    JIRA_PAGE_SIZE = int(os.getenv('JIRA_PAGE_SIZE', '100'))
+    JIRA_MAX_WORKERS = int(os.getenv('JIRA_MAX_WORKERS', '4'))
+    JIRA_HTTP_RETRIES = int(os.getenv('JIRA_HTTP_RETRIES', '3'))
+    JIRA_CACHE_FILE = os.getenv('JIRA_CACHE_FILE', '.cache/jira_issues.json')
+    JIRA_FULL_SYNC_INTERVAL = int(os.getenv('JIRA_FULL_SYNC_INTERVAL', '86400'))
     
     # Aplicação
     APP_TITLE = os.getenv('APP_TITLE', 'Sistema de Controle de Perdas')
@@ -29,6 +47,25 @@ class Settings:
     # Cache
     CACHE_TTL = int(os.getenv('CACHE_TTL', '300'))
     
+    # Carregamento concorrente (timeouts em segundos por fonte)
+    ASYNC_LOADER_WORKERS = int(os.getenv('ASYNC_LOADER_WORKERS', '8'))
+    GVIZ_TIMEOUT = float(os.getenv('GVIZ_TIMEOUT', '15'))
+    SHEETS_READ_TIMEOUT = float(os.getenv('SHEETS_READ_TIMEOUT', '30'))
+    JIRA_TIMEOUT = float(os.getenv('JIRA_TIMEOUT', '60'))
+    
+    # Armazenamento local
+    LOCAL_STORAGE_BACKEND = os.getenv('LOCAL_STORAGE_BACKEND', 'journal')  # journal | sqlite
+    LOCAL_SQLITE_FILE = os.getenv('LOCAL_SQLITE_FILE', 'inventory.db')
+    LOCAL_JOURNAL_FILE = os.getenv('LOCAL_JOURNAL_FILE', 'inventory_data.jsonl')
+    LOCAL_JOURNAL_FSYNC = os.getenv('LOCAL_JOURNAL_FSYNC', 'always')  # always | interval | never
+    LOCAL_JOURNAL_FSYNC_INTERVAL = float(os.getenv('LOCAL_JOURNAL_FSYNC_INTERVAL', '1.0'))
+    SHEETS_CACHE_DIR = os.getenv('SHEETS_CACHE_DIR', '.cache/sheets')
+    
+    # Importação de CSV (linhas por lote gravado; máximo de mensagens de erro guardadas)
+    CSV_IMPORT_CHUNK_SIZE = int(os.getenv('CSV_IMPORT_CHUNK_SIZE', '20000'))
+    CSV_IMPORT_MAX_ERRORS = int(os.getenv('CSV_IMPORT_MAX_ERRORS', '1000'))
+    CSV_IMPORT_WORKERS = int(os.getenv('CSV_IMPORT_WORKERS', '0'))  # 0 = núcleos da máquina
+    
     # Sheets names
     INVENTORY_SHEET_NAME = 'Inventory'
     MONITORS_SHEET_NAME = 'agenda ts'
@@ -4,69 +4,72 @@ Salvamento local e integração com Google Sheets
 """
 import streamlit as st
 import pandas as pd
+import io
+import itertools
 import json
 import os
 from datetime import datetime
-import gspread
-from google.oauth2.service_account import Credentials
+
+from config.settings import settings
+from services.sheets_client import sheets_client_provider
+from services.journal_store import JournalStore
+from services.rate_limiter import sheets_rate_limiter
+from services.sqlite_store import InventoryStore
+from services.sheets_sync import sheets_sync, to_records
+from services.write_queue import SheetsWriteQueue
+from services.inventory_repository import inventory_repository
 
 class DataManager:
     """Gerenciador de dados com múltiplas opções de persistência"""
     
     def __init__(self):
-        self.local_file = "inventory_data.json"
+        self.local_file = "inventory_data.json"  # Formato legado (lista JSON única)
+        self.journal = JournalStore(
+            settings.LOCAL_JOURNAL_FILE,
+            fsync_policy=settings.LOCAL_JOURNAL_FSYNC,
+            fsync_interval=settings.LOCAL_JOURNAL_FSYNC_INTERVAL,
+            key_field='inventoryId'
+        )
+        self.sqlite_store = None
+        if settings.LOCAL_STORAGE_BACKEND == 'sqlite':
+            self.sqlite_store = InventoryStore(settings.LOCAL_SQLITE_FILE)
         self.spreadsheet_id = '1IMcXLIyOJOANhfxKfzYlwtBqtsXJfRMhCPmoKQdCtdY'
         self.sheet_name = 'Inventory'
         self.gc = None
+        self.write_queue = SheetsWriteQueue(
+            self.spreadsheet_id,
+            self.sheet_name,
+            settings.SHEETS_SPOOL_FILE,
+            batch_size=settings.SHEETS_BATCH_SIZE,
+            flush_interval=settings.SHEETS_FLUSH_INTERVAL,
+            max_attempts=settings.SHEETS_WRITE_MAX_ATTEMPTS
+        )
+        self.write_queue.resume()
         
     def init_google_sheets(self):
-        """Inicializa conexão com Google Sheets"""
+        """Inicializa conexão com Google Sheets (cliente compartilhado do processo)"""
         try:
-            if hasattr(st, 'secrets') and 'google_sheets' in st.secrets:
-                # Produção - usar secrets do Streamlit
-                credentials_dict = dict(st.secrets['google_sheets'])
-                credentials = Credentials.from_service_account_info(
-                    credentials_dict,
-                    scopes=[
-                        'https://www.googleapis.com/auth/spreadsheets',
-                        'https://www.googleapis.com/auth/drive'
-                    ]
-                )
-            else:
-                # Desenvolvimento - usar arquivo local
-                if os.path.exists('credentials.json'):
-                    credentials = Credentials.from_service_account_file(
-                        'credentials.json',
-                        scopes=[
-                            'https://www.googleapis.com/auth/spreadsheets',
-                            'https://www.googleapis.com/auth/drive'
-                        ]
-                    )
-                else:
-                    return False
-            
-            self.gc = gspread.authorize(credentials)
-            return True
+            self.gc = sheets_client_provider.get_client()
+            return self.gc is not None
             
         except Exception as e:
             st.error(f"❌ Erro ao conectar Google Sheets: {e}")
             return False
     
+    def _get_worksheet(self):
+        """Obtém a aba de inventário a partir do cache de handles"""
+        return sheets_client_provider.get_worksheet(self.spreadsheet_id, self.sheet_name)
+    
     def save_to_local(self, data):
-        """Salva dados localmente"""
+        """Salva dados localmente (append no journal, custo independente do histórico)"""
         try:
-            # Carregar dados existentes
-            existing_data = self.load_from_local()
+            self._migrate_legacy_file()
             
-            # Adicionar novos dados
-            if isinstance(data, list):
-                existing_data.extend(data)
+            records = data if isinstance(data, list) else [data]
+            if self.sqlite_store is not None:
+                self.sqlite_store.insert_many(records)
             else:
-                existing_data.append(data)
-            
-            # Salvar arquivo
-            with open(self.local_file, 'w', encoding='utf-8') as f:
-                json.dump(existing_data, f, ensure_ascii=False, indent=2, default=str)
+                self.journal.append_many(records)
             
             return True
             
@@ -74,76 +77,150 @@ class DataManager:
             st.error(f"❌ Erro ao salvar localmente: {e}")
             return False
     
+    def iter_local(self):
+        """Percorre os dados locais em streaming"""
+        self._migrate_legacy_file()
+        
+        if self.sqlite_store is not None:
+            yield from self.sqlite_store.iter_records()
+            return
+        
+        for record in self.journal.iter_records():
+            yield record
+        
+        # A leitura completa atualiza a contagem de duplicados/corrompidos
+        self.journal.maybe_compact()
+    
     def load_from_local(self):
         """Carrega dados locais"""
         try:
-            if os.path.exists(self.local_file):
-                with open(self.local_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            return []
+            return list(self.iter_local())
         except Exception as e:
             st.error(f"❌ Erro ao carregar dados locais: {e}")
             return []
     
+    def _migrate_legacy_file(self):
+        """Importa o arquivo JSON legado para o armazenamento local (uma única vez)
+        
+        O arquivo é renomeado para .migrating antes da importação, e registros
+        sem inventoryId recebem um ID derivado da posição no arquivo. Se o
+        processo cair no meio, a próxima execução retoma a importação e as
+        linhas já gravadas são descartadas pela chave em vez de duplicadas.
+        """
+        migrating = f"{self.local_file}.migrating"
+        if os.path.exists(self.local_file):
+            os.replace(self.local_file, migrating)
+        
+        if not os.path.exists(migrating):
+            return
+        
+        with open(migrating, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+        
+        if not isinstance(records, list):
+            records = [records]
+        
+        records = [
+            record if not isinstance(record, dict) or record.get('inventoryId')
+            else dict(record, inventoryId=f"LEGACY_{index}")
+            for index, record in enumerate(records)
+        ]
+        
+        if self.sqlite_store is not None:
+            self.sqlite_store.import_records(records)
+        else:
+            self.journal.append_many(records)
+        os.replace(migrating, f"{self.local_file}.migrated")
+    
+    def import_to_sqlite(self, include_sheets=True):
+        """Importa journal/JSON local e Google Sheets para o banco SQLite"""
+        if self.sqlite_store is None:
+            self.sqlite_store = InventoryStore(settings.LOCAL_SQLITE_FILE)
+        
+        try:
+            imported = 0
+            
+            if os.path.exists(self.local_file):
+                with open(self.local_file, 'r', encoding='utf-8') as f:
+                    imported += self.sqlite_store.import_records(json.load(f))
+            
+            imported += self.sqlite_store.import_records(self.journal.iter_records())
+            
+            if include_sheets:
+                imported += self.sqlite_store.import_records(self.load_from_sheets())
+            
+            return imported
+            
+        except Exception as e:
+            st.error(f"❌ Erro ao importar para SQLite: {e}")
+            return 0
+    
+    def summarize_local(self, group_by, **filters):
+        """Agregação indexada no SQLite (None quando o backend não é SQLite)"""
+        if self.sqlite_store is None:
+            return None
+        
+        try:
+            return self.sqlite_store.summarize(group_by, **filters)
+        except Exception as e:
+            st.error(f"❌ Erro ao consultar dados locais: {e}")
+            return None
+    
     def save_to_sheets(self, data):
-        """Salva dados no Google Sheets"""
+        """Salva dados no Google Sheets
+        
+        As linhas entram na fila write-behind (spool local durável) e são
+        enviadas em lote por append_rows; a chamada não espera a planilha.
+        """
         try:
             if not self.gc and not self.init_google_sheets():
                 return False
             
-            spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
-            worksheet = spreadsheet.worksheet(self.sheet_name)
-            
             # Preparar dados para inserção
-            if isinstance(data, list):
-                # Múltiplos registros
-                rows_data = []
-                for item in data:
-                    row = self._prepare_row_data(item)
-                    rows_data.append(row)
-                
-                # Inserir múltiplas linhas
-                worksheet.append_rows(rows_data)
-            else:
-                # Registro único
-                row_data = self._prepare_row_data(data)
-                worksheet.append_row(row_data)
+            records = data if isinstance(data, list) else [data]
+            rows_data = [self._prepare_row_data(item) for item in records]
             
+            self.write_queue.enqueue(rows_data)
             return True
             
         except Exception as e:
             st.error(f"❌ Erro ao salvar no Google Sheets: {e}")
             return False
     
-    def load_from_sheets(self, filter_entries_only=False):
-        """Carrega dados do Google Sheets"""
+    def flush_sheets(self, timeout=None):
+        """Envia imediatamente as linhas pendentes e aguarda a confirmação"""
+        return self.write_queue.flush(timeout)
+    
+    def get_sheets_sync_status(self):
+        """Situação da fila de gravação no Google Sheets (inclui métricas de quota)"""
+        status = self.write_queue.status()
+        status['rate_limit'] = sheets_rate_limiter.metrics()
+        return status
+    
+    def load_from_sheets(self, filter_entries_only=False, incremental=True):
+        """Carrega dados do Google Sheets
+        
+        No modo incremental apenas as linhas novas (A{n}:L) são baixadas e
+        mescladas ao cache local; a aba inteira só é relida quando o header
+        ou a última linha sincronizada mudaram.
+        """
         try:
             if not self.gc and not self.init_google_sheets():
                 return []
             
-            spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
-            worksheet = spreadsheet.worksheet(self.sheet_name)
+            worksheet = self._get_worksheet()
             
             # Obter todos os registros
-            records = worksheet.get_all_records()
+            if incremental:
+                header, rows = sheets_sync.fetch(worksheet, self.spreadsheet_id, self.sheet_name, last_column='L')
+                records = to_records(header, rows)
+            else:
+                records = sheets_rate_limiter.call('read', worksheet.get_all_records)
             
             # Converter para formato padrão
             converted_data = []
             for record in records:
-                entry = {
-                    'inventoryId': record.get('Inventory ID', ''),
-                    'itemId': record.get('Item ID', ''),
-                    'dateTime': record.get('DateTime', ''),
-                    'amount': float(record.get('Amount', 0)),
-                    'building': record.get('building', ''),
-                    'email': record.get('Email', ''),
-                    'invoiceNumber': record.get('Invoice', ''),
-                    'sku': record.get('Sku', ''),
-                    'location': record.get('Andar', ''),
-                    'type': record.get('Tipod de movimentacao', ''),
-                    'supplier': record.get('Fornecedor', ''),
-                    'shelfLocation': record.get('Prateleira', '')
-                }
+                entry = self._record_to_entry(record)
                 
                 # Filtrar apenas entradas se solicitado
                 if filter_entries_only:
@@ -155,9 +232,32 @@ class DataManager:
             return converted_data
             
         except Exception as e:
+            sheets_client_provider.invalidate(self.spreadsheet_id, self.sheet_name)
             st.error(f"❌ Erro ao carregar do Google Sheets: {e}")
             return []
     
+    def _record_to_entry(self, record):
+        """Converte um registro da planilha (header -> valor) para o formato padrão"""
+        try:
+            amount = float(record.get('Amount') or 0)
+        except (TypeError, ValueError):
+            amount = 0.0
+        
+        return {
+            'inventoryId': record.get('Inventory ID', ''),
+            'itemId': record.get('Item ID', ''),
+            'dateTime': record.get('DateTime', ''),
+            'amount': amount,
+            'building': record.get('building', ''),
+            'email': record.get('Email', ''),
+            'invoiceNumber': record.get('Invoice', ''),
+            'sku': record.get('Sku', ''),
+            'location': record.get('Andar', ''),
+            'type': str(record.get('Tipod de movimentacao', '')),
+            'supplier': record.get('Fornecedor', ''),
+            'shelfLocation': record.get('Prateleira', '')
+        }
+    
     def _prepare_row_data(self, data):
         """Prepara dados para inserção na planilha"""
         return [
@@ -210,9 +310,12 @@ class DataManager:
     
     def get_statistics(self):
         """Obtém estatísticas dos dados"""
-        data = st.session_state.get('inventory_data', [])
+        if self.sqlite_store is not None:
+            return self.sqlite_store.statistics()
+        
+        snapshot = inventory_repository.snapshot()
         
-        if not data:
+        if not snapshot:
             return {
                 'total_records': 0,
                 'total_entries': 0,
@@ -222,102 +325,114 @@ class DataManager:
                 'date_range': 'N/A'
             }
         
-        df = pd.DataFrame(data)
-        
-        entries = df[df['type'] == 'entrada'] if 'type' in df.columns else pd.DataFrame()
-        losses = df[df['type'] == 'perda'] if 'type' in df.columns else pd.DataFrame()
+        # Tabela colunar: tipos e datas já estão convertidos, nada é reinterpretado aqui
+        df = snapshot.frame
+        type_counts = df['type'].value_counts()
         
         # Calcular estatísticas
         stats = {
             'total_records': len(df),
-            'total_entries': len(entries),
-            'total_losses': len(losses),
-            'unique_items': df['itemId'].nunique() if 'itemId' in df.columns else 0,
-            'unique_buildings': df['building'].nunique() if 'building' in df.columns else 0,
+            'total_entries': int(type_counts.get('entrada', 0)),
+            'total_losses': int(type_counts.get('perda', 0)),
+            'unique_items': df['itemId'].nunique(),
+            'unique_buildings': df['building'].nunique(),
             'date_range': 'N/A'
         }
         
         # Calcular range de datas
-        if 'dateTime' in df.columns and not df.empty:
-            try:
-                df['dateTime_parsed'] = pd.to_datetime(df['dateTime'], format='%d/%m/%Y %H:%M:%S', errors='coerce')
-                df_with_dates = df.dropna(subset=['dateTime_parsed'])
-                
-                if not df_with_dates.empty:
-                    min_date = df_with_dates['dateTime_parsed'].min().strftime('%d/%m/%Y')
-                    max_date = df_with_dates['dateTime_parsed'].max().strftime('%d/%m/%Y')
-                    stats['date_range'] = f"{min_date} a {max_date}"
-            except:
-                pass
+        min_date, max_date = df['timestamp'].min(), df['timestamp'].max()
+        if pd.notna(min_date):
+            stats['date_range'] = f"{min_date.strftime('%d/%m/%Y')} a {max_date.strftime('%d/%m/%Y')}"
         
         return stats
     
-    def export_to_csv(self, data=None, filename=None):
-        """Exporta dados para CSV"""
-        if data is None:
-            data = st.session_state.get('inventory_data', [])
+    def export_to_csv(self, data=None, filename=None, chunk_size=5000):
+        """Exporta dados para CSV
         
-        if not data:
-            return None
+        Os registros são formatados e escritos em blocos de chunk_size, sem
+        montar um DataFrame com o histórico inteiro (o SQLite é lido em streaming).
+        """
+        if data is None:
+            if self.sqlite_store is not None:
+                data = self.sqlite_store.iter_records(batch_size=chunk_size)
+            else:
+                data = inventory_repository.snapshot().records()
         
-        df = pd.DataFrame(data)
+        records = iter(data)
+        output = io.StringIO()
+        header = True
         
-        # Formatar para exibição
-        if not df.empty:
-            display_df = df.copy()
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
             
-            # Renomear colunas
-            column_mapping = {
-                'inventoryId': 'ID Inventário',
-                'itemId': 'Item ID',
-                'dateTime': 'Data/Hora',
-                'amount': 'Quantidade',
-                'building': 'Prédio',
-                'location': 'Localização',
-                'email': 'Email',
-                'type': 'Tipo',
-                'invoiceNumber': 'Nota Fiscal',
-                'sku': 'SKU',
-                'supplier': 'Fornecedor',
-                'shelfLocation': 'Prateleira'
-            }
-            
-            # Aplicar renomeação apenas para colunas existentes
-            existing_columns = {k: v for k, v in column_mapping.items() if k in display_df.columns}
-            display_df = display_df.rename(columns=existing_columns)
-            
-            # Formatar quantidade
-            if 'Quantidade' in display_df.columns:
-                display_df['Quantidade'] = display_df['Quantidade'].apply(
-                    lambda x: f"+{abs(x)}" if x > 0 else str(x)
-                )
-            
-            # Formatar tipo
-            if 'Tipo' in display_df.columns:
-                display_df['Tipo'] = display_df['Tipo'].apply(
-                    lambda x: '📥 Entrada' if x == 'entrada' else '📤 Perda'
-                )
+            self._format_export_frame(pd.DataFrame(chunk)).to_csv(output, index=False, header=header)
+            header = False
+        
+        if header:
+            return None
         
-        # Gerar CSV
-        csv_data = display_df.to_csv(index=False, encoding='utf-8-sig')
+        csv_data = output.getvalue()
         
         if filename is None:
             filename = f"inventario_completo_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
         
         return csv_data, filename
     
+    def _format_export_frame(self, df):
+        """Formata um bloco de registros para exibição no CSV exportado"""
+        display_df = df.copy()
+        
+        # Renomear colunas
+        column_mapping = {
+            'inventoryId': 'ID Inventário',
+            'itemId': 'Item ID',
+            'dateTime': 'Data/Hora',
+            'amount': 'Quantidade',
+            'building': 'Prédio',
+            'location': 'Localização',
+            'email': 'Email',
+            'type': 'Tipo',
+            'invoiceNumber': 'Nota Fiscal',
+            'sku': 'SKU',
+            'supplier': 'Fornecedor',
+            'shelfLocation': 'Prateleira'
+        }
+        
+        # Aplicar renomeação apenas para colunas existentes
+        existing_columns = {k: v for k, v in column_mapping.items() if k in display_df.columns}
+        display_df = display_df.rename(columns=existing_columns)
+        
+        # Formatar quantidade
+        if 'Quantidade' in display_df.columns:
+            display_df['Quantidade'] = display_df['Quantidade'].apply(
+                lambda x: f"+{abs(x)}" if x > 0 else str(x)
+            )
+        
+        # Formatar tipo
+        if 'Tipo' in display_df.columns:
+            display_df['Tipo'] = display_df['Tipo'].apply(
+                lambda x: '📥 Entrada' if x == 'entrada' else '📤 Perda'
+            )
+        
+        return display_df
+    
     def clear_all_data(self):
         """Limpa todos os dados"""
-        # Limpar session state
-        if 'inventory_data' in st.session_state:
-            del st.session_state['inventory_data']
+        # Limpar repositório compartilhado (todas as sessões)
+        inventory_repository.clear()
         
         if 'budget_history' in st.session_state:
             del st.session_state['budget_history']
         
-        # Remover arquivo local
-        if os.path.exists(self.local_file):
-            os.remove(self.local_file)
+        # Remover arquivos locais
+        self.journal.clear()
+        if self.sqlite_store is not None:
+            self.sqlite_store.clear()
+        for path in (self.local_file, f"{self.local_file}.migrating"):
+            if os.path.exists(path):
+                os.remove(path)
         
         return True
 
@@ -43,7 +43,7 @@ function loadMonitorData() {
     const summary = calculateSummary(processedData);
     
     // Gerar alertas
-    const alerts = generateAlerts(processedData);
+    const alerts = generateAlerts(processedData, summary);
     
     const result = {
       success: true,
@@ -155,8 +155,11 @@ function formatDate(dateValue) {
   }
 }
 
+// Dias de antecedência para alertar sobre montagens próximas
+const DAYS_BEFORE_EXPIRY_WARNING = 7;
+
 /**
- * Calcula resumo dos dados
+ * Calcula resumo dos dados em uma única passada
  * @param {Array} data - Dados processados
  * @return {Object} Resumo calculado
  */
@@ -167,9 +170,17 @@ function calculateSummary(data) {
     excedente: 0,
     totalEventos: data.length,
     statusDistribution: {},
-    atendimentoDistribution: {}
+    atendimentoDistribution: {},
+    monitoresPorSala: {},
+    eventosSemReporter: 0,
+    eventosVencidos: 0,
+    eventosProximosVencimento: 0
   };
   
+  const today = new Date();
+  today.setHours(0, 0, 0, 0);
+  const warningLimit = new Date(today.getTime() + DAYS_BEFORE_EXPIRY_WARNING * 24 * 60 * 60 * 1000);
+  
   data.forEach(item => {
     // Total de monitores
     summary.totalMonitores += item.monitores;
@@ -191,6 +202,23 @@ function calculateSummary(data) {
     // Distribuição por status de atendimento
     const atendimento = item.statusAtendimento || 'Não Iniciado';
     summary.atendimentoDistribution[atendimento] = (summary.atendimentoDistribution[atendimento] || 0) + 1;
+    
+    // Monitores por sala
+    summary.monitoresPorSala[item.sala] = (summary.monitoresPorSala[item.sala] || 0) + item.monitores;
+    
+    if (!item.reporter || item.reporter.trim() === '') {
+      summary.eventosSemReporter++;
+    }
+    
+    // Vencimento pela data de montagem (eventos concluídos não contam)
+    const montagemDate = parseEventDate(item.dataMontagem);
+    if (montagemDate && item.status !== 'Concluído') {
+      if (montagemDate < today) {
+        summary.eventosVencidos++;
+      } else if (montagemDate <= warningLimit) {
+        summary.eventosProximosVencimento++;
+      }
+    }
   });
   
   return summary;
@@ -199,16 +227,19 @@ function calculateSummary(data) {
 /**
  * Gera alertas baseados nos dados
  * @param {Array} data - Dados processados
+ * @param {Object} summary - Resumo já calculado (opcional)
  * @return {Array} Lista de alertas
  */
-function generateAlerts(data) {
+function generateAlerts(data, summary) {
   const alerts = [];
+  summary = summary || calculateSummary(data);
   
-  // Contar eventos por tipo
-  const eventosPendentes = data.filter(item => item.status === 'Pendente').length;
-  const eventosExcedentes = data.filter(item => item.status === 'Excedente').length;
-  const eventosSemReporter = data.filter(item => !item.reporter || item.reporter.trim() === '').length;
-  const eventosVencidos = data.filter(item => isEventExpired(item)).length;
+  // Contagens do resumo
+  const eventosPendentes = summary.statusDistribution['Pendente'] || 0;
+  const eventosExcedentes = summary.statusDistribution['Excedente'] || 0;
+  const eventosSemReporter = summary.eventosSemReporter;
+  const eventosVencidos = summary.eventosVencidos;
+  const eventosProximos = summary.eventosProximosVencimento;
   
   // Alerta para eventos pendentes
   if (eventosPendentes > 0) {
@@ -254,27 +285,74 @@ function generateAlerts(data) {
     });
   }
   
+  // Alerta para montagens próximas
+  if (eventosProximos > 0) {
+    alerts.push({
+      type: 'warning',
+      title: 'Montagens Próximas',
+      message: `Existem ${eventosProximos} eventos com montagem nos próximos ${DAYS_BEFORE_EXPIRY_WARNING} dias.`,
+      count: eventosProximos,
+      action: 'review_upcoming'
+    });
+  }
+  
   return alerts;
 }
 
+/**
+ * Converte a data do evento (DD/MM/YYYY, formato de formatDate) em Date
+ * @param {*} value - Data formatada ou Date
+ * @return {Date|null} Data ou null se inválida
+ */
+function parseEventDate(value) {
+  if (!value) return null;
+  if (value instanceof Date) return value;
+  
+  const match = String(value).match(/^(\d{2})\/(\d{2})\/(\d{4})/);
+  if (!match) return null;
+  
+  return new Date(Number(match[3]), Number(match[2]) - 1, Number(match[1]));
+}
+
 /**
  * Verifica se um evento está vencido
  * @param {Object} item - Item do evento
  * @return {boolean} True se vencido
  */
 function isEventExpired(item) {
-  if (!item.dataMontagem) return false;
+  const montagemDate = parseEventDate(item.dataMontagem);
+  if (!montagemDate) return false;
   
-  try {
-    const today = new Date();
-    const montagemDate = new Date(item.dataMontagem);
-    
-    // Considerar vencido se a data de montagem já passou e status não é Concluído
-    return montagemDate < today && item.status !== 'Concluído';
-    
-  } catch (error) {
-    return false;
+  const today = new Date();
+  today.setHours(0, 0, 0, 0);
+  
+  // Considerar vencido se a data de montagem já passou e status não é Concluído
+  return montagemDate < today && item.status !== 'Concluído';
+}
+
+// Colunas usadas nas atualizações (1-based)
+const KEY_COLUMN = 8; // Coluna H - Key
+const STATUS_COLUMN = 9; // Coluna I - Status
+const STATUS_ATENDIMENTO_COLUMN = 10; // Coluna J - Status de Atendimento
+
+/**
+ * Localiza a linha de um evento pela key (TextFinder só na coluna H)
+ * @param {Sheet} sheet - Aba de eventos
+ * @param {string} key - Chave do evento
+ * @return {number} Número da linha ou 0 se não encontrado
+ */
+function findEventRow(sheet, key) {
+  const lastRow = sheet.getLastRow();
+  if (lastRow < 2) {
+    return 0;
   }
+  
+  const cell = sheet.getRange(2, KEY_COLUMN, lastRow - 1, 1)
+    .createTextFinder(String(key))
+    .matchEntireCell(true)
+    .findNext();
+  
+  return cell ? cell.getRow() : 0;
 }
 
 /**
@@ -294,29 +372,22 @@ function updateEventStatus(key, newStatus) {
       throw new Error(`Aba "${SHEET_NAME}" não encontrada`);
     }
     
-    // Encontrar linha pela key
-    const data = sheet.getDataRange().getValues();
-    const keyColumn = 7; // Coluna H (índice 7)
-    const statusColumn = 9; // Coluna J (índice 9) - Status de Atendimento
-    
-    for (let i = 1; i < data.length; i++) { // Começar da linha 2 (índice 1)
-      if (data[i][keyColumn] === key) {
-        // Atualizar status de atendimento
-        sheet.getRange(i + 1, statusColumn + 1).setValue(newStatus);
-        
-        console.log(`✅ Status atualizado com sucesso para evento ${key}`);
-        
-        return {
-          success: true,
-          message: `Status do evento ${key} atualizado para: ${newStatus}`,
-          key: key,
-          newStatus: newStatus,
-          timestamp: new Date().toISOString()
-        };
-      }
+    const row = findEventRow(sheet, key);
+    if (!row) {
+      throw new Error(`Evento com key "${key}" não encontrado`);
     }
     
-    throw new Error(`Evento com key "${key}" não encontrado`);
+    sheet.getRange(row, STATUS_ATENDIMENTO_COLUMN).setValue(newStatus);
+    
+    console.log(`✅ Status atualizado com sucesso para evento ${key}`);
+    
+    return {
+      success: true,
+      message: `Status do evento ${key} atualizado para: ${newStatus}`,
+      key: key,
+      newStatus: newStatus,
+      timestamp: new Date().toISOString()
+    };
     
   } catch (error) {
     console.error('❌ Erro ao atualizar status:', error);
@@ -329,6 +400,78 @@ function updateEventStatus(key, newStatus) {
   }
 }
 
+/**
+ * Atualiza o status de atendimento de vários eventos de uma vez
+ * @param {Object} updates - Mapa { key: novoStatus }
+ * @return {Object} Resultado da operação
+ */
+function updateEventStatuses(updates) {
+  try {
+    const keys = Object.keys(updates || {});
+    console.log(`🔄 Atualizando status de ${keys.length} eventos`);
+    
+    const spreadsheet = SpreadsheetApp.openById(SPREADSHEET_ID);
+    const sheet = spreadsheet.getSheetByName(SHEET_NAME);
+    
+    if (!sheet) {
+      throw new Error(`Aba "${SHEET_NAME}" não encontrada`);
+    }
+    
+    // Índice key -> linha com uma única leitura da coluna H
+    const rowsByKey = {};
+    const lastRow = sheet.getLastRow();
+    if (lastRow >= 2) {
+      const keyValues = sheet.getRange(2, KEY_COLUMN, lastRow - 1, 1).getValues();
+      keyValues.forEach((value, i) => {
+        const rowKey = String(value[0]);
+        if (rowKey && !(rowKey in rowsByKey)) {
+          rowsByKey[rowKey] = i + 2;
+        }
+      });
+    }
+    
+    // Agrupar células por status para gravar cada grupo com um RangeList
+    const rangesByStatus = {};
+    const updated = [];
+    const missing = [];
+    
+    keys.forEach(key => {
+      const row = rowsByKey[key];
+      if (!row) {
+        missing.push(key);
+        return;
+      }
+      const status = updates[key];
+      (rangesByStatus[status] = rangesByStatus[status] || []).push(
+        sheet.getRange(row, STATUS_ATENDIMENTO_COLUMN).getA1Notation()
+      );
+      updated.push(key);
+    });
+    
+    Object.keys(rangesByStatus).forEach(status => {
+      sheet.getRangeList(rangesByStatus[status]).setValue(status);
+    });
+    
+    console.log(`✅ ${updated.length} eventos atualizados, ${missing.length} não encontrados`);
+    
+    return {
+      success: true,
+      message: `${updated.length} eventos atualizados`,
+      updated: updated,
+      missing: missing,
+      timestamp: new Date().toISOString()
+    };
+    
+  } catch (error) {
+    console.error('❌ Erro ao atualizar status em lote:', error);
+    return {
+      success: false,
+      error: error.toString(),
+      timestamp: new Date().toISOString()
+    };
+  }
+}
+
 /**
  * Marca evento como concluído
  * @param {string} key - Chave do evento
@@ -345,30 +488,22 @@ function markEventAsCompleted(key) {
       throw new Error(`Aba "${SHEET_NAME}" não encontrada`);
     }
     
-    // Encontrar linha pela key
-    const data = sheet.getDataRange().getValues();
-    const keyColumn = 7; // Coluna H (índice 7)
-    const statusColumn = 8; // Coluna I (índice 8) - Status
-    const statusAtendimentoColumn = 9; // Coluna J (índice 9) - Status de Atendimento
-    
-    for (let i = 1; i < data.length; i++) {
-      if (data[i][keyColumn] === key) {
-        // Atualizar tanto status quanto status de atendimento
-        sheet.getRange(i + 1, statusColumn + 1).setValue('Concluído');
-        sheet.getRange(i + 1, statusAtendimentoColumn + 1).setValue('Concluído');
-        
-        console.log(`✅ Evento ${key} marcado como concluído`);
-        
-        return {
-          success: true,
-          message: `Evento ${key} marcado como concluído`,
-          key: key,
-          timestamp: new Date().toISOString()
-        };
-      }
+    const row = findEventRow(sheet, key);
+    if (!row) {
+      throw new Error(`Evento com key "${key}" não encontrado`);
     }
     
-    throw new Error(`Evento com key "${key}" não encontrado`);
+    // Atualizar tanto status quanto status de atendimento (colunas I e J adjacentes)
+    sheet.getRange(row, STATUS_COLUMN, 1, 2).setValues([['Concluído', 'Concluído']]);
+    
+    console.log(`✅ Evento ${key} marcado como concluído`);
+    
+    return {
+      success: true,
+      message: `Evento ${key} marcado como concluído`,
+      key: key,
+      timestamp: new Date().toISOString()
+    };
     
   } catch (error) {
     console.error('❌ Erro ao marcar como concluído:', error);
@@ -1,6 +1,7 @@
 """
 Configurações para o Sistema de Monitoramento de Monitores
 """
+from urllib.parse import quote, urlencode
 
 class MonitorConfig:
     """Configurações centralizadas para monitores"""
@@ -40,6 +41,9 @@ class MonitorConfig:
         'STATUS_ATENDIMENTO': 9   # Coluna J
     }
     
+    # Consulta gviz dos eventos: só as colunas A-J e apenas linhas com key
+    EVENTS_QUERY = 'SELECT A, B, C, D, E, F, G, H, I, J WHERE H IS NOT NULL'
+    
     # Configurações de alertas
     ALERT_THRESHOLDS = {
         'MAX_PENDING_EVENTS': 5,
@@ -185,8 +189,8 @@ class MonitorConfig:
             'tq': query
         }
         
-        param_string = '&'.join([f"{k}={v}" for k, v in params.items()])
-        return f"{base_url}?{param_string}"
+        # Nome da aba e consulta têm espaços/acentos: precisam ser codificados
+        return f"{base_url}?{urlencode(params, quote_via=quote)}"
     
     @classmethod
     def get_csv_url(cls):
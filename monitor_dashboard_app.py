@@ -7,11 +7,22 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import numpy as np
-import gspread
-from google.oauth2.service_account import Credentials
 import json
+import hashlib
+
+from config.settings import settings
+from monitor_config import MonitorConfig
+from services.async_loader import async_loader
+from services.gviz_client import gviz_client
+from services.gviz_query import build_events_query, filter_events_locally
+from services.monitor_summary import summarize_events
+from services.rate_limiter import sheets_rate_limiter
+from services.search_index import monitor_search_index, matches_locally, MONITOR_SEARCH_FIELDS
+from services.sheets_client import sheets_client_provider
+from services.sheets_row_index import get_row_index
+from services.snapshot_cache import snapshot_cache, NOT_MODIFIED
 
 # Configuração da página
 st.set_page_config(
@@ -247,141 +258,252 @@ st.markdown("""
 SPREADSHEET_ID = '1hI6WWiH03AvXFxMCpPpYtIhQEU062C_k4utIE6YyctY'
 SHEET_NAME = 'Calendário de eventos - Monitores'
 SHEET_GID = '1469973439'
+MONITOR_ROWS_KEY = f"monitor_rows_{SPREADSHEET_ID}_{SHEET_GID}"
+
+# Campos do evento na ordem das colunas da planilha
+MONITOR_FIELDS = [
+    name.lower() for name, _ in sorted(MonitorConfig.COLUMN_MAPPING.items(), key=lambda item: item[1])
+]
+
+# Colunas de data (texto dd/mm/YYYY) -> coluna tipada no DataFrame
+MONITOR_DATE_COLUMNS = {
+    'data_solicitacao': 'solicitacao_dt',
+    'data_montagem': 'montagem_dt',
+    'data_desmontagem': 'desmontagem_dt'
+}
 
 class MonitorManager:
     """Gerenciador de dados de monitores com Google Sheets"""
     
     def __init__(self):
         self.gc = None
+        self._processed = None  # (fetched_at do snapshot, registros, DataFrame)
+        self._base_version = ''  # versão (ETag/modifiedTime) do snapshot base
+        self._summary = None  # (DataFrame, dia, resumo)
         
     def init_google_sheets(self):
-        """Inicializa conexão com Google Sheets"""
+        """Inicializa conexão com Google Sheets (cliente compartilhado do processo)"""
         try:
-            if hasattr(st, 'secrets') and 'google_sheets' in st.secrets:
-                credentials_dict = dict(st.secrets['google_sheets'])
-                credentials = Credentials.from_service_account_info(
-                    credentials_dict,
-                    scopes=[
-                        'https://www.googleapis.com/auth/spreadsheets',
-                        'https://www.googleapis.com/auth/drive'
-                    ]
-                )
-            else:
-                # Desenvolvimento local
-                if os.path.exists('credentials.json'):
-                    credentials = Credentials.from_service_account_file(
-                        'credentials.json',
-                        scopes=[
-                            'https://www.googleapis.com/auth/spreadsheets',
-                            'https://www.googleapis.com/auth/drive'
-                        ]
-                    )
-                else:
-                    return False
-            
-            self.gc = gspread.authorize(credentials)
-            return True
+            self.gc = sheets_client_provider.get_client()
+            return self.gc is not None
             
         except Exception as e:
             st.error(f"❌ Erro ao conectar Google Sheets: {e}")
             return False
     
-    def load_monitor_data(self):
-        """Carrega dados de monitores do Google Sheets"""
+    def get_worksheet(self):
+        """Obtém a aba de eventos a partir do cache de handles"""
+        return sheets_client_provider.get_worksheet(SPREADSHEET_ID, SHEET_NAME)
+    
+    def load_monitor_data(self, force_refresh=False):
+        """Carrega dados de monitores do Google Sheets
+        
+        As linhas vêm do cache compartilhado do processo (memória + disco), com
+        TTL de REFRESH_INTERVAL_MINUTES; vencido o TTL, a sessão recebe o
+        snapshot atual enquanto uma única busca revalida a planilha em segundo
+        plano. force_refresh revalida na hora (botão Atualizar).
+        """
         try:
             if not self.gc and not self.init_google_sheets():
                 return self.get_sample_data()
             
-            # Tentar múltiplos métodos de carregamento
-            try:
-                # Método 1: gviz com nome da aba
-                gviz_url = f"https://docs.google.com/spreadsheets/d/{SPREADSHEET_ID}/gviz/tq?tqx=out:json&sheet={SHEET_NAME}&headers=1&tq=SELECT%20*"
-                
-                import requests
-                response = requests.get(gviz_url, headers={'Accept': 'application/json'})
-                
-                if response.status_code == 200:
-                    text = response.text
-                    # Extrair JSON do response gviz
-                    import re
-                    match = re.search(r'google\.visualization\.Query\.setResponse\((.*)\);', text, re.DOTALL)
-                    
-                    if match:
-                        json_data = json.loads(match.group(1))
-                        
-                        if json_data.get('status') == 'ok':
-                            cols = json_data.get('table', {}).get('cols', [])
-                            rows = json_data.get('table', {}).get('rows', [])
-                            
-                            # Processar dados
-                            data = []
-                            for row in rows:
-                                cells = row.get('c', [])
-                                row_data = []
-                                for cell in cells:
-                                    if cell is None:
-                                        row_data.append('')
-                                    elif isinstance(cell, dict) and 'v' in cell:
-                                        row_data.append(cell['v'])
-                                    else:
-                                        row_data.append(str(cell))
-                                data.append(row_data)
-                            
-                            return self.process_monitor_data(data)
+            rows, info = snapshot_cache.get(
+                MONITOR_ROWS_KEY,
+                self._fetch_monitor_rows,
+                ttl=MonitorConfig.UI_CONFIG['REFRESH_INTERVAL_MINUTES'] * 60,
+                force=force_refresh
+            )
             
-            except Exception as e:
-                st.warning(f"Método gviz falhou: {e}")
+            if not rows:
+                # Se tudo falhar, usar dados de exemplo
+                return self.get_sample_data()
             
-            # Fallback: usar gspread diretamente
-            try:
-                spreadsheet = self.gc.open_by_key(SPREADSHEET_ID)
-                worksheet = spreadsheet.worksheet(SHEET_NAME)
-                data = worksheet.get_all_values()
-                
-                if data and len(data) > 1:
-                    return self.process_monitor_data(data[1:])  # Pular header
-                    
-            except Exception as e:
-                st.warning(f"Método gspread falhou: {e}")
+            self._base_version = self._snapshot_version(info)
             
-            # Se tudo falhar, usar dados de exemplo
-            return self.get_sample_data()
+            # Reprocessa só quando o snapshot mudou
+            if self._processed is None or self._processed[0] != info['fetched_at']:
+                frame = self.process_monitor_frame(rows)
+                self._processed = (info['fetched_at'], self._to_records(frame), frame)
+                # Reindexa só as keys novas ou alteradas
+                monitor_search_index.sync(self._processed[1])
+            
+            return self._processed[1]
             
         except Exception as e:
             st.error(f"Erro ao carregar dados: {e}")
             return self.get_sample_data()
     
+    def _snapshot_version(self, info):
+        """Identifica o conteúdo do snapshot base (ETag/modifiedTime, ou a hora da busca)"""
+        validators = info.get('validators') or {}
+        version = validators.get('etag') or validators.get('modified_time') or validators.get('last_modified')
+        return str(version or info['fetched_at'])
+    
+    def _fetch_monitor_rows(self, validators):
+        """Busca as linhas na origem: gviz e, só se ele falhar, gspread
+        
+        As fontes não correm em paralelo: a leitura pelo gspread consome quota
+        da API do Sheets mesmo quando o gviz responde primeiro.
+        """
+        errors = []
+        for name, fetch, timeout in (
+            ('gviz', self._fetch_gviz_rows, settings.GVIZ_TIMEOUT),
+            ('gspread', self._fetch_gspread_rows, settings.SHEETS_READ_TIMEOUT)
+        ):
+            result = async_loader.gather({name: (lambda: fetch(validators), timeout)})[name]
+            if not result['error']:
+                return result['data']
+            errors.append(f"{name}: {result['error']}")
+        
+        raise Exception(f"Falha ao carregar dados da planilha: {'; '.join(errors)}")
+    
+    def search(self, data, term):
+        """Filtra eventos pela busca textual (índice invertido compartilhado)"""
+        if self._processed is not None and data is self._processed[1]:
+            keys = monitor_search_index.search(term)
+        else:
+            # Dados de exemplo ou de uma consulta filtrada: poucos registros
+            keys = {item['key'] for item in data if matches_locally(item, term, MONITOR_SEARCH_FIELDS)}
+        
+        return keys
+    
+    def load_filtered_data(self, filters):
+        """Eventos filtrados na própria planilha (consulta gviz)
+        
+        Só as linhas que atendem aos filtros são transferidas; o resultado fica
+        no cache compartilhado (apenas em memória) pelo mesmo TTL. A chave inclui
+        a versão do snapshot base: quando ele muda (Atualizar, status gravado),
+        as consultas filtradas deixam de ser reaproveitadas. Retorna None
+        se os filtros não puderem ser expressos em gviz; erros são propagados
+        para que a tela filtre localmente.
+        """
+        query = build_events_query(filters)
+        if query is None:
+            return None
+        
+        query_id = hashlib.sha1(f"{self._base_version}|{query}".encode('utf-8')).hexdigest()[:16]
+        rows, _ = snapshot_cache.get(
+            f"monitor_query_{query_id}",
+            lambda validators: self._fetch_gviz_rows(validators, query),
+            ttl=MonitorConfig.UI_CONFIG['REFRESH_INTERVAL_MINUTES'] * 60,
+            persist=False
+        )
+        
+        return self.process_monitor_data(rows)
+    
+    def _fetch_gviz_rows(self, validators, query=MonitorConfig.EVENTS_QUERY):
+        """Método 1: gviz com nome da aba (executado fora da thread do Streamlit)
+        
+        Colunas e filtro vão na própria consulta; a resposta é lida em streaming.
+        """
+        gviz_url = MonitorConfig.get_gviz_url(query)
+        
+        # Requisição condicional quando o endpoint devolveu validadores antes
+        headers = {'Accept': 'application/json'}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        
+        response = gviz_client.open(gviz_url, headers)
+        
+        if response.status_code == 304:
+            response.close()
+            return NOT_MODIFIED
+        
+        if response.status_code != 200:
+            response.close()
+            raise Exception(f"gviz retornou status {response.status_code}")
+        
+        new_validators = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified')
+        }
+        
+        return list(gviz_client.iter_rows(response)), new_validators
+    
+    def _fetch_gspread_rows(self, validators):
+        """Método 2: gspread diretamente (executado fora da thread do Streamlit)"""
+        # modifiedTime do Drive é uma chamada de metadados barata: se a planilha
+        # não mudou desde o snapshot, evita baixar a aba inteira
+        spreadsheet = sheets_client_provider.get_spreadsheet(SPREADSHEET_ID)
+        modified_time = sheets_rate_limiter.call('read', spreadsheet.get_lastUpdateTime)
+        
+        if validators.get('modified_time') and validators['modified_time'] == modified_time:
+            return NOT_MODIFIED
+        
+        worksheet = self.get_worksheet()
+        data = sheets_rate_limiter.call('read', worksheet.get_all_values)
+        
+        if not data or len(data) <= 1:
+            raise Exception("aba sem dados")
+        
+        return data[1:], {'modified_time': modified_time}  # Pular header
+    
     def process_monitor_data(self, raw_data):
         """Processa dados brutos em formato estruturado"""
-        processed_data = []
-        
-        for row in raw_data:
-            if len(row) >= 10:  # Garantir que temos dados suficientes
-                try:
-                    item = {
-                        'data_solicitacao': row[0] if len(row) > 0 else '',
-                        'data_montagem': row[1] if len(row) > 1 else '',
-                        'sala': row[2] if len(row) > 2 else '',
-                        'monitores': int(row[3]) if len(row) > 3 and row[3].isdigit() else 0,
-                        'data_desmontagem': row[4] if len(row) > 4 else '',
-                        'observacoes': row[5] if len(row) > 5 else '',
-                        'reporter': row[6] if len(row) > 6 else '',
-                        'key': row[7] if len(row) > 7 else '',
-                        'status': row[8] if len(row) > 8 else 'Pendente',
-                        'status_atendimento': row[9] if len(row) > 9 else 'Não Iniciado'
-                    }
-                    processed_data.append(item)
-                except (ValueError, IndexError):
-                    continue
-        
-        # Remover duplicatas por key
-        unique_data = {}
-        for item in processed_data:
-            key = item['key']
-            if key and key not in unique_data:
-                unique_data[key] = item
-        
-        return list(unique_data.values())
+        return self._to_records(self.process_monitor_frame(raw_data))
+    
+    def process_monitor_frame(self, raw_data):
+        """Converte as linhas brutas em um DataFrame tipado, uma linha por key
+        
+        Linhas com menos colunas que COLUMN_MAPPING são descartadas; os tipos
+        são convertidos por coluna e as datas interpretadas uma única vez.
+        """
+        width = len(MONITOR_FIELDS)
+        lengths = np.fromiter(map(len, raw_data), dtype=np.int64, count=len(raw_data))
+        complete = lengths >= width
+        
+        if not complete.any():
+            return self._typed_frame(pd.DataFrame(columns=MONITOR_FIELDS))
+        
+        frame = pd.DataFrame(raw_data).iloc[complete, :width].copy()
+        frame.columns = MONITOR_FIELDS
+        return self._typed_frame(frame)
+    
+    def _typed_frame(self, frame):
+        """Tipos por coluna, sem keys vazias/duplicadas e com datas parseadas"""
+        text_fields = [field for field in MONITOR_FIELDS if field != 'monitores']
+        frame[text_fields] = frame[text_fields].fillna('').astype(str)
+        
+        # Monitores: número do gviz ou texto do gspread; inválido vira 0
+        frame['monitores'] = (
+            pd.to_numeric(frame['monitores'], errors='coerce').fillna(0).clip(lower=0).astype(int)
+        )
+        
+        # Remover duplicatas por key (mantém a primeira ocorrência)
+        frame = frame[frame['key'] != ''].drop_duplicates(subset='key', keep='first')
+        
+        for column, typed_column in MONITOR_DATE_COLUMNS.items():
+            frame[typed_column] = pd.to_datetime(
+                frame[column].str.slice(0, 10), format='%d/%m/%Y', errors='coerce'
+            )
+        
+        return frame.reset_index(drop=True)
+    
+    def summarize(self, data):
+        """Resumo agregado dos eventos, calculado uma vez por versão dos dados"""
+        frame = self.monitor_frame(data)
+        today = date.today()
+        
+        # Vencimentos dependem do dia: recalcula também na virada da data
+        if self._summary is None or self._summary[0] is not frame or self._summary[1] != today:
+            self._summary = (frame, today, summarize_events(frame, today))
+        
+        return self._summary[2]
+    
+    def _to_records(self, frame):
+        """Registros (dicts) dos campos do evento, convertidos coluna a coluna"""
+        columns = {field: frame[field].tolist() for field in MONITOR_FIELDS}
+        return [dict(zip(columns, values)) for values in zip(*columns.values())]
+    
+    def monitor_frame(self, data):
+        """DataFrame tipado dos eventos (reaproveita o do snapshot carregado)"""
+        if self._processed is not None and data is self._processed[1]:
+            return self._processed[2]
+        
+        # Dados de exemplo: já vêm como registros
+        return self._typed_frame(pd.DataFrame(data, columns=MONITOR_FIELDS))
     
     def get_sample_data(self):
         """Dados de exemplo para demonstração"""
@@ -438,28 +560,46 @@ class MonitorManager:
     
     def update_status(self, key, new_status):
         """Atualiza status de atendimento no Google Sheets"""
+        result = self.update_statuses({key: new_status})
+        return key in result['updated']
+    
+    def update_statuses(self, updates):
+        """Atualiza o status de atendimento de várias keys ({key: status})
+        
+        As linhas vêm do índice key -> linha em cache (montado a partir da
+        coluna de keys); uma leitura confere as posições e um único
+        batch_update grava todas as mudanças. 'refresh' indica que o snapshot
+        compartilhado foi vencido e a tela deve recarregar forçando a leitura.
+        """
+        if not updates:
+            return {'updated': [], 'missing': [], 'refresh': False}
+        
         try:
             if not self.gc and not self.init_google_sheets():
                 st.warning("Conexão com Google Sheets não disponível")
-                return False
+                return {'updated': [], 'missing': list(updates), 'refresh': False}
             
-            spreadsheet = self.gc.open_by_key(SPREADSHEET_ID)
-            worksheet = spreadsheet.worksheet(SHEET_NAME)
+            row_index = get_row_index(
+                SPREADSHEET_ID, SHEET_NAME,
+                MonitorConfig.COLUMN_MAPPING['KEY'] + 1  # Coluna H
+            )
+            result = row_index.update_column(
+                updates,
+                MonitorConfig.COLUMN_MAPPING['STATUS_ATENDIMENTO'] + 1  # Coluna J
+            )
             
-            # Encontrar linha pela key
-            all_values = worksheet.get_all_values()
+            result['refresh'] = bool(result['updated'])
+            if result['refresh']:
+                # Snapshot compartilhado vencido: a próxima leitura forçada busca
+                # na planilha mesmo dentro do MIN_FORCE_INTERVAL
+                snapshot_cache.expire(MONITOR_ROWS_KEY)
             
-            for i, row in enumerate(all_values):
-                if len(row) > 7 and row[7] == key:  # Coluna 8 é a key (índice 7)
-                    # Atualizar coluna de status de atendimento (coluna 10, índice 9)
-                    worksheet.update_cell(i + 1, 10, new_status)
-                    return True
-            
-            return False
+            return result
             
         except Exception as e:
+            sheets_client_provider.invalidate(SPREADSHEET_ID, SHEET_NAME)
             st.error(f"Erro ao atualizar status: {e}")
-            return False
+            return {'updated': [], 'missing': list(updates), 'refresh': False}
 
 def main():
     """Função principal"""
@@ -490,36 +630,39 @@ def main():
     
     with col1:
         if st.button("🔄 Atualizar", key="refresh_btn"):
-            st.session_state.monitor_data = None  # Force reload
+            st.session_state.force_refresh = True  # Revalida o cache compartilhado
             st.rerun()
     
     with col2:
         if st.button("📥 Exportar", key="export_btn"):
             export_data()
     
-    # Carregar dados
-    if 'monitor_data' not in st.session_state or st.session_state.monitor_data is None:
-        with st.spinner("Carregando dados da planilha..."):
-            st.session_state.monitor_data = st.session_state.monitor_manager.load_monitor_data()
+    # Carregar dados (cache compartilhado entre sessões; só busca na planilha
+    # quando o snapshot venceu ou não existe)
+    with st.spinner("Carregando dados da planilha..."):
+        st.session_state.monitor_data = st.session_state.monitor_manager.load_monitor_data(
+            force_refresh=st.session_state.pop('force_refresh', False)
+        )
     
     data = st.session_state.monitor_data
+    summary = st.session_state.monitor_manager.summarize(data)
     
     # Cards de resumo (fiel ao HTML original)
-    show_summary_cards(data)
+    show_summary_cards(summary)
     
     # Tabela de eventos
     show_events_table(data)
     
     # Alertas
-    show_alerts(data)
+    show_alerts(summary)
 
-def show_summary_cards(data):
+def show_summary_cards(summary):
     """Exibe cards de resumo fiel ao HTML original"""
     
-    # Calcular métricas
-    total_monitores = sum(item['monitores'] for item in data)
-    dentro_limite = sum(item['monitores'] for item in data if item['status'] in ['Confirmado', 'Concluído'])
-    excedente = sum(item['monitores'] for item in data if item['status'] == 'Excedente')
+    # Métricas do resumo agregado
+    total_monitores = summary['total_monitores']
+    dentro_limite = summary['dentro_limite']
+    excedente = summary['excedente']
     ultima_atualizacao = datetime.now().strftime('%H:%M:%S')
     
     # Grid de cards
@@ -577,6 +720,23 @@ def show_summary_cards(data):
         </div>
         """, unsafe_allow_html=True)
 
+def apply_event_filters(data, filters):
+    """Filtra eventos na origem via gviz; usa os dados já carregados como fallback"""
+    if not any(filters.values()):
+        return data
+    
+    manager = st.session_state.get('monitor_manager')
+    
+    if manager is not None and manager.gc is not None:
+        try:
+            filtered = manager.load_filtered_data(filters)
+            if filtered is not None:
+                return filtered
+        except Exception as e:
+            st.caption(f"⚠️ Filtro na planilha indisponível ({e}); filtrando localmente")
+    
+    return filter_events_locally(data, filters)
+
 def show_events_table(data):
     """Exibe tabela de eventos com filtros"""
     
@@ -590,32 +750,42 @@ def show_events_table(data):
         search_term = st.text_input("🔍 Buscar...", placeholder="Digite para buscar")
     
     with col2:
-        status_options = ['Todos'] + list(set(item['status'] for item in data))
+        status_options = ['Todos'] + sorted(set(item['status'] for item in data))
         status_filter = st.selectbox("Status", status_options)
     
     with col3:
-        atendimento_options = ['Todos'] + list(set(item['status_atendimento'] for item in data))
+        atendimento_options = ['Todos'] + sorted(set(item['status_atendimento'] for item in data))
         atendimento_filter = st.selectbox("Status Atendimento", atendimento_options)
     
-    # Aplicar filtros
-    filtered_data = data.copy()
+    col4, col5, col6 = st.columns([2, 1, 1])
     
-    if search_term:
-        filtered_data = [
-            item for item in filtered_data
-            if search_term.lower() in str(item).lower()
-        ]
+    with col4:
+        sala_options = ['Todas'] + sorted(set(str(item['sala']) for item in data if item['sala']))
+        sala_filter = st.selectbox("Sala", sala_options)
     
-    if status_filter != 'Todos':
-        filtered_data = [
-            item for item in filtered_data
-            if item['status'] == status_filter
-        ]
+    with col5:
+        date_from = st.date_input("Montagem a partir de", value=None, format="DD/MM/YYYY")
+    
+    with col6:
+        date_to = st.date_input("Montagem até", value=None, format="DD/MM/YYYY")
     
-    if atendimento_filter != 'Todos':
+    filters = {
+        'status': status_filter if status_filter != 'Todos' else None,
+        'status_atendimento': atendimento_filter if atendimento_filter != 'Todos' else None,
+        'sala': sala_filter if sala_filter != 'Todas' else None,
+        'date_from': date_from,
+        'date_to': date_to
+    }
+    
+    # Aplicar filtros: na planilha (gviz) quando possível, localmente se offline
+    filtered_data = apply_event_filters(data, filters)
+    
+    if search_term:
+        manager = st.session_state.get('monitor_manager') or MonitorManager()
+        matching_keys = manager.search(data, search_term)
         filtered_data = [
             item for item in filtered_data
-            if item['status_atendimento'] == atendimento_filter
+            if item['key'] in matching_keys
         ]
     
     # Tabela interativa
@@ -673,9 +843,27 @@ def show_events_table(data):
         
         with col1:
             # Atualizar status em lote
-            if st.button("✅ Marcar Selecionados como Concluído"):
-                # Em uma implementação real, você permitiria seleção múltipla
-                st.success("Funcionalidade de atualização em lote")
+            pending_keys = [
+                item['key'] for item in filtered_data
+                if item['status_atendimento'] != 'Concluído'
+            ]
+            selected_keys = st.multiselect("Eventos", pending_keys, placeholder="Selecione os eventos")
+            
+            if st.button("✅ Marcar Selecionados como Concluído", disabled=not selected_keys):
+                manager = st.session_state.get('monitor_manager') or MonitorManager()
+                result = manager.update_statuses({key: 'Concluído' for key in selected_keys})
+                
+                st.session_state.status_update_result = result
+                if result['refresh']:
+                    # Recarrega a tela com os dados revalidados
+                    st.session_state.force_refresh = True
+                    st.rerun()
+            
+            result = st.session_state.pop('status_update_result', None)
+            if result and result['updated']:
+                st.success(f"{len(result['updated'])} eventos marcados como concluídos")
+            if result and result['missing']:
+                st.warning(f"Keys não encontradas na planilha: {', '.join(result['missing'])}")
         
         with col2:
             # Gerar relatório
@@ -687,16 +875,18 @@ def show_events_table(data):
     
     st.markdown('</div>', unsafe_allow_html=True)
 
-def show_alerts(data):
+def show_alerts(summary):
     """Exibe alertas baseados nos dados"""
     
     st.markdown('<div class="nubank-card">', unsafe_allow_html=True)
     st.subheader("🚨 Alertas e Ações")
     
-    # Calcular alertas
-    eventos_pendentes = len([item for item in data if item['status'] == 'Pendente'])
-    eventos_excedentes = len([item for item in data if item['status'] == 'Excedente'])
-    eventos_sem_reporter = len([item for item in data if not item['reporter'] or item['reporter'].strip() == ''])
+    # Contagens do resumo agregado
+    eventos_pendentes = summary['pendentes']
+    eventos_excedentes = summary['excedentes']
+    eventos_sem_reporter = summary['sem_reporter']
+    eventos_vencidos = summary['vencidos']
+    eventos_proximos = summary['proximos_vencimento']
     
     alerts_shown = False
     
@@ -727,6 +917,25 @@ def show_alerts(data):
         """, unsafe_allow_html=True)
         alerts_shown = True
     
+    if eventos_vencidos > 0:
+        st.markdown(f"""
+        <div class="alert alert-danger">
+            <strong>📅 Eventos Vencidos</strong><br>
+            Existem {eventos_vencidos} eventos com data de montagem vencida.
+        </div>
+        """, unsafe_allow_html=True)
+        alerts_shown = True
+    
+    if eventos_proximos > 0:
+        dias = MonitorConfig.ALERT_THRESHOLDS['DAYS_BEFORE_EXPIRY_WARNING']
+        st.markdown(f"""
+        <div class="alert alert-warning">
+            <strong>⏰ Montagens Próximas</strong><br>
+            Existem {eventos_proximos} eventos com montagem nos próximos {dias} dias.
+        </div>
+        """, unsafe_allow_html=True)
+        alerts_shown = True
+    
     if not alerts_shown:
         st.success("✅ Nenhum alerta no momento. Todos os eventos estão em dia!")
     
@@ -735,11 +944,11 @@ def show_alerts(data):
 def generate_report(data):
     """Gera relatório dos dados"""
     
+    manager = st.session_state.get('monitor_manager') or MonitorManager()
+    summary = manager.summarize(data)
+    
     # Análise por status
-    status_counts = {}
-    for item in data:
-        status = item['status']
-        status_counts[status] = status_counts.get(status, 0) + 1
+    status_counts = summary['by_status']
     
     # Gráfico de status
     if status_counts:
@@ -752,13 +961,7 @@ def generate_report(data):
         st.plotly_chart(fig_status, use_container_width=True)
     
     # Análise por monitores
-    monitores_por_sala = {}
-    for item in data:
-        sala = item['sala']
-        monitores = item['monitores']
-        if sala not in monitores_por_sala:
-            monitores_por_sala[sala] = 0
-        monitores_por_sala[sala] += monitores
+    monitores_por_sala = summary['monitores_por_sala']
     
     if monitores_por_sala:
         fig_monitores = px.bar(
@@ -163,7 +163,7 @@ def show_period_chart(period: str, building_filter: str):
                         period_data,
                         f"Perdas - {period.title()}",
                         "Período",
-                        "Valor (R$)"
+                        "Quantidade"
                     )
                     st.plotly_chart(fig, use_container_width=True)
                     
@@ -172,15 +172,15 @@ def show_period_chart(period: str, building_filter: str):
                         col1, col2, col3 = st.columns(3)
                         
                         with col1:
-                            st.metric("Total", format_currency(sum(period_data['values'])))
+                            st.metric("Total", format_number(sum(period_data['values']), 0))
                         
                         with col2:
                             avg_value = sum(period_data['values']) / len(period_data['values'])
-                            st.metric("Média", format_currency(avg_value))
+                            st.metric("Média", format_number(avg_value, 1))
                         
                         with col3:
                             max_value = max(period_data['values'])
-                            st.metric("Máximo", format_currency(max_value))
+                            st.metric("Máximo", format_number(max_value, 0))
                 else:
                     show_info_message("Nenhum dado disponível para o período selecionado")
             else:
@@ -205,7 +205,7 @@ def show_building_chart(period: str):
                     # Criar gráfico de pizza
                     fig = ChartGenerator.create_pie_chart(
                         building_data,
-                        "Distribuição de Perdas por Prédio"
+                        f"Distribuição de Perdas por Prédio - {chart_data.get('currentPeriod', '')}"
                     )
                     st.plotly_chart(fig, use_container_width=True)
                     
@@ -215,13 +215,12 @@ def show_building_chart(period: str):
                     import pandas as pd
                     df = pd.DataFrame({
                         'Prédio': building_data['labels'],
-                        'Valor': [format_currency(v) for v in building_data['values']],
                         'Quantidade': building_data['values']
                     })
                     
                     st.dataframe(df, use_container_width=True, hide_index=True)
                 else:
-                    show_info_message("Nenhum dado disponível por prédio")
+                    show_info_message("Nenhuma perda registrada por prédio no período atual")
             else:
                 show_error_message("Erro ao carregar dados por prédio")
                 
@@ -244,7 +243,7 @@ def show_item_type_chart(period: str):
                     # Criar gráfico de barras
                     fig = ChartGenerator.create_bar_chart(
                         item_type_data,
-                        "Perdas por Tipo de Item",
+                        f"Perdas por Tipo de Item - {chart_data.get('currentPeriod', '')}",
                         "Tipo de Item",
                         "Quantidade"
                     )
@@ -269,7 +268,7 @@ def show_item_type_chart(period: str):
                     
                     st.dataframe(df, use_container_width=True, hide_index=True)
                 else:
-                    show_info_message("Nenhum dado disponível por tipo de item")
+                    show_info_message("Nenhuma perda registrada por tipo de item no período atual")
             else:
                 show_error_message("Erro ao carregar dados por tipo de item")
                 
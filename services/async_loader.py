@@ -0,0 +1,93 @@
+"""
+Carregamento concorrente de fontes de dados independentes (JIRA, gviz, gspread)
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# nome da fonte -> (função sem argumentos, timeout em segundos)
+Sources = Dict[str, Tuple[Callable[[], Any], float]]
+
+
+class AsyncLoader:
+    """Dispara chamadas bloqueantes em paralelo via asyncio com timeout por fonte
+
+    As funções rodam em um pool de threads próprio (os clientes gspread/requests
+    são síncronos). Uma fonte que falha ou estoura o timeout é substituída pelo
+    último valor obtido com sucesso, quando houver.
+    """
+
+    def __init__(self, max_workers: int = 8):
+        # Pool persistente: threads que estouraram o timeout terminam em segundo
+        # plano sem bloquear o encerramento do event loop
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='async-loader')
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Any] = {}
+
+    # ------------------------------------------------------------------
+    # Execução
+    # ------------------------------------------------------------------
+    def _run(self, coroutine):
+        """Executa a corrotina mesmo se já houver um event loop nesta thread"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coroutine)
+
+        return self._executor.submit(asyncio.run, coroutine).result()
+
+    async def _call(self, name: str, func: Callable[[], Any], timeout: float) -> Tuple[str, Any, float]:
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        value = await asyncio.wait_for(loop.run_in_executor(self._executor, func), timeout)
+        return name, value, time.monotonic() - started
+
+    def _result(self, name: str, value: Any = None, elapsed: float = 0.0,
+                error: Optional[Exception] = None, cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Monta o resultado de uma fonte (usando o cache se ela falhou)"""
+        cache_key = cache_key or name
+
+        if error is None:
+            with self._lock:
+                self._cache[cache_key] = value
+            return {'source': name, 'data': value, 'from_cache': False, 'error': None, 'elapsed': elapsed}
+
+        message = 'timeout' if isinstance(error, asyncio.TimeoutError) else str(error)
+
+        with self._lock:
+            cached = self._cache.get(cache_key)
+
+        logger.warning(f"Fonte {name} falhou ({message})" + ("; usando dados em cache" if cached is not None else ""))
+        return {'source': name, 'data': cached, 'from_cache': cached is not None, 'error': message, 'elapsed': elapsed}
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def gather(self, sources: Sources) -> Dict[str, Dict[str, Any]]:
+        """Executa todas as fontes em paralelo; retorna um resultado por fonte"""
+        async def run_all():
+            tasks = [self._call(name, func, timeout) for name, (func, timeout) in sources.items()]
+            return await asyncio.gather(*tasks, return_exceptions=True)
+
+        outcomes = self._run(run_all())
+
+        results = {}
+        for name, outcome in zip(sources, outcomes):
+            if isinstance(outcome, BaseException):
+                results[name] = self._result(name, error=outcome)
+            else:
+                _, value, elapsed = outcome
+                results[name] = self._result(name, value, elapsed)
+
+        return results
+
+
+# Instância global
+async_loader = AsyncLoader(max_workers=settings.ASYNC_LOADER_WORKERS)
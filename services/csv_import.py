@@ -0,0 +1,294 @@
+"""
+Importação de CSV do inventário em lotes (streaming)
+"""
+import codecs
+import csv
+import io
+import itertools
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Deque, Dict, Iterator, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+
+from config.settings import settings
+from config_app import AppConfig
+from services.movement_table import DATE_FORMAT, parse_timestamps
+from utils.data_processing import DataProcessor
+
+logger = logging.getLogger(__name__)
+
+# Colunas do CSV de upload (na ordem)
+CSV_COLUMNS = [
+    'itemId', 'dateTime', 'amount', 'building', 'email',
+    'invoiceNumber', 'sku', 'location', 'supplier', 'shelfLocation'
+]
+
+# Catálogo para validar/normalizar (chaves em minúsculas; ESTOQUE vale para todo prédio)
+CATALOG_BUILDINGS = {building.lower(): building for building in AppConfig.ITEMS_BY_BUILDING}
+CATALOG_ITEMS = {
+    f'{building}|{item.lower()}': item
+    for building, items in AppConfig.ITEMS_BY_BUILDING.items() for item in items
+}
+CATALOG_ANY_ITEM = {item.lower(): item for items in AppConfig.ITEMS_BY_BUILDING.values() for item in items}
+CATALOG_FLOORS = {
+    f'{building}|{floor.lower()}': floor
+    for building, floors in AppConfig.BUILDING_FLOORS.items() for floor in floors + ['ESTOQUE']
+}
+
+# Bytes lidos do início do arquivo para detectar a codificação
+ENCODING_SAMPLE_SIZE = 64 * 1024
+
+# Tamanho dos blocos na conferência da codificação do arquivo inteiro
+ENCODING_CHECK_BLOCK = 1024 * 1024
+
+# progress(linhas processadas, bytes lidos, bytes totais)
+ProgressCallback = Callable[[int, int, int], None]
+
+
+def detect_stream_encoding(source: BinaryIO) -> str:
+    """Codificação do arquivo inteiro, conferida antes de qualquer lote ser gravado
+
+    O início do arquivo indica a candidata (UTF-8, com ou sem BOM); o restante é
+    decodificado em blocos sem guardar o texto. Um byte inválido em qualquer ponto
+    faz o arquivo todo ser lido como latin1, em vez de a importação falhar no meio
+    com lotes já gravados.
+    """
+    source.seek(0)
+    encoding = DataProcessor.detect_encoding(source.read(ENCODING_SAMPLE_SIZE))
+
+    if encoding != 'latin1':
+        source.seek(0)
+        decoder = codecs.getincrementaldecoder(encoding)()
+        offset = 0
+        try:
+            for block in iter(lambda: source.read(ENCODING_CHECK_BLOCK), b''):
+                decoder.decode(block)
+                offset += len(block)
+            decoder.decode(b'', final=True)
+        except UnicodeDecodeError:
+            logger.warning(f"CSV não é {encoding} válido (bloco a partir do byte {offset}); lendo como latin1")
+            encoding = 'latin1'
+
+    source.seek(0)
+    return encoding
+
+
+def iter_csv_chunks(source: BinaryIO, chunk_size: int) -> Iterator[Tuple[np.ndarray, pd.DataFrame]]:
+    """Lê o CSV em lotes de até chunk_size linhas: (números das linhas no arquivo, DataFrame de texto)
+
+    Linhas em branco são ignoradas e o cabeçalho (primeira coluna "Item ID") é
+    opcional. Linhas com menos colunas são completadas; colunas extras são ignoradas.
+    """
+    encoding = detect_stream_encoding(source)
+
+    width = len(CSV_COLUMNS)
+    text = io.TextIOWrapper(source, encoding=encoding, newline='')
+    try:
+        reader = csv.reader(text, skipinitialspace=True)
+        rows: List[List[str]] = []
+        line_numbers: List[int] = []
+        first = True
+
+        for row in reader:
+            if not row or (len(row) == 1 and not row[0].strip()):
+                continue
+            if first:
+                first = False
+                if row[0].strip().lower().replace(' ', '') == 'itemid':
+                    continue
+
+            rows.append(row[:width] if len(row) >= width else row + [''] * (width - len(row)))
+            line_numbers.append(reader.line_num)
+
+            if len(rows) >= chunk_size:
+                yield np.array(line_numbers), pd.DataFrame(rows, columns=CSV_COLUMNS, dtype=str)
+                rows, line_numbers = [], []
+
+        if rows:
+            yield np.array(line_numbers), pd.DataFrame(rows, columns=CSV_COLUMNS, dtype=str)
+    finally:
+        # Não fecha o arquivo do chamador junto com o wrapper
+        text.detach()
+
+
+def _catalog_key(building: pd.Series, value: pd.Series) -> pd.Series:
+    return building + '|' + value.str.lower()
+
+
+def validate_chunk(frame: pd.DataFrame, line_numbers: np.ndarray,
+                   max_errors: Optional[int] = None) -> Tuple[List[Dict[str, Any]], List[str], int]:
+    """Valida e normaliza um lote no esquema de DataManager._prepare_row_data
+
+    Prédio, item e andar são conferidos com o catálogo do AppConfig (sem
+    diferenciar maiúsculas) e gravados com a grafia do catálogo. Retorna
+    (registros válidos, mensagens de erro até max_errors, total de linhas
+    inválidas). Quantidades negativas viram perda, positivas entrada; sem
+    data usa o horário atual.
+    """
+    frame = frame.apply(lambda column: column.str.strip())
+    amount = pd.to_numeric(frame['amount'], errors='coerce')
+    timestamps = parse_timestamps(frame['dateTime'])
+
+    building = frame['building'].str.lower().map(CATALOG_BUILDINGS)
+    known_building = building.notna()
+    item = _catalog_key(building.fillna(''), frame['itemId']).map(CATALOG_ITEMS)
+    item = item.fillna(frame['itemId'].str.lower().map(CATALOG_ANY_ITEM))
+    floor = _catalog_key(building.fillna(''), frame['location']).map(CATALOG_FLOORS)
+
+    # Cada linha recebe só o primeiro erro, na ordem abaixo
+    checks = [
+        ((frame['itemId'] == ''), lambda i: "Item ID obrigatório"),
+        ((amount.isna() | (amount == 0)), lambda i: f"quantidade inválida ({frame['amount'].iat[i]})"),
+        (((frame['dateTime'] != '') & timestamps.isna()), lambda i: f"data inválida ({frame['dateTime'].iat[i]})"),
+        (((frame['building'] != '') & ~known_building), lambda i: f"prédio desconhecido ({frame['building'].iat[i]})"),
+        ((known_building & item.isna()), lambda i: f"item {frame['itemId'].iat[i]} não cadastrado em {building.iat[i]}"),
+        ((item.isna()), lambda i: f"item {frame['itemId'].iat[i]} não cadastrado"),
+        ((known_building & (frame['location'] != '') & floor.isna()),
+         lambda i: f"andar {frame['location'].iat[i]} não existe em {building.iat[i]}")
+    ]
+    masks = np.vstack([mask.to_numpy(dtype=bool) for mask, _ in checks])
+    invalid = masks.any(axis=0)
+
+    errors = []
+    for position in np.flatnonzero(invalid)[:max_errors]:
+        message = checks[int(masks[:, position].argmax())][1]
+        errors.append(f"Linha {line_numbers[position]}: {message(position)}")
+
+    valid = frame[~invalid]
+    amount = amount[~invalid].astype(float)
+    now = datetime.now()
+    stamp = int(now.timestamp() * 1000)
+
+    columns = {field: valid[field].tolist() for field in CSV_COLUMNS}
+    columns['itemId'] = item[~invalid].tolist()
+    columns['building'] = building[~invalid].fillna('').tolist()
+    columns['location'] = floor[~invalid].fillna(valid['location']).tolist()
+    columns['dateTime'] = valid['dateTime'].replace('', now.strftime(DATE_FORMAT)).tolist()
+    columns['amount'] = amount.tolist()
+    columns['type'] = np.where(amount > 0, 'entrada', 'perda').tolist()
+    # Mesmo formato de generate_inventory_id, com os sufixos aleatórios gerados de uma vez
+    suffixes = os.urandom(4 * len(valid)).hex().upper()
+    columns['inventoryId'] = [f'INV_{stamp}_{suffixes[i:i + 8]}' for i in range(0, len(suffixes), 8)]
+
+    records = [dict(zip(columns, values)) for values in zip(*columns.values())]
+    return records, errors, int(invalid.sum())
+
+
+def iter_validated_chunks(chunks: Iterator[Tuple[np.ndarray, pd.DataFrame]], workers: int,
+                          max_errors: Optional[int] = None) -> Iterator[Tuple[np.ndarray, Tuple]]:
+    """Valida os lotes em um pool de processos, devolvendo na ordem do arquivo
+
+    O pool só é criado quando há mais de um lote. No máximo 2 lotes por
+    processo ficam em andamento, então a memória continua limitada pelo
+    tamanho do lote mesmo com o arquivo sendo lido mais rápido que validado.
+    """
+    chunks = iter(chunks)
+    first = next(chunks, None)
+    if first is None:
+        return
+    second = next(chunks, None)
+
+    if second is None or workers <= 1:
+        for line_numbers, frame in itertools.chain([first], [second] if second is not None else [], chunks):
+            yield line_numbers, validate_chunk(frame, line_numbers, max_errors)
+        return
+
+    # spawn: o processo do Streamlit tem várias threads, fork não é seguro
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    pending: Deque = deque()
+    try:
+        for line_numbers, frame in itertools.chain([first, second], chunks):
+            pending.append((line_numbers, executor.submit(validate_chunk, frame, line_numbers, max_errors)))
+            if len(pending) >= 2 * workers:
+                line_numbers, future = pending.popleft()
+                yield line_numbers, future.result()
+
+        while pending:
+            line_numbers, future = pending.popleft()
+            yield line_numbers, future.result()
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def import_csv(source: BinaryIO, save_batch: Callable[[List[Dict[str, Any]]], bool], filename: str = '',
+               progress: Optional[ProgressCallback] = None, chunk_size: Optional[int] = None) -> Dict[str, Any]:
+    """Importa um CSV lote a lote, gravando cada lote válido com save_batch
+
+    A memória usada depende do tamanho do lote, não do arquivo. Lotes já
+    gravados permanecem se um lote posterior falhar.
+    """
+    chunk_size = chunk_size or settings.CSV_IMPORT_CHUNK_SIZE
+    name = filename or 'arquivo'
+
+    source.seek(0, io.SEEK_END)
+    total_bytes = source.tell()
+
+    processed = saved = error_count = 0
+    errors: List[str] = []
+
+    workers = settings.CSV_IMPORT_WORKERS or os.cpu_count() or 1
+    rows = iter_csv_chunks(source, chunk_size)
+    chunks = iter_validated_chunks(rows, workers, settings.CSV_IMPORT_MAX_ERRORS)
+
+    try:
+        # Lotes chegam na ordem do arquivo: erros e gravações são determinísticos
+        for line_numbers, (records, chunk_errors, chunk_error_count) in chunks:
+            errors.extend(chunk_errors[:max(settings.CSV_IMPORT_MAX_ERRORS - len(errors), 0)])
+            error_count += chunk_error_count
+            processed += len(line_numbers)
+
+            if records:
+                if not save_batch(records):
+                    return {
+                        'success': False,
+                        'error': f"Não foi possível salvar os registros (linha {line_numbers[0]} em diante)",
+                        'errors': errors,
+                        'successCount': saved,
+                        'totalProcessed': processed
+                    }
+                saved += len(records)
+
+            if progress:
+                progress(processed, min(source.tell(), total_bytes), total_bytes)
+
+    except Exception as e:
+        logger.error(f"Erro ao importar CSV {name}: {e}")
+        return {
+            'success': False,
+            'error': f"Erro ao processar CSV: {e}",
+            'errors': errors,
+            'errorCount': error_count,
+            'successCount': saved
+        }
+
+    finally:
+        chunks.close()
+        rows.close()
+
+    if error_count > len(errors):
+        errors.append(f"... e mais {error_count - len(errors)} linhas com erro")
+
+    if not saved:
+        return {
+            'success': False,
+            'error': f"Nenhum registro válido em {name}",
+            'errors': errors,
+            'errorCount': error_count,
+            'totalProcessed': processed
+        }
+
+    logger.info(f"CSV {name} importado: {saved} de {processed} linhas")
+    return {
+        'success': True,
+        'message': f"{saved} registros importados de {name}",
+        'successCount': saved,
+        'totalProcessed': processed,
+        'errors': errors,
+        'errorCount': error_count
+    }
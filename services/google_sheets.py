@@ -1,15 +1,16 @@
 """
 Serviço para integração com Google Sheets
 """
-import gspread
 import pandas as pd
-from google.oauth2.service_account import Credentials
 from typing import List, Dict, Any, Optional
 import streamlit as st
 from datetime import datetime
 import logging
 
 from config.settings import settings
+from services.rate_limiter import sheets_rate_limiter
+from services.sheets_client import sheets_client_provider
+from services.sheets_sync import sheets_sync, to_records
 
 logger = logging.getLogger(__name__)
 
@@ -21,62 +22,55 @@ class GoogleSheetsService:
         self._initialize_client()
     
     def _initialize_client(self):
-        """Inicializa o cliente do Google Sheets"""
+        """Inicializa o cliente do Google Sheets (compartilhado pelo processo)"""
         try:
-            # Tentar usar credenciais do Streamlit secrets primeiro
-            if hasattr(st, 'secrets') and 'google_sheets' in st.secrets:
-                credentials_dict = dict(st.secrets['google_sheets'])
-                credentials = Credentials.from_service_account_info(
-                    credentials_dict,
-                    scopes=[
-                        'https://www.googleapis.com/auth/spreadsheets',
-                        'https://www.googleapis.com/auth/drive'
-                    ]
-                )
-            else:
-                # Fallback para arquivo local
-                credentials = Credentials.from_service_account_file(
-                    settings.GOOGLE_CREDENTIALS_FILE,
-                    scopes=[
-                        'https://www.googleapis.com/auth/spreadsheets',
-                        'https://www.googleapis.com/auth/drive'
-                    ]
-                )
+            self.gc = sheets_client_provider.get_client()
             
-            self.gc = gspread.authorize(credentials)
-            logger.info("Google Sheets client initialized successfully")
+            if self.gc is None:
+                logger.error("Failed to initialize Google Sheets client: credentials not found")
             
         except Exception as e:
             logger.error(f"Failed to initialize Google Sheets client: {e}")
             self.gc = None
     
     def get_worksheet(self, spreadsheet_id: str, sheet_name: str):
-        """Obtém uma worksheet específica"""
+        """Obtém uma worksheet específica (handle em cache)"""
         if not self.gc:
             raise Exception("Google Sheets client not initialized")
         
         try:
-            spreadsheet = self.gc.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.worksheet(sheet_name)
-            return worksheet
+            return sheets_client_provider.get_worksheet(spreadsheet_id, sheet_name)
         except Exception as e:
             logger.error(f"Failed to get worksheet {sheet_name}: {e}")
             raise
     
-    def read_sheet_data(self, spreadsheet_id: str, sheet_name: str) -> pd.DataFrame:
-        """Lê dados de uma planilha e retorna como DataFrame"""
+    def read_sheet_data(self, spreadsheet_id: str, sheet_name: str, incremental: bool = False,
+                        last_column: str = 'Z') -> pd.DataFrame:
+        """Lê dados de uma planilha e retorna como DataFrame
+        
+        Com incremental=True (abas append-only) só as linhas novas são baixadas.
+        """
         try:
             worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
-            data = worksheet.get_all_records()
             
-            if not data:
-                return pd.DataFrame()
+            if incremental:
+                header, rows = sheets_sync.fetch(worksheet, spreadsheet_id, sheet_name, last_column=last_column)
+                if not rows:
+                    return pd.DataFrame()
+                df = pd.DataFrame(to_records(header, rows))
+            else:
+                data = sheets_rate_limiter.call('read', worksheet.get_all_records)
+                
+                if not data:
+                    return pd.DataFrame()
+                
+                df = pd.DataFrame(data)
             
-            df = pd.DataFrame(data)
             logger.info(f"Successfully read {len(df)} rows from {sheet_name}")
             return df
             
         except Exception as e:
+            sheets_client_provider.invalidate(spreadsheet_id, sheet_name)
             logger.error(f"Failed to read sheet data: {e}")
             return pd.DataFrame()
     
@@ -84,11 +78,12 @@ class GoogleSheetsService:
         """Adiciona uma nova linha à planilha"""
         try:
             worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
-            worksheet.append_row(row_data)
+            sheets_rate_limiter.call('write', worksheet.append_row, row_data, idempotent=False)
             logger.info(f"Successfully appended row to {sheet_name}")
             return True
             
         except Exception as e:
+            sheets_client_provider.invalidate(spreadsheet_id, sheet_name)
             logger.error(f"Failed to append row: {e}")
             return False
     
@@ -96,11 +91,12 @@ class GoogleSheetsService:
         """Atualiza uma célula específica"""
         try:
             worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
-            worksheet.update_cell(row, col, value)
+            sheets_rate_limiter.call('write', worksheet.update_cell, row, col, value)
             logger.info(f"Successfully updated cell ({row}, {col}) in {sheet_name}")
             return True
             
         except Exception as e:
+            sheets_client_provider.invalidate(spreadsheet_id, sheet_name)
             logger.error(f"Failed to update cell: {e}")
             return False
     
@@ -108,11 +104,12 @@ class GoogleSheetsService:
         """Limpa todo o conteúdo de uma planilha"""
         try:
             worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
-            worksheet.clear()
+            sheets_rate_limiter.call('write', worksheet.clear)
             logger.info(f"Successfully cleared {sheet_name}")
             return True
             
         except Exception as e:
+            sheets_client_provider.invalidate(spreadsheet_id, sheet_name)
             logger.error(f"Failed to clear sheet: {e}")
             return False
     
@@ -120,19 +117,22 @@ class GoogleSheetsService:
         """Atualiza múltiplas células de uma vez"""
         try:
             worksheet = self.get_worksheet(spreadsheet_id, sheet_name)
-            worksheet.update(start_cell, data)
+            sheets_rate_limiter.call('write', worksheet.update, range_name=start_cell, values=data)
             logger.info(f"Successfully batch updated {len(data)} rows in {sheet_name}")
             return True
             
         except Exception as e:
+            sheets_client_provider.invalidate(spreadsheet_id, sheet_name)
             logger.error(f"Failed to batch update: {e}")
             return False
     
     def create_sheet(self, spreadsheet_id: str, sheet_name: str):
         """Cria uma nova aba na planilha"""
         try:
-            spreadsheet = self.gc.open_by_key(spreadsheet_id)
-            worksheet = spreadsheet.add_worksheet(title=sheet_name, rows="1000", cols="20")
+            spreadsheet = sheets_client_provider.get_spreadsheet(spreadsheet_id)
+            worksheet = sheets_rate_limiter.call(
+                'write', spreadsheet.add_worksheet, title=sheet_name, rows="1000", cols="20", idempotent=False
+            )
             logger.info(f"Successfully created sheet {sheet_name}")
             return worksheet
             
@@ -143,13 +143,20 @@ class GoogleSheetsService:
     def sheet_exists(self, spreadsheet_id: str, sheet_name: str) -> bool:
         """Verifica se uma aba existe na planilha"""
         try:
-            spreadsheet = self.gc.open_by_key(spreadsheet_id)
-            sheet_names = [ws.title for ws in spreadsheet.worksheets()]
+            if sheets_client_provider.has_cached_worksheet(spreadsheet_id, sheet_name):
+                return True
+            
+            spreadsheet = sheets_client_provider.get_spreadsheet(spreadsheet_id)
+            sheet_names = [ws.title for ws in sheets_rate_limiter.call('read', spreadsheet.worksheets)]
             return sheet_name in sheet_names
             
         except Exception as e:
             logger.error(f"Failed to check if sheet exists: {e}")
             return False
+    
+    def get_rate_limit_metrics(self) -> Dict[str, Any]:
+        """Métricas de throttling compartilhadas por todo acesso ao Sheets"""
+        return sheets_rate_limiter.metrics()
 
 # Instância global do serviço
 google_sheets_service = GoogleSheetsService()
@@ -0,0 +1,176 @@
+"""
+Cliente gviz (Google Visualization API) com parser incremental da resposta
+"""
+import json
+import re
+from typing import Any, Dict, Iterator, List, Optional
+import logging
+
+import requests
+
+from services.rate_limiter import sheets_rate_limiter, RETRYABLE_STATUS
+
+logger = logging.getLogger(__name__)
+
+ROWS_MARKER = re.compile(r'"rows"\s*:\s*\[')
+COLS_MARKER = re.compile(r'"cols"\s*:\s*')
+WRAPPER_PREFIX = 'setResponse('
+DATE_PATTERN = re.compile(r'Date\((\d+),(\d+),(\d+)(?:,(\d+),(\d+),(\d+))?')
+
+
+class GvizError(Exception):
+    """Erro retornado pela consulta gviz (status != ok)"""
+
+
+def convert_cell(cell: Optional[Dict[str, Any]], column_type: str) -> Any:
+    """Converte uma célula gviz no valor tipado (datas viram dd/mm/YYYY)"""
+    if cell is None:
+        return ''
+
+    value = cell.get('v')
+    if value is None:
+        return ''
+
+    if column_type in ('date', 'datetime') and isinstance(value, str):
+        match = DATE_PATTERN.match(value)
+        if match:
+            # Mês do gviz é 0-based (JavaScript)
+            year, month, day, hour, minute, second = match.groups()
+            text = f"{int(day):02d}/{int(month) + 1:02d}/{year}"
+            if hour is not None and column_type == 'datetime':
+                text += f" {int(hour):02d}:{int(minute):02d}:{int(second):02d}"
+            return text
+        return cell.get('f', value)
+
+    if column_type == 'timeofday' and isinstance(value, list):
+        return cell.get('f', ':'.join(f"{int(part):02d}" for part in value[:3]))
+
+    if column_type == 'number' and isinstance(value, float) and value.is_integer():
+        return int(value)
+
+    return value
+
+
+class GvizClient:
+    """Busca consultas gviz e entrega as linhas uma a uma, sem materializar o JSON
+
+    A resposta (JSONP `google.visualization.Query.setResponse({...});`) é lida
+    em blocos: o wrapper e o cabeçalho da tabela são descartados assim que
+    passam, e cada objeto de `table.rows` é decodificado com raw_decode e
+    entregue já convertido.
+    """
+
+    def __init__(self, chunk_size: int = 64 * 1024, timeout: float = 30):
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self._decoder = json.JSONDecoder()
+        self.session = requests.Session()
+
+    def open(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Abre a requisição em modo streaming (429/5xx repetidos pelo rate limiter)"""
+        def fetch():
+            response = self.session.get(url, headers=headers or {}, stream=True, timeout=self.timeout)
+            if response.status_code in RETRYABLE_STATUS:
+                response.close()
+                response.raise_for_status()
+            return response
+
+        return sheets_rate_limiter.call('read', fetch)
+
+    def iter_rows(self, response: requests.Response) -> Iterator[List[Any]]:
+        """Percorre as linhas da resposta já com valores tipados"""
+        response.encoding = response.encoding or 'utf-8'
+        chunks = response.iter_content(chunk_size=self.chunk_size, decode_unicode=True)
+
+        try:
+            header = self._read_header(chunks)
+            if header is not None:
+                buffer, column_types = header
+                yield from self._read_rows(chunks, buffer, column_types)
+        finally:
+            response.close()
+
+    def _read_header(self, chunks: Iterator[str]):
+        """Consome o wrapper e o cabeçalho até o início de table.rows"""
+        buffer = ''
+
+        for chunk in chunks:
+            buffer += chunk
+            # Reprocura só o final do buffer (o marcador pode ter sido cortado ao meio)
+            marker = ROWS_MARKER.search(buffer, max(0, len(buffer) - len(chunk) - 16))
+            if marker:
+                return buffer[marker.end():], self._column_types(buffer[:marker.start()])
+
+        # Sem table.rows: resposta de erro (pequena), tabela vazia ou formato inesperado
+        self._raise_for_payload(buffer)
+        return None
+
+    def _column_types(self, header: str) -> List[str]:
+        status = re.search(r'"status"\s*:\s*"(\w+)"', header)
+        if status and status.group(1) == 'error':
+            raise GvizError(header)
+
+        cols_at = COLS_MARKER.search(header)
+        if not cols_at:
+            return []
+
+        cols, _ = self._decoder.raw_decode(header, cols_at.end())
+        return [col.get('type', 'string') for col in cols]
+
+    def _raise_for_payload(self, text: str) -> None:
+        start = text.find(WRAPPER_PREFIX)
+        if start < 0:
+            raise GvizError("resposta gviz em formato inesperado")
+
+        try:
+            payload, _ = self._decoder.raw_decode(text, start + len(WRAPPER_PREFIX))
+        except ValueError:
+            raise GvizError("resposta gviz incompleta")
+
+        if payload.get('status') != 'ok':
+            messages = [error.get('detailed_message') or error.get('message', '') for error in payload.get('errors', [])]
+            raise GvizError(f"gviz retornou status {payload.get('status')}: {'; '.join(messages)}")
+
+    def _read_rows(self, chunks: Iterator[str], buffer: str, column_types: List[str]) -> Iterator[List[Any]]:
+        position = 0
+        exhausted = False
+
+        while True:
+            # Pula separadores entre objetos
+            while position < len(buffer) and buffer[position] in ' \t\r\n,':
+                position += 1
+
+            if position < len(buffer):
+                if buffer[position] == ']':
+                    return
+
+                try:
+                    row, end = self._decoder.raw_decode(buffer, position)
+                except ValueError:
+                    if exhausted:
+                        raise GvizError("resposta gviz truncada")
+                    row = None
+
+                if row is not None:
+                    position = end
+                    cells = row.get('c') or []
+                    yield [
+                        convert_cell(cell, column_types[index] if index < len(column_types) else 'string')
+                        for index, cell in enumerate(cells)
+                    ]
+                    continue
+            elif exhausted:
+                raise GvizError("resposta gviz truncada")
+
+            # Precisa de mais dados: descarta o que já foi consumido
+            buffer = buffer[position:]
+            position = 0
+            chunk = next(chunks, None)
+            if chunk is None:
+                exhausted = True
+            else:
+                buffer += chunk
+
+
+# Instância global
+gviz_client = GvizClient()
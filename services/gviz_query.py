@@ -0,0 +1,97 @@
+"""
+Tradução dos filtros do painel de monitores para a Query Language do gviz
+"""
+from datetime import date, datetime
+from typing import Any, Dict, List, Optional
+import logging
+
+from monitor_config import MonitorConfig
+
+logger = logging.getLogger(__name__)
+
+
+def column_letter(name: str) -> str:
+    """Letra da coluna a partir de MonitorConfig.COLUMN_MAPPING"""
+    return chr(ord('A') + MonitorConfig.COLUMN_MAPPING[name])
+
+
+def quote_literal(value: Any) -> Optional[str]:
+    """Literal de string do gviz
+
+    A linguagem não tem sequência de escape: usa-se aspas duplas ou simples,
+    a que não aparecer no valor. Se o valor contiver as duas, não há literal
+    possível e o filtro precisa ser aplicado localmente (retorna None).
+    """
+    text = str(value)
+    if '"' not in text:
+        return f'"{text}"'
+    if "'" not in text:
+        return f"'{text}'"
+    return None
+
+
+def date_literal(value: date) -> str:
+    """Literal de data do gviz (date "YYYY-MM-DD")"""
+    return f'date "{value.strftime("%Y-%m-%d")}"'
+
+
+def build_events_query(filters: Dict[str, Any]) -> Optional[str]:
+    """Monta a consulta gviz para os filtros (status, status_atendimento, sala,
+    date_from, date_to); retorna None se algum valor não puder ser expresso"""
+    conditions = []
+
+    for field, column in (('status', 'STATUS'), ('status_atendimento', 'STATUS_ATENDIMENTO'), ('sala', 'SALA')):
+        value = filters.get(field)
+        if value:
+            literal = quote_literal(value)
+            if literal is None:
+                return None
+            conditions.append(f"{column_letter(column)} = {literal}")
+
+    # Período pela data de montagem; toDate aceita colunas date e datetime
+    montagem = column_letter('DATA_MONTAGEM')
+    if filters.get('date_from'):
+        conditions.append(f"toDate({montagem}) >= {date_literal(filters['date_from'])}")
+    if filters.get('date_to'):
+        conditions.append(f"toDate({montagem}) <= {date_literal(filters['date_to'])}")
+
+    # Parte da consulta base (colunas A-J, só linhas com key)
+    return ' AND '.join([MonitorConfig.EVENTS_QUERY] + conditions)
+
+
+def _parse_date(value: Any) -> Optional[date]:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    try:
+        return datetime.strptime(str(value).strip()[:10], '%d/%m/%Y').date()
+    except ValueError:
+        return None
+
+
+def filter_events_locally(data: List[Dict[str, Any]], filters: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Mesma semântica de build_events_query aplicada a registros já carregados"""
+    result = data
+
+    for field in ('status', 'status_atendimento', 'sala'):
+        value = filters.get(field)
+        if value:
+            result = [item for item in result if item.get(field) == value]
+
+    date_from = filters.get('date_from')
+    date_to = filters.get('date_to')
+    if date_from or date_to:
+        filtered = []
+        for item in result:
+            montagem = _parse_date(item.get('data_montagem'))
+            if montagem is None:
+                continue
+            if date_from and montagem < date_from:
+                continue
+            if date_to and montagem > date_to:
+                continue
+            filtered.append(item)
+        result = filtered
+
+    return result
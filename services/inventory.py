@@ -1,554 +1,261 @@
 """
-Página de Controle de Inventário
+Serviço de inventário: leitura, registro de movimentações e dados dos gráficos
 """
-import streamlit as st
-import pandas as pd
-from datetime import datetime
+import io
+import threading
+import time
+import uuid
+from datetime import date, datetime
+from typing import BinaryIO, Dict, List, Any, Optional, Tuple, Union
 import logging
 
-from services.inventory import inventory_service
-from utils.helpers import (
-    show_success_message, show_error_message, show_info_message,
-    show_loading_spinner, display_dataframe_with_filters,
-    validate_uploaded_file, parse_uploaded_csv
-)
-from config.settings import settings
+import pandas as pd
+
+from data_manager import data_manager
+from services.csv_import import CSV_COLUMNS, ProgressCallback, import_csv
+from services.inventory_repository import InventoryRepository, InventorySnapshot, inventory_repository
+from services.inventory_rollup import DailyRollup
+from services.movement_table import frame_records
+from utils.data_processing import DataProcessor
 
 logger = logging.getLogger(__name__)
 
-def show():
-    """Exibe a página de inventário"""
-    
-    st.title("📦 Controle de Inventário")
-    st.markdown("Gerencie entradas e saídas de equipamentos")
-    
-    # Tabs principais
-    tab1, tab2, tab3, tab4 = st.tabs([
-        "➕ Novo Registro",
-        "📊 Visualizar Dados", 
-        "📤 Upload CSV",
-        "📈 Relatórios"
-    ])
-    
-    with tab1:
-        show_new_record_form()
-    
-    with tab2:
-        show_inventory_data()
-    
-    with tab3:
-        show_csv_upload()
-    
-    with tab4:
-        show_reports()
-
-def show_new_record_form():
-    """Exibe formulário para novo registro"""
-    st.subheader("➕ Registrar Nova Movimentação")
-    
-    with st.form("inventory_form", clear_on_submit=True):
-        col1, col2 = st.columns(2)
-        
-        with col1:
-            item_id = st.text_input(
-                "🔧 Item ID *",
-                placeholder="Ex: Headset-hq1, Mouse-hq2",
-                help="Identificador único do item"
-            )
-            
-            amount = st.number_input(
-                "📊 Quantidade *",
-                min_value=1,
-                value=1,
-                help="Quantidade de itens"
-            )
-            
-            building = st.selectbox(
-                "🏢 Prédio *",
-                options=settings.BUILDINGS,
-                help="Selecione o prédio"
-            )
-            
-            location = st.text_input(
-                "📍 Localização *",
-                placeholder="Ex: 5º andar, Sala 501",
-                help="Localização específica do item"
-            )
-            
-            movement_type = st.selectbox(
-                "🔄 Tipo de Movimentação *",
-                options=["entrada", "perda"],
-                format_func=lambda x: "📥 Entrada" if x == "entrada" else "📤 Perda"
-            )
-        
-        with col2:
-            email = st.text_input(
-                "📧 Email do Responsável",
-                placeholder="usuario@empresa.com"
-            )
-            
-            invoice_number = st.text_input(
-                "🧾 Número da Nota Fiscal",
-                placeholder="NF-123456"
-            )
-            
-            sku = st.text_input(
-                "🏷️ SKU",
-                placeholder="SKU do produto"
-            )
-            
-            supplier = st.text_input(
-                "🏪 Fornecedor",
-                placeholder="Nome do fornecedor"
-            )
-            
-            shelf_location = st.text_input(
-                "📦 Localização na Prateleira",
-                placeholder="Ex: A1-B2-C3"
-            )
-        
-        # Botão de submit
-        submitted = st.form_submit_button(
-            "💾 Registrar Movimentação",
-            use_container_width=True,
-            type="primary"
-        )
-        
-        if submitted:
-            # Validar campos obrigatórios
-            if not all([item_id, amount, building, location, movement_type]):
-                show_error_message("Por favor, preencha todos os campos obrigatórios marcados com *")
-                return
-            
-            # Preparar dados para processamento
-            form_data = {
-                'itemId': item_id,
-                'amount': amount,
-                'building': building,
-                'location': location,
-                'type': movement_type,
-                'email': email,
-                'invoiceNumber': invoice_number,
-                'sku': sku,
-                'supplier': supplier,
-                'shelfLocation': shelf_location
-            }
-            
-            # Processar dados
-            with show_loading_spinner("Registrando movimentação..."):
-                result = inventory_service.process_form_data(form_data)
-                
-                if result['success']:
-                    show_success_message(result['message'])
-                    st.balloons()
-                else:
-                    show_error_message(result['message'])
-
-def show_inventory_data():
-    """Exibe dados do inventário"""
-    st.subheader("📊 Dados do Inventário")
-    
-    # Filtros
-    with st.expander("🔍 Filtros Avançados", expanded=False):
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            building_filter = st.selectbox(
-                "Filtrar por Prédio",
-                options=["Todos"] + settings.BUILDINGS
-            )
-        
-        with col2:
-            item_filter = st.text_input(
-                "Filtrar por Item ID",
-                placeholder="Digite parte do ID do item"
-            )
-        
-        with col3:
-            supplier_filter = st.text_input(
-                "Filtrar por Fornecedor",
-                placeholder="Nome do fornecedor"
-            )
-    
-    # Preparar filtros
-    filters = {}
-    if building_filter != "Todos":
-        filters['building'] = building_filter
-    if item_filter:
-        filters['itemId'] = item_filter
-    if supplier_filter:
-        filters['supplier'] = supplier_filter
-    
-    # Carregar dados
-    with show_loading_spinner("Carregando dados do inventário..."):
+# Períodos disponíveis nos gráficos de perdas
+CHART_PERIODS = ['weekly', 'monthly', 'quarterly', 'yearly']
+
+# Campos obrigatórios do formulário de movimentação
+REQUIRED_FORM_FIELDS = ['itemId', 'amount', 'building', 'location', 'type']
+
+DATETIME_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+# Totais por prédio/tipo de item quando não há perdas no período
+EMPTY_BREAKDOWN = {
+    'label': '',
+    'byBuilding': {'labels': [], 'values': []},
+    'byItemType': {'labels': [], 'values': []}
+}
+
+
+def generate_inventory_id() -> str:
+    """Gera ID único para um registro de inventário"""
+    return f'INV_{int(datetime.now().timestamp() * 1000)}_{str(uuid.uuid4()).split("-")[0].upper()}'
+
+
+class InventoryService:
+    """Serviço de inventário sobre o repositório compartilhado
+
+    Os dados ficam uma única vez no InventoryRepository do processo; o
+    serviço carrega o histórico uma vez e assina as mudanças do repositório
+    para manter o agregado diário incremental e descartar os gráficos em cache
+    da versão anterior. As gravações do processo passam por add_entries, então
+    não há releitura periódica: o histórico só é relido após invalidate().
+    """
+
+    def __init__(self, repository: Optional[InventoryRepository] = None):
+        self.repository = repository or inventory_repository
+
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+        self._chart_cache: Dict[Tuple[int, date], Dict[str, Any]] = {}
+        self.rollup = DailyRollup()
+
+        self.repository.subscribe(self._on_repository_change)
+
+    # ------------------------------------------------------------------
+    # Versão e cache
+    # ------------------------------------------------------------------
+    @property
+    def version(self) -> int:
+        return self.repository.version
+
+    def invalidate(self) -> None:
+        """Força a releitura dos dados no próximo acesso"""
+        with self._lock:
+            self._loaded_at = None
+            self._chart_cache.clear()
+
+    def _on_repository_change(self, version: int, entries: Optional[List[Dict[str, Any]]]) -> None:
+        with self._lock:
+            # Substituição completa: o agregado é reconstruído por quem carregou
+            if entries is not None:
+                self.rollup.add(entries)
+            self._chart_cache.clear()
+
+    def _load_entries(self) -> InventorySnapshot:
+        with self._lock:
+            if self._loaded_at is None:
+                entries = data_manager.load_data()
+                self.rollup.rebuild(entries)
+                self.repository.replace(entries)
+                self._loaded_at = time.monotonic()
+
+            return self.repository.snapshot()
+
+    def snapshot(self) -> InventorySnapshot:
+        """Snapshot atual do repositório (carrega na primeira chamada)"""
+        return self._load_entries()
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def get_inventory_entries(self, filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Retorna os registros do inventário, opcionalmente filtrados (substring)"""
         try:
-            result = inventory_service.get_inventory_entries(filters)
-            
-            if result['success']:
-                data = result['data']
-                
-                if data:
-                    # Converter para DataFrame
-                    df = pd.DataFrame(data)
-                    
-                    # Formatar colunas para exibição
-                    display_df = df.copy()
-                    display_columns = {
-                        'itemId': 'Item ID',
-                        'dateTime': 'Data/Hora',
-                        'amount': 'Quantidade',
-                        'building': 'Prédio',
-                        'floor': 'Andar',
-                        'supplier': 'Fornecedor',
-                        'invoice': 'Nota Fiscal',
-                        'sku': 'SKU'
-                    }
-                    
-                    # Selecionar e renomear colunas
-                    available_columns = [col for col in display_columns.keys() if col in display_df.columns]
-                    display_df = display_df[available_columns]
-                    display_df = display_df.rename(columns=display_columns)
-                    
-                    # Exibir estatísticas
-                    col1, col2, col3, col4 = st.columns(4)
-                    
-                    with col1:
-                        st.metric("Total de Registros", len(data))
-                    
-                    with col2:
-                        total_amount = sum(item.get('amount', 0) for item in data)
-                        st.metric("Total de Itens", f"{total_amount:,.0f}")
-                    
-                    with col3:
-                        unique_items = len(set(item.get('itemId', '') for item in data))
-                        st.metric("Itens Únicos", unique_items)
-                    
-                    with col4:
-                        unique_suppliers = len(set(item.get('supplier', '') for item in data if item.get('supplier')))
-                        st.metric("Fornecedores", unique_suppliers)
-                    
-                    # Exibir DataFrame com filtros
-                    st.markdown("---")
-                    display_dataframe_with_filters(display_df, "Entradas de Inventário")
-                    
-                else:
-                    show_info_message("Nenhum registro encontrado com os filtros aplicados")
-                    
-            else:
-                show_error_message(f"Erro ao carregar dados: {result.get('error', 'Erro desconhecido')}")
-                
+            frame = self._load_entries().frame
+
+            if filters and not frame.empty:
+                frame = DataProcessor.filter_dataframe(frame, filters)
+
+            return {'success': True, 'data': frame_records(frame)}
+
+        except Exception as e:
+            logger.error(f"Erro ao obter entradas do inventário: {e}")
+            return {'success': False, 'data': [], 'error': str(e)}
+
+    def get_chart_data_from_sheet(self, period: str = 'monthly') -> Dict[str, Any]:
+        """Quantidades perdidas: série do período e, no período atual, por prédio e por tipo de item
+
+        Todos os períodos são calculados juntos e ficam em cache para a versão
+        atual dos dados (e o dia, que define o período atual); trocar de aba ou
+        de período não reagrega.
+        """
+        try:
+            with self._lock:
+                cache_key = (self._load_entries().version, date.today())
+
+                charts = self._chart_cache.get(cache_key)
+                if charts is None:
+                    charts = self._aggregate_losses(cache_key[1])
+                    self._chart_cache[cache_key] = charts
+
+            breakdown = charts['current'].get(period, EMPTY_BREAKDOWN)
+            data = {
+                'byBuilding': breakdown['byBuilding'],
+                'byItemType': breakdown['byItemType'],
+                'currentPeriod': breakdown['label']
+            }
+            data[period] = charts['periods'].get(period, {'labels': [], 'values': []})
+
+            return {'success': True, 'data': data}
+
         except Exception as e:
-            logger.error(f"Erro ao exibir dados do inventário: {e}")
-            show_error_message("Erro ao carregar dados do inventário")
-
-def show_csv_upload():
-    """Exibe interface para upload de CSV"""
-    st.subheader("📤 Upload de Dados via CSV")
-    
-    st.markdown("""
-    ### 📋 Formato do Arquivo CSV
-    
-    O arquivo CSV deve conter as seguintes colunas (na ordem):
-    1. **Item ID** (obrigatório)
-    2. **Data/Hora** (formato: DD/MM/AAAA HH:MM:SS)
-    3. **Quantidade** (obrigatório)
-    4. **Prédio**
-    5. **Email**
-    6. **Nota Fiscal**
-    7. **SKU**
-    8. **Localização**
-    9. **Fornecedor**
-    10. **Prateleira**
-    """)
-    
-    # Upload do arquivo
-    uploaded_file = st.file_uploader(
-        "Selecione o arquivo CSV",
-        type=['csv'],
-        help="Arquivo CSV com dados de inventário"
-    )
-    
-    if uploaded_file is not None:
-        if validate_uploaded_file(uploaded_file, ['csv']):
-            # Preview do arquivo
-            with st.expander("👀 Preview do Arquivo", expanded=True):
-                try:
-                    df_preview = parse_uploaded_csv(uploaded_file)
-                    
-                    if not df_preview.empty:
-                        st.dataframe(df_preview.head(10), use_container_width=True)
-                        st.info(f"📊 Arquivo contém {len(df_preview)} linhas")
-                        
-                        # Botão para processar
-                        if st.button("🚀 Processar Upload", type="primary"):
-                            process_csv_upload(uploaded_file)
-                    else:
-                        show_error_message("Arquivo CSV vazio ou com formato inválido")
-                        
-                except Exception as e:
-                    logger.error(f"Erro ao fazer preview do CSV: {e}")
-                    show_error_message("Erro ao ler arquivo CSV")
-        else:
-            show_error_message("Formato de arquivo inválido. Use apenas arquivos CSV.")
-
-def process_csv_upload(uploaded_file):
-    """Processa upload de arquivo CSV"""
-    try:
-        # Ler conteúdo do arquivo
-        csv_content = uploaded_file.getvalue().decode('utf-8')
-        
-        with show_loading_spinner("Processando arquivo CSV..."):
-            result = inventory_service.process_csv_upload(csv_content, uploaded_file.name)
-            
-            if result['success']:
-                show_success_message(result['message'])
-                
-                # Mostrar estatísticas do upload
-                col1, col2, col3 = st.columns(3)
-                
-                with col1:
-                    st.metric("✅ Sucessos", result.get('successCount', 0))
-                
-                with col2:
-                    st.metric("📝 Total Processado", result.get('totalProcessed', 0))
-                
-                with col3:
-                    error_count = len(result.get('errors', []))
-                    st.metric("❌ Erros", error_count)
-                
-                # Mostrar erros se houver
-                if result.get('errors'):
-                    with st.expander("⚠️ Erros Encontrados", expanded=False):
-                        for error in result['errors']:
-                            st.error(error)
-                
-                st.balloons()
-            else:
-                show_error_message(result.get('error', 'Erro no processamento'))
-                
-                if result.get('errors'):
-                    with st.expander("❌ Detalhes dos Erros", expanded=True):
-                        for error in result['errors']:
-                            st.error(error)
-                            
-    except Exception as e:
-        logger.error(f"Erro ao processar upload de CSV: {e}")
-        show_error_message("Erro ao processar arquivo CSV")
-
-def show_reports():
-    """Exibe relatórios de inventário"""
-    st.subheader("📈 Relatórios de Inventário")
-    
-    # Seleção do tipo de relatório
-    report_type = st.selectbox(
-        "📊 Tipo de Relatório",
-        [
-            "Resumo Geral",
-            "Por Prédio",
-            "Por Tipo de Item",
-            "Por Fornecedor",
-            "Por Período"
-        ]
-    )
-    
-    # Filtros de data
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        start_date = st.date_input(
-            "📅 Data Inicial",
-            value=datetime.now().replace(day=1)  # Primeiro dia do mês
-        )
-    
-    with col2:
-        end_date = st.date_input(
-            "📅 Data Final",
-            value=datetime.now()
-        )
-    
-    if st.button("📊 Gerar Relatório", type="primary"):
-        generate_report(report_type, start_date, end_date)
-
-def generate_report(report_type: str, start_date, end_date):
-    """Gera relatório específico"""
-    with show_loading_spinner(f"Gerando relatório: {report_type}..."):
+            logger.error(f"Erro ao gerar dados dos gráficos: {e}")
+            return {'success': False, 'data': {}, 'error': str(e)}
+
+    def _aggregate_losses(self, today: date) -> Dict[str, Any]:
+        """Deriva os gráficos de perdas da tabela diária (não relê o histórico)
+
+        Os totais por prédio e por tipo de item cobrem só o período que contém
+        today (semana, mês, trimestre ou ano corrente), não o histórico inteiro.
+        """
+        today_key = pd.Series([pd.Timestamp(today)])
+        current_keys = {period: DataProcessor.period_keys(today_key, period).iloc[0] for period in CHART_PERIODS}
+
+        empty = {'labels': [], 'values': []}
+        charts = {
+            'periods': {period: empty for period in CHART_PERIODS},
+            'current': {
+                period: dict(EMPTY_BREAKDOWN, label=DataProcessor.period_label(key, period))
+                for period, key in current_keys.items()
+            }
+        }
+
+        daily = self.rollup.frame()
+        daily = daily[daily['type'] == 'perda'].dropna(subset=['day'])
+        if daily.empty:
+            return charts
+
+        for period in CHART_PERIODS:
+            charts['periods'][period] = DataProcessor.aggregate_by_period(daily, period, 'day', 'quantity')
+
+            current = daily[DataProcessor.period_keys(daily['day'], period) == current_keys[period]]
+            by_building = current[current['building'] != ''].groupby('building')['quantity'].sum()
+            by_item_type = current.groupby('category')['quantity'].sum().sort_values(ascending=False)
+
+            charts['current'][period].update({
+                'byBuilding': {'labels': by_building.index.tolist(), 'values': by_building.tolist()},
+                'byItemType': {'labels': by_item_type.index.tolist(), 'values': by_item_type.tolist()}
+            })
+
+        return charts
+
+    def summarize_rollup(self, group_by: str, start=None, end=None, **filters) -> Optional[List[Dict[str, Any]]]:
+        """Relatório agregado pela tabela diária (None se o agrupamento não existe nela)"""
         try:
-            # Obter dados do inventário
-            result = inventory_service.get_inventory_entries()
-            
-            if not result['success']:
-                show_error_message("Erro ao obter dados para relatório")
-                return
-            
-            data = result['data']
-            
-            if not data:
-                show_info_message("Nenhum dado disponível para o relatório")
-                return
-            
-            # Converter para DataFrame
-            df = pd.DataFrame(data)
-            
-            # Filtrar por data se possível
-            if 'dateTime' in df.columns:
-                try:
-                    df['dateTime'] = pd.to_datetime(df['dateTime'], errors='coerce')
-                    df = df.dropna(subset=['dateTime'])
-                    
-                    # Aplicar filtro de data
-                    start_datetime = pd.to_datetime(start_date)
-                    end_datetime = pd.to_datetime(end_date) + pd.Timedelta(days=1)
-                    
-                    df = df[(df['dateTime'] >= start_datetime) & (df['dateTime'] < end_datetime)]
-                except Exception as e:
-                    logger.warning(f"Erro ao filtrar por data: {e}")
-            
-            if df.empty:
-                show_info_message("Nenhum dado encontrado no período selecionado")
-                return
-            
-            # Gerar relatório baseado no tipo
-            if report_type == "Resumo Geral":
-                show_general_summary_report(df)
-            elif report_type == "Por Prédio":
-                show_building_report(df)
-            elif report_type == "Por Tipo de Item":
-                show_item_type_report(df)
-            elif report_type == "Por Fornecedor":
-                show_supplier_report(df)
-            elif report_type == "Por Período":
-                show_period_report(df)
-                
+            with self._lock:
+                self._load_entries()
+            return self.rollup.summarize(group_by, start=start, end=end, **filters)
         except Exception as e:
-            logger.error(f"Erro ao gerar relatório: {e}")
-            show_error_message("Erro ao gerar relatório")
-
-def show_general_summary_report(df: pd.DataFrame):
-    """Exibe relatório resumo geral"""
-    st.subheader("📊 Resumo Geral")
-    
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.metric("Total de Registros", len(df))
-    
-    with col2:
-        total_items = df['amount'].sum() if 'amount' in df.columns else 0
-        st.metric("Total de Itens", f"{total_items:,.0f}")
-    
-    with col3:
-        unique_items = df['itemId'].nunique() if 'itemId' in df.columns else 0
-        st.metric("Itens Únicos", unique_items)
-    
-    with col4:
-        unique_buildings = df['building'].nunique() if 'building' in df.columns else 0
-        st.metric("Prédios", unique_buildings)
-    
-    # Tabela detalhada
-    st.markdown("### 📋 Dados Detalhados")
-    display_dataframe_with_filters(df, "Relatório Geral")
-
-def show_building_report(df: pd.DataFrame):
-    """Exibe relatório por prédio"""
-    st.subheader("🏢 Relatório por Prédio")
-    
-    if 'building' in df.columns:
-        building_summary = df.groupby('building').agg({
-            'amount': 'sum',
-            'itemId': 'count'
-        }).reset_index()
-        
-        building_summary.columns = ['Prédio', 'Total Itens', 'Total Registros']
-        
-        st.dataframe(building_summary, use_container_width=True, hide_index=True)
-    else:
-        show_info_message("Coluna 'building' não encontrada nos dados")
-
-def show_item_type_report(df: pd.DataFrame):
-    """Exibe relatório por tipo de item"""
-    st.subheader("🔧 Relatório por Tipo de Item")
-    
-    if 'itemId' in df.columns:
-        # Categorizar itens
-        df['itemType'] = df['itemId'].apply(lambda x: categorize_item_simple(x))
-        
-        item_summary = df.groupby('itemType').agg({
-            'amount': 'sum',
-            'itemId': 'count'
-        }).reset_index()
-        
-        item_summary.columns = ['Tipo de Item', 'Total Itens', 'Total Registros']
-        item_summary = item_summary.sort_values('Total Itens', ascending=False)
-        
-        st.dataframe(item_summary, use_container_width=True, hide_index=True)
-    else:
-        show_info_message("Coluna 'itemId' não encontrada nos dados")
-
-def show_supplier_report(df: pd.DataFrame):
-    """Exibe relatório por fornecedor"""
-    st.subheader("🏪 Relatório por Fornecedor")
-    
-    if 'supplier' in df.columns:
-        # Filtrar apenas registros com fornecedor
-        df_with_supplier = df[df['supplier'].notna() & (df['supplier'] != '')]
-        
-        if not df_with_supplier.empty:
-            supplier_summary = df_with_supplier.groupby('supplier').agg({
-                'amount': 'sum',
-                'itemId': 'count'
-            }).reset_index()
-            
-            supplier_summary.columns = ['Fornecedor', 'Total Itens', 'Total Registros']
-            supplier_summary = supplier_summary.sort_values('Total Itens', ascending=False)
-            
-            st.dataframe(supplier_summary, use_container_width=True, hide_index=True)
-        else:
-            show_info_message("Nenhum registro com fornecedor informado")
-    else:
-        show_info_message("Coluna 'supplier' não encontrada nos dados")
-
-def show_period_report(df: pd.DataFrame):
-    """Exibe relatório por período"""
-    st.subheader("📅 Relatório por Período")
-    
-    if 'dateTime' in df.columns:
+            logger.error(f"Erro ao consultar agregado diário: {e}")
+            return None
+
+    # ------------------------------------------------------------------
+    # Gravação
+    # ------------------------------------------------------------------
+    def add_entries(self, entries: List[Dict[str, Any]]) -> bool:
+        """Grava movimentações e as publica no repositório (agregado atualizado pela assinatura)
+
+        Gravar e publicar acontecem sob o mesmo lock da carga: uma carga do
+        histórico não pode acontecer entre os dois passos e já incluir as linhas
+        que o append somaria de novo.
+        """
+        with self._lock:
+            result = data_manager.save_data(entries)
+            if not result['any_success']:
+                return False
+
+            # Antes da primeira carga o histórico (com estas linhas) vem do load_data
+            if self._loaded_at is not None:
+                self.repository.append(entries)
+
+        return True
+
+    def process_form_data(self, form_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Registra uma movimentação vinda do formulário"""
         try:
-            df['dateTime'] = pd.to_datetime(df['dateTime'], errors='coerce')
-            df = df.dropna(subset=['dateTime'])
-            
-            df['month'] = df['dateTime'].dt.to_period('M')
-            
-            period_summary = df.groupby('month').agg({
-                'amount': 'sum',
-                'itemId': 'count'
-            }).reset_index()
-            
-            period_summary.columns = ['Período', 'Total Itens', 'Total Registros']
-            period_summary = period_summary.sort_values('Período', ascending=False)
-            
-            st.dataframe(period_summary, use_container_width=True, hide_index=True)
+            is_valid, message = DataProcessor.validate_form_data(form_data, REQUIRED_FORM_FIELDS)
+            if not is_valid:
+                return {'success': False, 'message': message}
+
+            movement_type = form_data['type']
+            quantity = abs(DataProcessor.safe_float(form_data['amount']))
+
+            entry = {
+                'inventoryId': generate_inventory_id(),
+                'itemId': DataProcessor.clean_string(form_data['itemId']),
+                'dateTime': datetime.now().strftime(DATETIME_FORMAT),
+                'amount': quantity if movement_type == 'entrada' else -quantity,
+                'building': form_data['building'],
+                'location': DataProcessor.clean_string(form_data['location']),
+                'email': DataProcessor.clean_string(form_data.get('email')),
+                'type': movement_type,
+                'invoiceNumber': DataProcessor.clean_string(form_data.get('invoiceNumber')),
+                'sku': DataProcessor.clean_string(form_data.get('sku')),
+                'supplier': DataProcessor.clean_string(form_data.get('supplier')),
+                'shelfLocation': DataProcessor.clean_string(form_data.get('shelfLocation'))
+            }
+
+            if not self.add_entries([entry]):
+                return {'success': False, 'message': 'Não foi possível salvar a movimentação'}
+
+            return {'success': True, 'message': f"{movement_type.title()} de {entry['itemId']} registrada com sucesso!"}
+
         except Exception as e:
-            logger.error(f"Erro ao processar relatório por período: {e}")
-            show_error_message("Erro ao processar datas para relatório por período")
-    else:
-        show_info_message("Coluna 'dateTime' não encontrada nos dados")
-
-def categorize_item_simple(item_id: str) -> str:
-    """Categoriza item de forma simples"""
-    if not item_id:
-        return 'Outros'
-    
-    item_lower = item_id.lower()
-    
-    if 'headset' in item_lower:
-        return 'Headsets'
-    elif 'mouse' in item_lower:
-        return 'Mouses'
-    elif 'teclado' in item_lower:
-        return 'Teclados'
-    elif 'adaptador' in item_lower or 'usb c' in item_lower:
-        return 'Adaptadores'
-    elif 'usb gorila' in item_lower or 'gorila' in item_lower:
-        return 'USB Gorila'
-    else:
-        return 'Outros'
+            logger.error(f"Erro ao processar formulário: {e}")
+            return {'success': False, 'message': f"Erro ao registrar movimentação: {e}"}
+
+    def process_csv_upload(self, csv_file: Union[BinaryIO, str], filename: str = '',
+                           progress: Optional[ProgressCallback] = None) -> Dict[str, Any]:
+        """Importa movimentações de um CSV (colunas em CSV_COLUMNS) em lotes
+
+        Aceita o arquivo enviado (lido em streaming) ou o conteúdo já em texto.
+        Quantidades negativas são registradas como perda, positivas como entrada.
+        """
+        if isinstance(csv_file, str):
+            csv_file = io.BytesIO(csv_file.encode('utf-8'))
+
+        return import_csv(csv_file, self.add_entries, filename, progress)
+
+
+# Instância global
+inventory_service = InventoryService()
@@ -0,0 +1,128 @@
+"""
+Repositório de inventário compartilhado entre as sessões do processo
+"""
+import threading
+from typing import Any, Callable, Dict, Iterable, List, Optional
+import logging
+
+import pandas as pd
+
+from services.movement_table import MovementTable, TableView, frame_records
+
+logger = logging.getLogger(__name__)
+
+# callback(versão, registros adicionados); registros é None quando os dados foram substituídos
+Subscriber = Callable[[int, Optional[List[Dict[str, Any]]]], None]
+
+
+class InventorySnapshot:
+    """Visão somente leitura dos dados em uma versão (frame consolidado na primeira leitura)"""
+
+    __slots__ = ('version', '_view')
+
+    def __init__(self, version: int, view: TableView):
+        self.version = version
+        self._view = view
+
+    @property
+    def frame(self) -> pd.DataFrame:
+        return self._view.frame()
+
+    def __len__(self) -> int:
+        return len(self._view)
+
+    def __bool__(self) -> bool:
+        return len(self._view) > 0
+
+    def records(self) -> List[Dict[str, Any]]:
+        return frame_records(self.frame)
+
+
+class InventoryRepository:
+    """Uma única cópia das movimentações para todas as sessões do Streamlit
+
+    Gravações passam por um lock de escrita e publicam um novo snapshot
+    (versão + view dos lotes da MovementTable). Publicar é O(1): o histórico
+    só é concatenado quando alguém lê o frame daquela versão. Leitores pegam o
+    snapshot atual sem lock e nunca veem um frame sendo alterado: cada versão
+    tem sua própria view. Assinantes são avisados a cada nova versão.
+    """
+
+    def __init__(self):
+        self._write_lock = threading.Lock()
+        self._table = MovementTable()
+        self._snapshot = InventorySnapshot(0, self._table.view())
+        self._subscribers: Dict[int, Subscriber] = {}
+        self._next_token = 0
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version
+
+    def snapshot(self) -> InventorySnapshot:
+        """Snapshot atual (atribuição atômica; não bloqueia gravações)"""
+        return self._snapshot
+
+    def changed_since(self, version: Optional[int]) -> bool:
+        return version is None or self._snapshot.version != version
+
+    # ------------------------------------------------------------------
+    # Gravação
+    # ------------------------------------------------------------------
+    def append(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Adiciona movimentações; retorna a nova versão"""
+        entries = list(entries)
+        if not entries:
+            return self.version
+
+        with self._write_lock:
+            self._table.append(entries)
+            version = self._publish()
+
+        self._notify(version, entries)
+        return version
+
+    def replace(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Substitui todos os dados (carga inicial ou recarga); retorna a nova versão"""
+        table = MovementTable(entries)
+
+        with self._write_lock:
+            self._table = table
+            version = self._publish()
+
+        logger.info(f"Repositório de inventário carregado: {len(table)} registros (versão {version})")
+        self._notify(version, None)
+        return version
+
+    def clear(self) -> int:
+        return self.replace([])
+
+    def _publish(self) -> int:
+        # Chamado com o lock de escrita
+        self._snapshot = InventorySnapshot(self._snapshot.version + 1, self._table.view())
+        return self._snapshot.version
+
+    # ------------------------------------------------------------------
+    # Assinaturas
+    # ------------------------------------------------------------------
+    def subscribe(self, callback: Subscriber) -> int:
+        """Registra um callback de mudança de versão; retorna o token da assinatura"""
+        with self._write_lock:
+            self._next_token += 1
+            self._subscribers[self._next_token] = callback
+            return self._next_token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._write_lock:
+            self._subscribers.pop(token, None)
+
+    def _notify(self, version: int, entries: Optional[List[Dict[str, Any]]]) -> None:
+        for callback in list(self._subscribers.values()):
+            try:
+                callback(version, entries)
+            except Exception as e:
+                logger.error(f"Erro ao notificar assinante do inventário: {e}")
+
+
+# Instância global
+inventory_repository = InventoryRepository()
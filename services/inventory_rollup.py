@@ -0,0 +1,162 @@
+"""
+Tabela agregada diária do inventário (dia × prédio × andar × categoria × tipo)
+"""
+import threading
+from datetime import date, datetime
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import pandas as pd
+
+from utils.data_processing import DataProcessor
+from utils.item_catalog import item_catalog
+
+logger = logging.getLogger(__name__)
+
+# Dimensões da tabela diária, na ordem da chave
+DIMENSIONS = ['day', 'building', 'floor', 'category', 'type']
+
+# Agrupamentos aceitos em summarize (mesmo formato de InventoryStore.summarize).
+# Não há itemId: a tabela guarda só a categoria do item.
+GROUP_COLUMNS = {
+    'building': 'building',
+    'category': 'category',
+    'location': 'floor',
+    'type': 'type'
+}
+PERIOD_FORMATS = {
+    'day': '%Y-%m-%d',
+    'month': '%Y-%m',
+    'year': '%Y'
+}
+# Períodos agrupados pelas chaves de DataProcessor.period_keys (rótulo de period_label)
+PERIOD_KEYS = {
+    'week': 'weekly',
+    'quarter': 'quarterly'
+}
+
+
+@lru_cache(maxsize=4096)
+def _parse_day(text: str) -> Optional[date]:
+    for fmt in ('%d/%m/%Y', '%Y-%m-%d'):
+        try:
+            return datetime.strptime(text, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def entry_day(value: Any) -> Optional[date]:
+    """Dia da movimentação (DD/MM/AAAA ou ISO, com ou sem hora)"""
+    if isinstance(value, datetime):
+        return value.date()
+    if not value:
+        return None
+    return _parse_day(str(value).strip()[:10])
+
+
+class DailyRollup:
+    """Totais diários mantidos incrementalmente a cada gravação
+
+    Cada célula guarda a soma de amount (com sinal), a quantidade absoluta e o
+    número de registros. Semanas, meses, trimestres e anos são derivados desta
+    tabela, cujo tamanho depende dos dias/dimensões e não do histórico bruto.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cells: Dict[Tuple, List[float]] = {}
+        self._frame: Optional[pd.DataFrame] = None
+        self.total_records = 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cells.clear()
+            self._frame = None
+            self.total_records = 0
+
+    def add(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Soma as movimentações às células do dia; retorna quantas foram somadas"""
+        added = 0
+
+        with self._lock:
+            for entry in entries:
+                amount = DataProcessor.safe_float(entry.get('amount'))
+                key = (
+                    entry_day(entry.get('dateTime')),
+                    str(entry.get('building') or ''),
+                    str(entry.get('location') or ''),
+                    item_catalog.category(str(entry.get('itemId') or '')),
+                    str(entry.get('type') or '').lower()
+                )
+
+                cell = self._cells.get(key)
+                if cell is None:
+                    self._cells[key] = cell = [0.0, 0.0, 0]
+                cell[0] += amount
+                cell[1] += abs(amount)
+                cell[2] += 1
+                added += 1
+
+            if added:
+                self._frame = None
+                self.total_records += added
+
+        return added
+
+    def rebuild(self, entries: Iterable[Dict[str, Any]]) -> None:
+        """Recalcula a tabela a partir do histórico completo"""
+        self.clear()
+        self.add(entries)
+        logger.info(f"Agregado diário reconstruído: {len(self._cells)} células, {self.total_records} registros")
+
+    def frame(self) -> pd.DataFrame:
+        """Tabela diária como DataFrame (day é datetime64; NaT = sem data)"""
+        with self._lock:
+            if self._frame is None:
+                rows = [key + tuple(cell) for key, cell in self._cells.items()]
+                frame = pd.DataFrame(rows, columns=DIMENSIONS + ['amount', 'quantity', 'records'])
+                frame['day'] = pd.to_datetime(frame['day'])
+                self._frame = frame
+            return self._frame
+
+    def summarize(self, group_by: str, start: Optional[date] = None, end: Optional[date] = None,
+                  **filters) -> Optional[List[Dict[str, Any]]]:
+        """Totais por dimensão ou período
+
+        Retorna None se o agrupamento ou algum filtro não existe na tabela
+        (por exemplo itemId), para o chamador usar outra fonte.
+        """
+        if any(value and field not in GROUP_COLUMNS for field, value in filters.items()):
+            return None
+
+        frame = self.frame()
+
+        if start:
+            frame = frame[frame['day'] >= pd.Timestamp(start)]
+        if end:
+            frame = frame[frame['day'] <= pd.Timestamp(end)]
+        for field, value in filters.items():
+            if value:
+                frame = frame[frame[GROUP_COLUMNS[field]] == value]
+
+        label = str
+        if group_by in GROUP_COLUMNS:
+            groups = frame[GROUP_COLUMNS[group_by]]
+        elif group_by in PERIOD_FORMATS:
+            frame = frame.dropna(subset=['day'])
+            groups = frame['day'].dt.strftime(PERIOD_FORMATS[group_by])
+        elif group_by in PERIOD_KEYS:
+            period = PERIOD_KEYS[group_by]
+            frame = frame.dropna(subset=['day'])
+            groups = DataProcessor.period_keys(frame['day'], period)
+            label = lambda key: DataProcessor.period_label(key, period)
+        else:
+            return None
+
+        totals = frame.groupby(groups)[['amount', 'records']].sum().sort_index()
+        return [
+            {'group': label(group), 'amount': float(row['amount']), 'records': int(row['records'])}
+            for group, row in totals.iterrows()
+        ]
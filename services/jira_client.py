@@ -3,14 +3,34 @@ Cliente para integração com JIRA API
 """
 import requests
 import base64
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Iterator, Optional
 import logging
 
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
 from config.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# JQL específica para Installation/Uninstallation Monitors
+BASE_JQL = (
+    '"Request Type" = "Installation/Uninstallation Monitors" '
+    'AND priority = Medium '
+    'AND "Support Level - ITOPS" = L3'
+)
+
+EXCLUDED_STATUSES = ("Canceled", "Encerrado", "Done", "Resolved")
+
+# Margem (minutos) somada à janela incremental para cobrir atrasos de indexação
+SYNC_OVERLAP_MINUTES = 2
+
 class JiraClient:
     """Cliente para interação com JIRA"""
     
@@ -20,6 +40,8 @@ class JiraClient:
         self.api_token = settings.JIRA_API_TOKEN
         self.project_key = settings.JIRA_PROJECT_KEY
         self.field_mapping = settings.JIRA_FIELD_MAPPING
+        self.page_size = settings.JIRA_PAGE_SIZE
+        self.max_workers = settings.JIRA_MAX_WORKERS
         
         # Configurar autenticação
         auth_string = f"{self.email}:{self.api_token}"
@@ -31,12 +53,39 @@ class JiraClient:
             'Accept': 'application/json',
             'Content-Type': 'application/json'
         }
+        
+        # Credenciais só são revalidadas quando o JIRA responde 401
+        self._auth_lock = threading.Lock()
+        
+        self.session = self._create_session()
+    
+    def _create_session(self) -> requests.Session:
+        """Sessão com keep-alive, pool de conexões e retry para erros transitórios"""
+        retry = Retry(
+            total=settings.JIRA_HTTP_RETRIES,
+            backoff_factor=0.5,
+            status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST']),  # a busca via POST é só leitura
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(self.max_workers, 1),
+            max_retries=retry
+        )
+        
+        session = requests.Session()
+        session.headers.update(self.headers)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
     
     def test_connection(self) -> bool:
         """Testa a conexão com o JIRA"""
         try:
             url = f"{self.base_url}/rest/api/3/myself"
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(url, timeout=30)
             
             if response.status_code == 200:
                 user_data = response.json()
@@ -51,68 +100,194 @@ class JiraClient:
             logger.error(f"Erro ao testar conexão com JIRA: {e}")
             return False
     
-    def fetch_monitor_issues(self) -> List[Dict[str, Any]]:
-        """Busca issues relacionadas a monitores"""
+    def fetch_monitor_issues(self, incremental: bool = True) -> List[Dict[str, Any]]:
+        """Busca issues relacionadas a monitores
+        
+        No modo incremental só os issues alterados desde a última sincronização
+        são baixados e mesclados ao cache local; os que passaram para um status
+        excluído são removidos por uma consulta que traz apenas as chaves.
+        """
         try:
             logger.info("Iniciando busca de issues de monitores no JIRA")
             
-            if not self.test_connection():
-                raise Exception("Falha na autenticação com o JIRA")
-            
-            # JQL específica para Installation/Uninstallation Monitors
-            jql = (
-                '"Request Type" = "Installation/Uninstallation Monitors" '
-                'AND priority = Medium '
-                'AND "Support Level - ITOPS" = L3 '
-                'AND status NOT IN ("Canceled", "Encerrado", "Done", "Resolved") '
-                'ORDER BY created DESC'
-            )
-            
-            # Campos para solicitar
-            fields = [
-                "issuetype", "reporter", "updated", "created", "status", 
-                "summary", "priority", "assignee", "description"
-            ]
-            
-            # Adicionar campos personalizados
-            for field_id in self.field_mapping.values():
-                if field_id and field_id not in fields:
-                    fields.append(field_id)
-            
-            # Fazer requisição
             url = f"{self.base_url}/rest/api/3/search/jql"
-            payload = {
-                "jql": jql,
-                "maxResults": 100,
-                "fields": fields
-            }
-            
-            logger.info(f"Fazendo requisição para: {url}")
-            logger.info(f"JQL: {jql}")
+            fields = self._request_fields()
+            excluded = ', '.join(f'"{status}"' for status in EXCLUDED_STATUSES)
             
-            response = requests.post(url, json=payload, headers=self.headers, timeout=60)
+            cache = self._load_issue_cache() if incremental else None
+            sync_started = time.time()
             
-            if response.status_code != 200:
-                # Tentar com payload simplificado
-                logger.warning("Tentando com payload simplificado...")
-                simple_payload = {"jql": jql}
-                response = requests.post(url, json=simple_payload, headers=self.headers, timeout=60)
+            if cache and sync_started - cache['last_full_sync'] < settings.JIRA_FULL_SYNC_INTERVAL:
+                # JQL relativa (-Nm) evita diferenças de fuso entre servidor e cliente
+                minutes = int((sync_started - cache['last_sync']) // 60) + SYNC_OVERLAP_MINUTES
+                issues = cache['issues']
                 
-                if response.status_code != 200:
-                    raise Exception(f"JIRA API error: {response.status_code} - {response.text}")
-            
-            data = response.json()
-            issues = data.get('issues', [])
+                jql = f'{BASE_JQL} AND status NOT IN ({excluded}) AND updated >= -{minutes}m ORDER BY updated ASC'
+                logger.info(f"JQL: {jql}")
+                
+                changed = 0
+                for page in self.iter_issue_pages(url, jql, fields):
+                    for item in self._process_jira_issues(page):
+                        issues[item['key']] = item
+                        changed += 1
+                
+                # Reconciliação: issues que saíram do filtro por mudança de status
+                removed = 0
+                reconcile_jql = f'{BASE_JQL} AND status IN ({excluded}) AND updated >= -{minutes}m'
+                for page in self.iter_issue_pages(url, reconcile_jql, ['status']):
+                    for issue in page:
+                        if issues.pop(issue.get('key'), None) is not None:
+                            removed += 1
+                
+                cache['last_sync'] = sync_started
+                logger.info(f"Sincronização incremental: {changed} alteradas, {removed} removidas")
+            else:
+                jql = f'{BASE_JQL} AND status NOT IN ({excluded}) ORDER BY created DESC'
+                
+                logger.info(f"Fazendo requisição para: {url}")
+                logger.info(f"JQL: {jql}")
+                
+                issues = {}
+                for page in self.iter_issue_pages(url, jql, fields):
+                    for item in self._process_jira_issues(page):
+                        issues[item['key']] = item
+                
+                cache = {'last_sync': sync_started, 'last_full_sync': sync_started, 'issues': issues}
             
-            logger.info(f"{data.get('total', 0)} issues encontradas no total")
-            logger.info(f"Processando {len(issues)} issues retornadas...")
+            self._save_issue_cache(cache)
             
-            return self._process_jira_issues(issues)
+            processed_data = self._sort_by_created(list(issues.values()))
+            logger.info(f"{len(processed_data)} issues carregadas no total")
+            return processed_data
             
         except Exception as e:
             logger.error(f"Erro ao buscar dados do JIRA: {e}")
             raise
     
+    def _request_fields(self) -> List[str]:
+        """Campos solicitados na busca (padrão + personalizados)"""
+        fields = [
+            "issuetype", "reporter", "updated", "created", "status", 
+            "summary", "priority", "assignee", "description"
+        ]
+        
+        # Adicionar campos personalizados
+        for field_id in self.field_mapping.values():
+            if field_id and field_id not in fields:
+                fields.append(field_id)
+        
+        return fields
+    
+    def _load_issue_cache(self) -> Optional[Dict[str, Any]]:
+        """Carrega o cache local de issues processadas (chaveado por key)"""
+        try:
+            with open(settings.JIRA_CACHE_FILE, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError):
+            return None
+        
+        if cache.get('base_url') != self.base_url or 'last_sync' not in cache:
+            return None
+        return cache
+    
+    def _save_issue_cache(self, cache: Dict[str, Any]) -> None:
+        """Grava o cache de forma atômica"""
+        try:
+            cache['base_url'] = self.base_url
+            path = settings.JIRA_CACHE_FILE
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.error(f"Erro ao salvar cache de issues do JIRA: {e}")
+    
+    def reset_issue_cache(self) -> None:
+        """Descarta o cache local, forçando uma sincronização completa"""
+        if os.path.exists(settings.JIRA_CACHE_FILE):
+            os.remove(settings.JIRA_CACHE_FILE)
+    
+    def _sort_by_created(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Ordena por data de criação, mais recentes primeiro"""
+        def created_key(item):
+            try:
+                return datetime.strptime(item.get('created', ''), "%d/%m/%Y %H:%M")
+            except ValueError:
+                return datetime.min
+        
+        return sorted(items, key=created_key, reverse=True)
+    
+    def _search_page(self, url: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """Busca uma página de resultados"""
+        response = self.session.post(url, json=payload, timeout=60)
+        
+        if response.status_code == 401:
+            # Credenciais só são revalidadas quando o JIRA as recusa; o lock evita
+            # que as páginas buscadas em paralelo chamem /myself ao mesmo tempo
+            with self._auth_lock:
+                if not self.test_connection():
+                    raise Exception("Falha na autenticação com o JIRA")
+            response = self.session.post(url, json=payload, timeout=60)
+        
+        if response.status_code != 200:
+            raise Exception(f"JIRA API error: {response.status_code} - {response.text}")
+        
+        return response.json()
+    
+    def iter_issue_pages(self, url: str, jql: str, fields: List[str]) -> Iterator[List[Dict[str, Any]]]:
+        """Percorre todas as páginas da busca, entregando os issues página a página
+        
+        O endpoint /search/jql pagina por nextPageToken, então as páginas são
+        sequenciais. Se a resposta trouxer total/startAt (paginação por offset),
+        as páginas restantes são buscadas em paralelo com um pool limitado.
+        """
+        payload = {
+            "jql": jql,
+            "maxResults": self.page_size,
+            "fields": fields
+        }
+        
+        try:
+            data = self._search_page(url, payload)
+        except Exception as e:
+            # Tentar com payload simplificado
+            logger.warning(f"Tentando com payload simplificado... ({e})")
+            payload = {"jql": jql}
+            data = self._search_page(url, payload)
+        
+        issues = data.get('issues', [])
+        yield issues
+        
+        if 'total' in data and 'startAt' in data:
+            # Paginação por offset: páginas independentes, buscadas em paralelo
+            total = data.get('total', 0)
+            page_size = data.get('maxResults') or len(issues)
+            logger.info(f"{total} issues encontradas no total")
+            
+            if not page_size or len(issues) >= total:
+                return
+            
+            offsets = range(data['startAt'] + len(issues), total, page_size)
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = [
+                    executor.submit(self._search_page, url, {**payload, "startAt": offset, "maxResults": page_size})
+                    for offset in offsets
+                ]
+                # Entregues na ordem das páginas, conforme ficam prontas
+                for future in futures:
+                    yield future.result().get('issues', [])
+            return
+        
+        # Paginação por token: cada página depende da anterior
+        page = 1
+        while data.get('nextPageToken') and not data.get('isLast', False) and issues:
+            page += 1
+            data = self._search_page(url, {**payload, "nextPageToken": data['nextPageToken']})
+            issues = data.get('issues', [])
+            logger.info(f"Página {page}: {len(issues)} issues")
+            yield issues
+    
     def _process_jira_issues(self, issues: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Processa issues do JIRA para formato da aplicação"""
         processed_data = []
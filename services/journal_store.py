@@ -0,0 +1,276 @@
+"""
+Armazenamento local em journal (append-only, um registro JSON por linha)
+"""
+import json
+import os
+import threading
+import time
+from typing import Any, Iterable, Iterator, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Políticas de fsync suportadas
+FSYNC_ALWAYS = 'always'        # fsync a cada append (mais seguro)
+FSYNC_INTERVAL = 'interval'    # fsync no máximo a cada N segundos
+FSYNC_NEVER = 'never'          # deixa o flush para o sistema operacional
+FSYNC_POLICIES = (FSYNC_ALWAYS, FSYNC_INTERVAL, FSYNC_NEVER)
+
+
+class JournalStore:
+    """Journal append-only com recuperação de cauda e compactação"""
+
+    def __init__(self, path: str, fsync_policy: str = FSYNC_ALWAYS,
+                 fsync_interval: float = 1.0, compact_ratio: float = 0.5,
+                 key_field: Optional[str] = None):
+        if fsync_policy not in FSYNC_POLICIES:
+            raise ValueError(f"Política de fsync inválida: {fsync_policy}")
+
+        self.path = path
+        self.fsync_policy = fsync_policy
+        self.fsync_interval = fsync_interval
+        self.compact_ratio = compact_ratio
+        self.key_field = key_field
+
+        self._lock = threading.RLock()
+        self._file = None
+        self._last_fsync = 0.0
+        self._recovered = False
+
+        # Contadores mantidos pela leitura completa, usados para decidir a compactação
+        self._record_count = 0
+        self._garbage_count = 0
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def append(self, record: Any) -> None:
+        """Adiciona um registro ao final do journal"""
+        self.append_many([record])
+
+    def append_many(self, records: Iterable[Any]) -> int:
+        """Adiciona vários registros com um único write/fsync"""
+        lines = [
+            json.dumps(record, ensure_ascii=False, default=str, separators=(',', ':')) + '\n'
+            for record in records
+        ]
+
+        if not lines:
+            return 0
+
+        with self._lock:
+            handle = self._open_for_append()
+            handle.write(''.join(lines).encode('utf-8'))
+            handle.flush()
+            self._sync(handle)
+            self._record_count += len(lines)
+
+        return len(lines)
+
+    def _open_for_append(self):
+        """Abre o arquivo em modo append, recuperando a cauda na primeira vez"""
+        if self._file is None:
+            if not self._recovered:
+                self.recover()
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            self._file = open(self.path, 'ab')
+
+        return self._file
+
+    def _sync(self, handle) -> None:
+        """Aplica a política de fsync configurada"""
+        if self.fsync_policy == FSYNC_NEVER:
+            return
+
+        now = time.monotonic()
+        if self.fsync_policy == FSYNC_ALWAYS or now - self._last_fsync >= self.fsync_interval:
+            os.fsync(handle.fileno())
+            self._last_fsync = now
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def iter_records(self) -> Iterator[Any]:
+        """Percorre os registros do journal em streaming (linha a linha)"""
+        with self._lock:
+            if not self._recovered:
+                self.recover()
+
+            if self._file is not None:
+                self._file.flush()
+
+        if not os.path.exists(self.path):
+            return
+
+        seen_keys = set() if self.key_field else None
+        total = 0
+        garbage = 0
+
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    garbage += 1
+                    continue
+
+                if seen_keys is not None and isinstance(record, dict):
+                    key = record.get(self.key_field)
+                    if key:
+                        if key in seen_keys:
+                            garbage += 1
+                            continue
+                        seen_keys.add(key)
+
+                total += 1
+                yield record
+
+        self._record_count = total
+        self._garbage_count = garbage
+
+    def load_all(self) -> List[Any]:
+        """Carrega todos os registros em uma lista"""
+        return list(self.iter_records())
+
+    # ------------------------------------------------------------------
+    # Recuperação e compactação
+    # ------------------------------------------------------------------
+    def recover(self) -> int:
+        """Remove uma linha final incompleta deixada por uma queda durante a escrita
+
+        Retorna o número de bytes descartados.
+        """
+        with self._lock:
+            self._recovered = True
+
+            if not os.path.exists(self.path):
+                return 0
+
+            size = os.path.getsize(self.path)
+            if size == 0:
+                return 0
+
+            with open(self.path, 'rb+') as f:
+                # Procurar a última quebra de linha a partir do fim, em blocos
+                block = 4096
+                position = size
+                last_newline = -1
+
+                while position > 0 and last_newline < 0:
+                    read_size = min(block, position)
+                    position -= read_size
+                    f.seek(position)
+                    chunk = f.read(read_size)
+                    index = chunk.rfind(b'\n')
+                    if index >= 0:
+                        last_newline = position + index
+
+                tail_start = last_newline + 1
+                if tail_start >= size:
+                    return 0
+
+                f.seek(tail_start)
+                tail = f.read()
+
+                # Uma cauda sem '\n' só é mantida se for um JSON completo
+                try:
+                    json.loads(tail)
+                    f.seek(0, os.SEEK_END)
+                    f.write(b'\n')
+                    return 0
+                except ValueError:
+                    f.truncate(tail_start)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    logger.warning(f"Journal {self.path}: {len(tail)} bytes incompletos descartados na recuperação")
+                    return len(tail)
+
+    def needs_compaction(self) -> bool:
+        """Indica se a proporção de lixo (duplicados/corrompidos) justifica compactar"""
+        total = self._record_count + self._garbage_count
+        return total > 0 and self._garbage_count / total >= self.compact_ratio
+
+    def compact(self) -> int:
+        """Reescreve o journal apenas com os registros válidos (troca atômica)
+
+        Retorna o número de registros mantidos.
+        """
+        with self._lock:
+            records = self.load_all()
+            self.rewrite(records)
+            logger.info(f"Journal {self.path} compactado: {len(records)} registros")
+            return len(records)
+
+    def rewrite(self, records: Iterable[Any]) -> int:
+        """Substitui todo o conteúdo do journal pelos registros informados (troca atômica)
+
+        O arquivo novo é gravado ao lado e trocado com os.replace: uma queda no
+        meio da operação deixa o journal antigo intacto.
+        """
+        with self._lock:
+            self._close()
+
+            count = 0
+            temp_path = f"{self.path}.compact"
+            os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+            with open(temp_path, 'wb') as f:
+                for record in records:
+                    line = json.dumps(record, ensure_ascii=False, default=str, separators=(',', ':'))
+                    f.write((line + '\n').encode('utf-8'))
+                    count += 1
+                f.flush()
+                os.fsync(f.fileno())
+
+            os.replace(temp_path, self.path)
+
+            self._record_count = count
+            self._garbage_count = 0
+            return count
+
+    def maybe_compact(self) -> bool:
+        """Compacta o journal se a última leitura encontrou lixo suficiente"""
+        if self.needs_compaction():
+            self.compact()
+            return True
+        return False
+
+    def import_json_array(self, json_path: str) -> int:
+        """Importa um arquivo JSON legado (lista de registros) para o journal"""
+        with open(json_path, 'r', encoding='utf-8') as f:
+            records = json.load(f)
+
+        if not isinstance(records, list):
+            records = [records]
+
+        return self.append_many(records)
+
+    def clear(self) -> None:
+        """Remove o journal do disco"""
+        with self._lock:
+            self._close()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+            self._record_count = 0
+            self._garbage_count = 0
+
+    def _close(self) -> None:
+        if self._file is not None:
+            try:
+                self._file.flush()
+                if self.fsync_policy != FSYNC_NEVER:
+                    os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+
+    def close(self) -> None:
+        """Fecha o arquivo aberto para escrita"""
+        with self._lock:
+            self._close()
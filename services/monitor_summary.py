@@ -0,0 +1,49 @@
+"""
+Resumo agregado dos eventos de monitor (cards, alertas e relatório)
+"""
+from datetime import date, timedelta
+from typing import Any, Dict, Optional
+import logging
+
+import pandas as pd
+
+from monitor_config import MonitorConfig
+
+logger = logging.getLogger(__name__)
+
+# Status cujos monitores contam como "dentro do limite"
+WITHIN_LIMIT_STATUSES = [MonitorConfig.EVENT_STATUS['CONFIRMADO'], MonitorConfig.EVENT_STATUS['CONCLUIDO']]
+
+
+def summarize_events(frame: pd.DataFrame, today: Optional[date] = None) -> Dict[str, Any]:
+    """Calcula de uma vez todas as métricas exibidas no painel
+
+    frame é o DataFrame tipado de MonitorManager.process_monitor_frame (com a
+    coluna montagem_dt). Eventos vencidos têm montagem anterior a hoje; os
+    próximos do vencimento montam em até DAYS_BEFORE_EXPIRY_WARNING dias. Em
+    ambos os casos eventos concluídos são ignorados.
+    """
+    today = pd.Timestamp(today or date.today())
+    warning_limit = today + timedelta(days=MonitorConfig.ALERT_THRESHOLDS['DAYS_BEFORE_EXPIRY_WARNING'])
+
+    status = frame['status']
+    monitores = frame['monitores']
+    montagem = frame['montagem_dt']
+
+    by_status = status.value_counts(sort=False)
+    open_events = status != MonitorConfig.EVENT_STATUS['CONCLUIDO']
+
+    return {
+        'total_eventos': len(frame),
+        'total_monitores': int(monitores.sum()),
+        'dentro_limite': int(monitores[status.isin(WITHIN_LIMIT_STATUSES)].sum()),
+        'excedente': int(monitores[status == MonitorConfig.EVENT_STATUS['EXCEDENTE']].sum()),
+        'by_status': {key: int(count) for key, count in by_status.items()},
+        'by_attendance': {key: int(count) for key, count in frame['status_atendimento'].value_counts(sort=False).items()},
+        'monitores_por_sala': {key: int(total) for key, total in monitores.groupby(frame['sala'], sort=False).sum().items()},
+        'pendentes': int(by_status.get(MonitorConfig.EVENT_STATUS['PENDENTE'], 0)),
+        'excedentes': int(by_status.get(MonitorConfig.EVENT_STATUS['EXCEDENTE'], 0)),
+        'sem_reporter': int((frame['reporter'].str.strip() == '').sum()),
+        'vencidos': int((open_events & (montagem < today)).sum()),
+        'proximos_vencimento': int((open_events & (montagem >= today) & (montagem <= warning_limit)).sum())
+    }
@@ -0,0 +1,237 @@
+"""
+Tabela colunar e compacta das movimentações de inventário
+"""
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+import logging
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+logger = logging.getLogger(__name__)
+
+DATE_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+# Outros formatos aceitos (ex.: CSV importado), tentados só para o que não casou
+FALLBACK_FORMATS = ['%d/%m/%Y %H:%M', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S', '%Y-%m-%d']
+
+# Campos do registro (mesma ordem de DataManager._prepare_row_data)
+FIELDS = [
+    'inventoryId', 'itemId', 'dateTime', 'amount', 'building', 'email',
+    'invoiceNumber', 'sku', 'location', 'type', 'supplier', 'shelfLocation'
+]
+
+# Campos de texto com muita repetição: guardados como category (códigos inteiros)
+CATEGORY_FIELDS = [
+    'itemId', 'building', 'email', 'invoiceNumber', 'sku',
+    'location', 'type', 'supplier', 'shelfLocation'
+]
+
+# Colunas do DataFrame: dateTime vira timestamp (datetime64, interpretado uma vez);
+# dateText guarda o texto original apenas quando ele não está em DATE_FORMAT
+COLUMNS = ['inventoryId', 'itemId', 'timestamp', 'dateText', 'amount', 'building', 'email',
+           'invoiceNumber', 'sku', 'location', 'type', 'supplier', 'shelfLocation']
+
+
+def _parse_timestamps(values: pd.Series) -> Tuple[pd.Series, np.ndarray]:
+    """Retorna (datetime64[s], máscara dos valores já no formato canônico DATE_FORMAT)"""
+    day_codes, days = pd.factorize(values.str.slice(0, 10))
+    time_codes, times = pd.factorize(values.str.slice(11))
+
+    day_values = pd.to_datetime(pd.Series(days, dtype=object), format='%d/%m/%Y', errors='coerce')
+    times = pd.Series(times, dtype=object).str
+    hours = pd.to_numeric(times.slice(0, 2), errors='coerce')
+    minutes = pd.to_numeric(times.slice(3, 5), errors='coerce')
+    seconds = pd.to_numeric(times.slice(6, 8), errors='coerce')
+    valid_times = (
+        times.fullmatch(r'\d{2}:\d{2}:\d{2}').to_numpy(dtype=bool)
+        & (hours < 24).to_numpy() & (minutes < 60).to_numpy() & (seconds < 60).to_numpy()
+    )
+    offsets = (hours * 3600 + minutes * 60 + seconds).to_numpy()
+
+    parsed = pd.Series(
+        day_values.to_numpy()[day_codes] + pd.to_timedelta(offsets, unit='s').to_numpy()[time_codes],
+        index=values.index
+    )
+    exact = (values.str.slice(10, 11) == ' ').to_numpy() & valid_times[time_codes] & parsed.notna().to_numpy()
+    parsed[~exact] = pd.NaT
+
+    pending = parsed.isna() & (values != '')
+    for fmt in FALLBACK_FORMATS:
+        if not pending.any():
+            break
+        parsed[pending] = pd.to_datetime(values[pending], format=fmt, errors='coerce')
+        pending = parsed.isna() & (values != '')
+
+    return parsed.astype('datetime64[s]'), exact
+
+
+def parse_timestamps(values: pd.Series) -> pd.Series:
+    """DD/MM/AAAA HH:MM:SS -> datetime64[s]
+
+    Data e hora são interpretadas separadamente, uma vez por valor distinto
+    (dias e horários se repetem muito mais que o timestamp completo).
+    """
+    return _parse_timestamps(values)[0]
+
+
+def _build_chunk(records: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Converte um lote de registros (dicts) para as colunas compactas"""
+    raw = pd.DataFrame.from_records(records, columns=FIELDS)
+    date_text = raw['dateTime'].fillna('').astype(str).str.strip()
+    timestamps, exact = _parse_timestamps(date_text)
+
+    chunk = pd.DataFrame({
+        'inventoryId': raw['inventoryId'].fillna('').astype(str),
+        'timestamp': timestamps,
+        # Texto original só onde o timestamp não o reproduz (outro formato ou inválido)
+        'dateText': date_text.where(~exact, '').astype('category'),
+        'amount': pd.to_numeric(raw['amount'], errors='coerce').fillna(0).astype(np.float64)
+    })
+    for field in CATEGORY_FIELDS:
+        chunk[field] = raw[field].fillna('').astype(str).astype('category')
+
+    return chunk[COLUMNS]
+
+
+def _concat(chunks: List[pd.DataFrame]) -> pd.DataFrame:
+    """Concatena lotes preservando as colunas category (une as categorias)"""
+    if len(chunks) == 1:
+        return chunks[0]
+
+    data = {}
+    for column in COLUMNS:
+        parts = [chunk[column] for chunk in chunks]
+        if isinstance(parts[0].dtype, pd.CategoricalDtype):
+            data[column] = pd.Series(union_categoricals(parts, ignore_order=True))
+        else:
+            data[column] = pd.concat(parts, ignore_index=True)
+
+    return pd.DataFrame(data)[COLUMNS]
+
+
+def date_texts(df: pd.DataFrame) -> pd.Series:
+    """dateTime de cada linha como texto: o original se não era canônico, senão DATE_FORMAT
+
+    O strftime roda uma vez por timestamp distinto (NaT vira '').
+    """
+    codes, uniques = pd.factorize(df['timestamp'])
+    texts = np.append(pd.DatetimeIndex(uniques).strftime(DATE_FORMAT).to_numpy(dtype=object), '')
+    formatted = pd.Series(texts[codes], index=df.index, dtype=object)
+    original = df['dateText'].astype(str)
+    return original.where(original != '', formatted)
+
+
+def _amount_values(amounts: pd.Series) -> List[Any]:
+    """Quantidades como no registro original: inteiras como int, fracionárias como float"""
+    return [int(value) if value.is_integer() else value for value in amounts.tolist()]
+
+
+def frame_records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Linhas de um frame da tabela (ou de um recorte dele) como dicts originais"""
+    columns = {}
+    for field in FIELDS:
+        if field == 'dateTime':
+            columns[field] = date_texts(df).tolist()
+        elif field == 'amount':
+            columns[field] = _amount_values(df['amount'])
+        else:
+            columns[field] = df[field].tolist()
+    return [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+
+class MovementTable:
+    """Movimentações em colunas tipadas, com append em lotes
+
+    Textos repetidos (prédio, andar, tipo, item, fornecedor...) ficam como
+    category, amount como float64 (quantidades fracionárias são preservadas) e
+    dateTime como datetime64 interpretado uma única vez; o texto original só é
+    guardado quando não está no formato padrão. Cada append vira um lote;
+    frame() consolida os lotes e devolve sempre o mesmo DataFrame enquanto não
+    houver novos appends, então as telas compartilham a mesma visão sem
+    reconverter listas de dicts.
+    """
+
+    def __init__(self, records: Optional[Iterable[Dict[str, Any]]] = None):
+        self._lock = threading.Lock()
+        self._chunks: List[pd.DataFrame] = []
+        self._rows = 0
+
+        if records is not None:
+            self.append(records)
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def __bool__(self) -> bool:
+        return self._rows > 0
+
+    def append(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Adiciona um lote de registros; retorna quantos foram adicionados"""
+        records = list(records)
+        if not records:
+            return 0
+
+        chunk = _build_chunk(records)
+
+        with self._lock:
+            self._chunks.append(chunk)
+            self._rows += len(chunk)
+
+        return len(chunk)
+
+    def view(self) -> 'TableView':
+        """Recorte imutável dos lotes atuais (O(1); não consolida nada)"""
+        with self._lock:
+            return TableView(self, tuple(self._chunks), self._rows)
+
+    def _adopt(self, chunks: Tuple[pd.DataFrame, ...], frame: pd.DataFrame) -> None:
+        """Troca os lotes já consolidados por uma view pelo frame resultante"""
+        with self._lock:
+            count = len(chunks)
+            if count > 1 and all(mine is theirs for mine, theirs in zip(self._chunks[:count], chunks)):
+                self._chunks = [frame] + self._chunks[count:]
+
+    def frame(self) -> pd.DataFrame:
+        """DataFrame compacto de todas as movimentações (não copie para só ler)"""
+        return self.view().frame()
+
+    def records(self) -> List[Dict[str, Any]]:
+        """Registros no formato de dict original (para gravação/exportação)"""
+        return frame_records(self.frame())
+
+    def memory_usage(self) -> int:
+        """Bytes ocupados pelas colunas (deep)"""
+        return int(self.frame().memory_usage(deep=True).sum())
+
+
+class TableView:
+    """Lotes da tabela até um append, consolidados só na primeira leitura
+
+    Cada versão publicada guarda a sua view: gravar não custa a concatenação
+    do histórico inteiro, que só acontece quando alguém lê o frame. O frame
+    consolidado é devolvido à tabela, então a próxima leitura só concatena
+    os lotes que chegaram depois.
+    """
+
+    def __init__(self, table: MovementTable, chunks: Tuple[pd.DataFrame, ...], rows: int):
+        self._lock = threading.Lock()
+        self._table = table
+        self._chunks = chunks
+        self._rows = rows
+        self._frame: Optional[pd.DataFrame] = None
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def frame(self) -> pd.DataFrame:
+        with self._lock:
+            if self._frame is None:
+                if not self._chunks:
+                    self._frame = _build_chunk([])
+                else:
+                    self._frame = _concat(list(self._chunks))
+                    self._table._adopt(self._chunks, self._frame)
+                self._chunks = ()
+            return self._frame
@@ -0,0 +1,173 @@
+"""
+Limitador de taxa (token bucket) e retry com backoff para chamadas ao Google Sheets
+"""
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+import logging
+
+import requests
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Status HTTP que indicam condição transitória (quota ou falha do servidor)
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+
+def get_status_code(error: Exception) -> Optional[int]:
+    """Extrai o status HTTP de exceções do gspread/requests"""
+    response = getattr(error, 'response', None)
+    status = getattr(response, 'status_code', None)
+    if status is None:
+        status = getattr(error, 'code', None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: Exception) -> bool:
+    """Indica se vale a pena repetir a chamada"""
+    if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    return get_status_code(error) in RETRYABLE_STATUS
+
+
+def was_rejected(error: Exception) -> bool:
+    """Indica que a requisição com certeza não foi aplicada (429 ou conexão nunca aberta)
+
+    Só nesses casos é seguro repetir chamadas não idempotentes, como appends:
+    num 5xx ou timeout de leitura a linha pode já ter sido gravada.
+    """
+    if isinstance(error, requests.exceptions.ConnectTimeout):
+        return True
+    return get_status_code(error) == 429
+
+
+class TokenBucket:
+    """Token bucket thread-safe com reposição contínua"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.tokens = float(per_minute)
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Consome um token, esperando se necessário; retorna o tempo esperado"""
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+
+class SheetsRateLimiter:
+    """Encaminha toda chamada ao Sheets por um bucket de leitura ou escrita
+
+    Erros 429/5xx e falhas de rede são repetidos com backoff exponencial com
+    jitter (respeitando Retry-After quando presente). As métricas registram
+    esperas locais, erros de quota e tentativas. Chamadas com idempotent=False
+    (appends) só são repetidas quando a requisição foi recusada antes de chegar
+    a ser aplicada.
+    """
+
+    def __init__(self, read_per_minute: int, write_per_minute: int, max_retries: int = 5,
+                 base_delay: float = 1.0, max_delay: float = 64.0):
+        self.buckets = {
+            'read': TokenBucket(read_per_minute),
+            'write': TokenBucket(write_per_minute)
+        }
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self._lock = threading.Lock()
+        self._metrics = {
+            'calls': 0,
+            'throttled': 0,          # chamadas que esperaram no bucket local
+            'throttle_wait_seconds': 0.0,
+            'quota_errors': 0,       # respostas 429
+            'server_errors': 0,      # respostas 5xx / falhas de rede
+            'retries': 0,
+            'failures': 0
+        }
+
+    def call(self, kind: str, func: Callable, *args, max_retries: Optional[int] = None,
+             idempotent: bool = True, **kwargs) -> Any:
+        """Executa func respeitando a quota do tipo ('read' ou 'write')"""
+        bucket = self.buckets[kind]
+        retries = self.max_retries if max_retries is None else max_retries
+        attempt = 0
+
+        while True:
+            waited = bucket.acquire()
+            self._record(calls=1, throttled=1 if waited else 0, throttle_wait_seconds=waited)
+
+            try:
+                return func(*args, **kwargs)
+            except Exception as e:
+                retryable = is_retryable(e) if idempotent else was_rejected(e)
+                if not retryable or attempt >= retries:
+                    self._record(failures=1)
+                    raise
+
+                status = get_status_code(e)
+                if status == 429:
+                    self._record(quota_errors=1, retries=1)
+                else:
+                    self._record(server_errors=1, retries=1)
+
+                delay = self._backoff_delay(attempt, e)
+                attempt += 1
+                logger.warning(
+                    f"Google Sheets {kind} falhou (status {status}), "
+                    f"tentativa {attempt}/{retries} em {delay:.1f}s"
+                )
+                time.sleep(delay)
+
+    def _backoff_delay(self, attempt: int, error: Exception) -> float:
+        """Backoff exponencial com jitter (ou Retry-After do servidor)"""
+        response = getattr(error, 'response', None)
+        retry_after = getattr(response, 'headers', {}).get('Retry-After') if response is not None else None
+
+        if retry_after:
+            try:
+                return min(float(retry_after), self.max_delay)
+            except ValueError:
+                pass
+
+        ceiling = min(self.max_delay, self.base_delay * 2 ** attempt)
+        return random.uniform(ceiling / 2, ceiling)
+
+    def _record(self, **values) -> None:
+        with self._lock:
+            for key, value in values.items():
+                self._metrics[key] += value
+
+    def metrics(self) -> Dict[str, Any]:
+        """Cópia das métricas de throttling"""
+        with self._lock:
+            return dict(self._metrics)
+
+
+# Instância global (compartilhada por todo acesso ao Google Sheets)
+sheets_rate_limiter = SheetsRateLimiter(
+    read_per_minute=settings.SHEETS_READ_QUOTA_PER_MINUTE,
+    write_per_minute=settings.SHEETS_WRITE_QUOTA_PER_MINUTE,
+    max_retries=settings.SHEETS_MAX_RETRIES,
+    base_delay=settings.SHEETS_BACKOFF_BASE,
+    max_delay=settings.SHEETS_BACKOFF_MAX
+)
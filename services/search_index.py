@@ -0,0 +1,158 @@
+"""
+Índice invertido para busca textual (sem acentos, sem caixa, por prefixo)
+"""
+import bisect
+import re
+import threading
+import unicodedata
+from typing import Any, Dict, Iterable, List, Set
+import logging
+
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def fold(text: Any) -> str:
+    """Remove acentos e normaliza caixa ('Reunião' -> 'reuniao')"""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(char for char in decomposed if not unicodedata.combining(char)).casefold()
+
+
+def tokenize(text: Any) -> List[str]:
+    """Quebra o texto em termos já normalizados"""
+    return TOKEN_PATTERN.findall(fold(text))
+
+
+class SearchIndex:
+    """Índice termo -> chaves dos documentos, com busca por prefixo
+
+    sync() recebe a lista completa de documentos e só reindexa os que são novos
+    ou mudaram (assinatura dos campos indexados); os que sumiram são removidos.
+    Cada termo da consulta casa por prefixo e os termos são combinados com E.
+    """
+
+    def __init__(self, fields: List[str], key_field: str = 'key'):
+        self.fields = fields
+        self.key_field = key_field
+
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[str]] = {}
+        self._doc_terms: Dict[str, Set[str]] = {}
+        self._signatures: Dict[str, int] = {}
+        self._sorted_terms: List[str] = []
+        self._terms_dirty = False
+
+    def _signature(self, doc: Dict[str, Any]) -> int:
+        return hash(tuple(str(doc.get(field, '')) for field in self.fields))
+
+    def _add(self, key: str, doc: Dict[str, Any]) -> None:
+        terms = set()
+        for field in self.fields:
+            terms.update(tokenize(doc.get(field, '')))
+
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is None:
+                self._postings[term] = postings = set()
+                self._terms_dirty = True
+            postings.add(key)
+
+        self._doc_terms[key] = terms
+
+    def _remove(self, key: str) -> None:
+        for term in self._doc_terms.pop(key, ()):
+            postings = self._postings.get(term)
+            if postings is None:
+                continue
+            postings.discard(key)
+            if not postings:
+                del self._postings[term]
+                self._terms_dirty = True
+        self._signatures.pop(key, None)
+
+    def sync(self, docs: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Atualiza o índice para refletir exatamente os documentos informados"""
+        with self._lock:
+            seen = set()
+            added = updated = 0
+
+            for doc in docs:
+                key = doc.get(self.key_field)
+                if not key:
+                    continue
+                key = str(key)
+                seen.add(key)
+
+                signature = self._signature(doc)
+                previous = self._signatures.get(key)
+                if previous == signature:
+                    continue
+
+                if previous is None:
+                    added += 1
+                else:
+                    self._remove(key)
+                    updated += 1
+
+                self._add(key, doc)
+                self._signatures[key] = signature
+
+            removed_keys = [key for key in self._signatures if key not in seen]
+            for key in removed_keys:
+                self._remove(key)
+
+            if added or updated or removed_keys:
+                logger.info(f"Índice de busca: {added} novos, {updated} alterados, {len(removed_keys)} removidos")
+
+            return {'added': added, 'updated': updated, 'removed': len(removed_keys)}
+
+    def _terms_with_prefix(self, prefix: str) -> List[str]:
+        if self._terms_dirty:
+            self._sorted_terms = sorted(self._postings)
+            self._terms_dirty = False
+
+        start = bisect.bisect_left(self._sorted_terms, prefix)
+        end = bisect.bisect_left(self._sorted_terms, prefix + '\U0010ffff')
+        return self._sorted_terms[start:end]
+
+    def search(self, query: str) -> Set[str]:
+        """Chaves dos documentos que contêm todos os termos (por prefixo)"""
+        terms = tokenize(query)
+
+        with self._lock:
+            if not terms:
+                return set(self._signatures)
+
+            result = None
+
+            # Termos mais longos primeiro: costumam ser mais seletivos
+            for term in sorted(set(terms), key=len, reverse=True):
+                matches = set()
+                for indexed_term in self._terms_with_prefix(term):
+                    matches |= self._postings[indexed_term]
+
+                result = matches if result is None else result & matches
+                if not result:
+                    return set()
+
+            return result
+
+
+def matches_locally(doc: Dict[str, Any], query: str, fields: List[str]) -> bool:
+    """Mesma semântica do índice para poucos documentos (sem indexar)"""
+    doc_terms = set()
+    for field in fields:
+        doc_terms.update(tokenize(doc.get(field, '')))
+
+    return all(
+        any(doc_term.startswith(term) for doc_term in doc_terms)
+        for term in tokenize(query)
+    )
+
+
+# Campos buscáveis dos eventos de monitor
+MONITOR_SEARCH_FIELDS = ['sala', 'reporter', 'key', 'observacoes', 'status']
+
+# Instância global (compartilhada pelas sessões do painel de monitores)
+monitor_search_index = SearchIndex(MONITOR_SEARCH_FIELDS)
@@ -0,0 +1,175 @@
+"""
+Provedor único (por processo) do cliente gspread e cache de planilhas/abas
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional, Tuple
+import logging
+
+import gspread
+import streamlit as st
+from google.auth.transport.requests import AuthorizedSession, Request
+from google.oauth2.service_account import Credentials
+from requests.adapters import HTTPAdapter
+
+from config.settings import settings
+from services.rate_limiter import sheets_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+SCOPES = [
+    'https://www.googleapis.com/auth/spreadsheets',
+    'https://www.googleapis.com/auth/drive'
+]
+
+
+class SheetsClientProvider:
+    """Compartilha credenciais, sessão HTTP (keep-alive) e handles entre os serviços
+
+    Os handles de Spreadsheet/Worksheet ficam em cache por TTL, chaveados por
+    (spreadsheet_id, sheet_name), evitando os round-trips de metadados de
+    open_by_key() e worksheet() antes de cada escrita.
+    """
+
+    def __init__(self, handle_ttl: Optional[int] = None, refresh_margin: Optional[int] = None):
+        self.handle_ttl = handle_ttl if handle_ttl is not None else settings.SHEETS_HANDLE_TTL
+        self.refresh_margin = refresh_margin if refresh_margin is not None else settings.SHEETS_TOKEN_REFRESH_MARGIN
+
+        self._lock = threading.RLock()
+        self._credentials = None
+        self._session = None
+        self._client = None
+        self._handles: Dict[Tuple[str, Optional[str]], Tuple[float, Any]] = {}
+
+    def _load_credentials(self) -> Optional[Credentials]:
+        """Carrega credenciais do Streamlit secrets ou do arquivo local"""
+        try:
+            if hasattr(st, 'secrets') and 'google_sheets' in st.secrets:
+                # Produção - usar secrets do Streamlit
+                return Credentials.from_service_account_info(dict(st.secrets['google_sheets']), scopes=SCOPES)
+        except FileNotFoundError:
+            # Sem secrets.toml configurado
+            pass
+
+        # Desenvolvimento - usar arquivo local
+        if os.path.exists(settings.GOOGLE_CREDENTIALS_FILE):
+            return Credentials.from_service_account_file(settings.GOOGLE_CREDENTIALS_FILE, scopes=SCOPES)
+
+        return None
+
+    def get_client(self) -> Optional[gspread.Client]:
+        """Retorna o cliente compartilhado (None se não houver credenciais)"""
+        with self._lock:
+            if self._client is None:
+                credentials = self._load_credentials()
+                if credentials is None:
+                    return None
+
+                session = AuthorizedSession(credentials)
+                adapter = HTTPAdapter(
+                    pool_connections=settings.SHEETS_POOL_CONNECTIONS,
+                    pool_maxsize=settings.SHEETS_POOL_MAXSIZE
+                )
+                session.mount('https://', adapter)
+
+                self._credentials = credentials
+                self._session = session
+                self._client = gspread.Client(auth=credentials, session=session)
+                logger.info("Google Sheets client initialized successfully")
+
+            self._ensure_fresh_token()
+            return self._client
+
+    def _ensure_fresh_token(self) -> None:
+        """Renova o token antes de expirar, fora do caminho de uma escrita"""
+        credentials = self._credentials
+        if credentials is None:
+            return
+
+        # expiry do google-auth é um datetime UTC sem timezone
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        expiry = credentials.expiry
+
+        if credentials.token is None or expiry is None or expiry - now <= timedelta(seconds=self.refresh_margin):
+            credentials.refresh(Request(self._session))
+
+    def _cached(self, key: Tuple[str, Optional[str]]):
+        entry = self._handles.get(key)
+        if entry and entry[0] > time.monotonic():
+            return entry[1]
+        return None
+
+    def _store(self, key: Tuple[str, Optional[str]], handle: Any) -> Any:
+        self._handles[key] = (time.monotonic() + self.handle_ttl, handle)
+        return handle
+
+    def get_spreadsheet(self, spreadsheet_id: str):
+        """Retorna o handle da planilha (cache por TTL)
+
+        A requisição (e o backoff do rate limiter) roda fora do lock, para que
+        um open_by_key lento não bloqueie as demais threads.
+        """
+        key = (spreadsheet_id, None)
+        with self._lock:
+            handle = self._cached(key)
+            if handle is not None:
+                return handle
+
+        client = self.get_client()
+        if client is None:
+            raise Exception("Google Sheets client not initialized")
+
+        handle = sheets_rate_limiter.call('read', client.open_by_key, spreadsheet_id)
+        return self._store_if_absent(key, handle)
+
+    def get_worksheet(self, spreadsheet_id: str, sheet_name: str):
+        """Retorna o handle da aba (cache por TTL)"""
+        key = (spreadsheet_id, sheet_name)
+        with self._lock:
+            handle = self._cached(key)
+            if handle is not None:
+                return handle
+
+        spreadsheet = self.get_spreadsheet(spreadsheet_id)
+        handle = sheets_rate_limiter.call('read', spreadsheet.worksheet, sheet_name)
+        return self._store_if_absent(key, handle)
+
+    def _store_if_absent(self, key: Tuple[str, Optional[str]], handle: Any) -> Any:
+        """Guarda o handle, preferindo o de outra thread que tenha chegado antes"""
+        with self._lock:
+            cached = self._cached(key)
+            if cached is not None:
+                return cached
+            return self._store(key, handle)
+
+    def has_cached_worksheet(self, spreadsheet_id: str, sheet_name: str) -> bool:
+        """Indica se a aba já está no cache (sem fazer requisições)"""
+        with self._lock:
+            return self._cached((spreadsheet_id, sheet_name)) is not None
+
+    def invalidate(self, spreadsheet_id: Optional[str] = None, sheet_name: Optional[str] = None) -> None:
+        """Descarta handles em cache (todos, de uma planilha ou de uma aba)"""
+        with self._lock:
+            if spreadsheet_id is None:
+                self._handles.clear()
+                return
+
+            for key in list(self._handles):
+                if key[0] == spreadsheet_id and (sheet_name is None or key[1] in (sheet_name, None)):
+                    del self._handles[key]
+
+    def reset(self) -> None:
+        """Descarta cliente, sessão e handles (ex.: após trocar credenciais)"""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._client = None
+            self._session = None
+            self._credentials = None
+            self._handles.clear()
+
+
+# Instância global (compartilhada por DataManager, GoogleSheetsService e MonitorManager)
+sheets_client_provider = SheetsClientProvider()
@@ -0,0 +1,122 @@
+"""
+Índice key -> número da linha para atualizações pontuais no Google Sheets
+"""
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from gspread.utils import rowcol_to_a1
+
+from services.rate_limiter import sheets_rate_limiter
+from services.sheets_client import sheets_client_provider
+
+logger = logging.getLogger(__name__)
+
+
+class SheetRowIndex:
+    """Mantém em cache a posição de cada key e grava atualizações em lote
+
+    O índice é montado a partir de uma única coluna (col_values) e reconstruído
+    quando uma key não é encontrada ou quando a verificação mostra que a linha
+    mudou de lugar (inserções/remoções na planilha).
+    """
+
+    def __init__(self, spreadsheet_id: str, sheet_name: str, key_column: int, ttl: float = 600):
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.key_column = key_column
+        self.ttl = ttl
+
+        self._lock = threading.Lock()
+        self._rows: Optional[Dict[str, int]] = None
+        self._built_at = 0.0
+
+    def _worksheet(self):
+        return sheets_client_provider.get_worksheet(self.spreadsheet_id, self.sheet_name)
+
+    def _build(self) -> Dict[str, int]:
+        """Lê só a coluna de keys (primeira ocorrência de cada key vence)"""
+        values = sheets_rate_limiter.call('read', self._worksheet().col_values, self.key_column)
+
+        rows = {}
+        for row_number, value in enumerate(values, start=1):
+            key = str(value).strip()
+            if row_number > 1 and key and key not in rows:
+                rows[key] = row_number
+
+        self._rows = rows
+        self._built_at = time.monotonic()
+        logger.info(f"Índice de linhas de {self.sheet_name}: {len(rows)} keys")
+        return rows
+
+    def _current(self, keys: List[str]) -> Dict[str, int]:
+        expired = time.monotonic() - self._built_at > self.ttl
+        if self._rows is None or expired or any(key not in self._rows for key in keys):
+            return self._build()
+        return self._rows
+
+    def _verify(self, positions: Dict[str, int]) -> bool:
+        """Confere, em uma única leitura, se cada key continua na linha indexada"""
+        if not positions:
+            return True
+
+        ranges = [rowcol_to_a1(row, self.key_column) for row in positions.values()]
+        found = sheets_rate_limiter.call('read', self._worksheet().batch_get, ranges)
+
+        for key, value_range in zip(positions, found):
+            cell = value_range[0][0] if value_range and value_range[0] else ''
+            if str(cell).strip() != key:
+                return False
+        return True
+
+    def locate(self, keys: List[str]) -> Tuple[Dict[str, int], List[str]]:
+        """Retorna ({key: linha}, keys não encontradas), já verificadas na planilha"""
+        with self._lock:
+            rows = self._current(keys)
+            positions = {key: rows[key] for key in keys if key in rows}
+
+            if not self._verify(positions):
+                logger.info(f"Linhas de {self.sheet_name} mudaram de posição, reconstruindo índice")
+                rows = self._build()
+                positions = {key: rows[key] for key in keys if key in rows}
+
+            missing = [key for key in keys if key not in positions]
+            return positions, missing
+
+    def update_column(self, updates: Dict[str, Any], column: int) -> Dict[str, Any]:
+        """Grava {key: valor} na coluna informada com um único batch_update"""
+        keys = [str(key) for key in updates]
+        positions, missing = self.locate(keys)
+
+        if positions:
+            data = [
+                {'range': rowcol_to_a1(row, column), 'values': [[updates[key]]]}
+                for key, row in positions.items()
+            ]
+            sheets_rate_limiter.call('write', self._worksheet().batch_update, data, value_input_option='USER_ENTERED')
+
+        logger.info(f"{len(positions)} linhas atualizadas em {self.sheet_name} ({len(missing)} keys não encontradas)")
+        return {'updated': list(positions), 'missing': missing}
+
+    def keys(self) -> List[str]:
+        """Keys presentes na aba (usa o índice em cache enquanto o TTL não vence)"""
+        with self._lock:
+            return list(self._current([]))
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._rows = None
+
+
+_indexes: Dict[Tuple[str, str, int], SheetRowIndex] = {}
+_indexes_lock = threading.Lock()
+
+
+def get_row_index(spreadsheet_id: str, sheet_name: str, key_column: int) -> SheetRowIndex:
+    """Índice compartilhado pelo processo para a aba/coluna de keys"""
+    with _indexes_lock:
+        cache_key = (spreadsheet_id, sheet_name, key_column)
+        if cache_key not in _indexes:
+            _indexes[cache_key] = SheetRowIndex(spreadsheet_id, sheet_name, key_column)
+        return _indexes[cache_key]
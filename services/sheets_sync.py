@@ -0,0 +1,181 @@
+"""
+Sincronização incremental de abas append-only do Google Sheets
+"""
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+from gspread.utils import numericise_all
+
+from config.settings import settings
+from services.journal_store import JournalStore, FSYNC_NEVER
+from services.rate_limiter import sheets_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+
+def _checksum(row: List[Any]) -> str:
+    """Checksum estável de uma linha da planilha"""
+    payload = json.dumps([str(value) for value in row], ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _column_count(column: str) -> int:
+    """Converte a letra da coluna (ex.: 'L') no número de colunas até ela"""
+    count = 0
+    for char in column.upper():
+        count = count * 26 + (ord(char) - ord('A') + 1)
+    return count
+
+
+def _trim_header(header: List[Any], max_width: int) -> List[Any]:
+    """Limita o header ao intervalo sincronizado e remove células vazias finais"""
+    header = list(header[:max_width])
+    while header and header[-1] == '':
+        header.pop()
+    return header
+
+
+def to_records(header: List[Any], rows: List[List[Any]]) -> List[Dict[str, Any]]:
+    """Converte as linhas em dicts com a mesma conversão numérica do get_all_records
+
+    O modo incremental usa valores crus (strings); sem essa conversão o mesmo
+    registro teria tipos diferentes conforme o caminho de leitura.
+    """
+    return [dict(zip(header, numericise_all(list(row)))) for row in rows]
+
+
+def _pad(row: List[Any], width: int) -> List[Any]:
+    """A API omite células vazias no fim da linha; completa até a largura do header"""
+    if len(row) >= width:
+        return list(row[:width]) if width else list(row)
+    return list(row) + [''] * (width - len(row))
+
+
+class IncrementalSheetSync:
+    """Mantém um cache local das linhas e baixa apenas o intervalo novo (A{n}:L)
+
+    O estado salvo guarda o número da última linha sincronizada, o checksum do
+    header e o checksum dessa última linha. Se o header mudar, ou se a linha da
+    marca d'água não bater mais (planilha editada ou truncada), é feita uma
+    recarga completa.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or settings.SHEETS_CACHE_DIR
+        self._locks: Dict[str, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock_for(self, state_path: str) -> threading.Lock:
+        """Um lock por aba: duas leituras simultâneas anexariam as mesmas linhas ao cache"""
+        with self._locks_guard:
+            lock = self._locks.get(state_path)
+            if lock is None:
+                lock = self._locks[state_path] = threading.Lock()
+            return lock
+
+    def _paths(self, spreadsheet_id: str, sheet_name: str) -> Tuple[str, str]:
+        safe_name = re.sub(r'[^A-Za-z0-9_-]+', '_', f"{spreadsheet_id}_{sheet_name}")
+        base = os.path.join(self.cache_dir, safe_name)
+        return f"{base}.state.json", f"{base}.rows.jsonl"
+
+    def _load_state(self, state_path: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _save_state(self, state_path: str, state: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(state_path) or '.', exist_ok=True)
+        temp_path = f"{state_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    def fetch(self, worksheet, spreadsheet_id: str, sheet_name: str,
+              last_column: str = 'L') -> Tuple[List[Any], List[List[Any]]]:
+        """Retorna (header, linhas) usando o cache local sempre que possível"""
+        state_path, rows_path = self._paths(spreadsheet_id, sheet_name)
+
+        with self._lock_for(state_path):
+            cache = JournalStore(rows_path, fsync_policy=FSYNC_NEVER)
+
+            try:
+                state = self._load_state(state_path)
+
+                if state and os.path.exists(rows_path):
+                    result = self._fetch_incremental(worksheet, cache, state, state_path, last_column)
+                    if result is not None:
+                        return result
+
+                return self._fetch_full(worksheet, cache, state_path, last_column)
+            finally:
+                cache.close()
+
+    def _fetch_incremental(self, worksheet, cache: JournalStore, state: Dict[str, Any],
+                           state_path: str, last_column: str):
+        last_row = state['last_row']
+
+        # Uma única requisição: header + linhas a partir da marca d'água
+        header_range, tail_range = sheets_rate_limiter.call('read', worksheet.batch_get, [
+            f"A1:{last_column}1",
+            f"A{last_row}:{last_column}"
+        ])
+
+        header = _trim_header(header_range[0] if header_range else [], _column_count(last_column))
+        if _checksum(header) != state['header_checksum']:
+            logger.info(f"Header de {worksheet.title} mudou, recarregando a aba inteira")
+            return None
+
+        width = len(header)
+        tail = [_pad(row, width) for row in tail_range]
+
+        if not tail or _checksum(tail[0]) != state['last_row_checksum']:
+            logger.info(f"Aba {worksheet.title} foi editada ou truncada, recarregando a aba inteira")
+            return None
+
+        new_rows = tail[1:]
+        if new_rows:
+            cache.append_many(new_rows)
+            state['last_row'] = last_row + len(new_rows)
+            state['last_row_checksum'] = _checksum(new_rows[-1])
+            self._save_state(state_path, state)
+
+        logger.info(f"Sincronização incremental de {worksheet.title}: {len(new_rows)} linhas novas")
+        return header, cache.load_all()
+
+    def _fetch_full(self, worksheet, cache: JournalStore, state_path: str, last_column: str):
+        values = sheets_rate_limiter.call('read', worksheet.get_all_values)
+
+        header = _trim_header(values[0] if values else [], _column_count(last_column))
+        width = len(header)
+        rows = [_pad(row, width) for row in values[1:]]
+
+        cache.clear()
+        cache.append_many(rows)
+
+        self._save_state(state_path, {
+            'last_row': len(rows) + 1,
+            'header_checksum': _checksum(header),
+            'last_row_checksum': _checksum(rows[-1] if rows else header)
+        })
+
+        logger.info(f"Carga completa de {worksheet.title}: {len(rows)} linhas")
+        return header, rows
+
+    def reset(self, spreadsheet_id: str, sheet_name: str) -> None:
+        """Descarta o cache local, forçando uma recarga completa na próxima leitura"""
+        state_path, rows_path = self._paths(spreadsheet_id, sheet_name)
+        with self._lock_for(state_path):
+            for path in (state_path, rows_path):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+# Instância global
+sheets_sync = IncrementalSheetSync()
@@ -0,0 +1,202 @@
+"""
+Cache compartilhado em dois níveis (LRU em memória + snapshot em disco)
+"""
+import json
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+import logging
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# Retornado pelo loader quando os validadores (ETag/Last-Modified) indicam que nada mudou
+NOT_MODIFIED = object()
+
+# loader(validadores anteriores) -> NOT_MODIFIED ou (valor, novos validadores)
+Loader = Callable[[Dict[str, Any]], Any]
+
+
+class SnapshotCache:
+    """Cache por processo com TTL, revalidação e stale-while-revalidate
+
+    - Nível 1: LRU em memória, compartilhado por todas as sessões do Streamlit.
+    - Nível 2: snapshot JSON em disco, para partidas a quente após um restart.
+
+    Entradas vencidas continuam sendo servidas enquanto uma única thread de
+    fundo revalida a fonte (single-flight); o loader recebe os validadores da
+    última resposta para poder fazer requisições condicionais.
+    """
+
+    # Atualizações forçadas mais próximas que isso reaproveitam a última busca
+    MIN_FORCE_INTERVAL = 10
+
+    def __init__(self, cache_dir: str, max_entries: int = 32):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._refreshing: set = set()
+
+    # ------------------------------------------------------------------
+    # Níveis de armazenamento
+    # ------------------------------------------------------------------
+    def _path(self, key: str) -> str:
+        safe_key = re.sub(r'[^A-Za-z0-9_-]+', '_', key)
+        return os.path.join(self.cache_dir, f"{safe_key}.snapshot.json")
+
+    def _remember(self, key: str, entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _lookup(self, key: str, persist: bool = True) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+
+        if not persist:
+            return None
+
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        # Idade real do snapshot: fetched_at é epoch, preservado entre restarts
+        self._remember(key, entry)
+        return entry
+
+    def _persist(self, key: str, entry: Dict[str, Any]) -> None:
+        try:
+            path = self._path(key)
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(temp_path, path)
+        except Exception as e:
+            logger.error(f"Erro ao gravar snapshot {key}: {e}")
+
+    def _key_lock(self, key: str) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    # ------------------------------------------------------------------
+    # Revalidação
+    # ------------------------------------------------------------------
+    def _refresh(self, key: str, loader: Loader, requested_at: float,
+                 persist: bool = True) -> Optional[Dict[str, Any]]:
+        """Busca na origem com single-flight; retorna a entrada atualizada"""
+        with self._key_lock(key):
+            entry = self._lookup(key, persist)
+
+            # Outra thread concluiu uma busca enquanto esperávamos o lock
+            if entry is not None and entry['fetched_at'] >= requested_at:
+                return entry
+
+            result = loader(dict(entry.get('validators', {})) if entry else {})
+            now = time.time()
+
+            if result is NOT_MODIFIED and entry is not None:
+                entry = dict(entry, fetched_at=now)
+                logger.info(f"{key}: fonte não mudou, snapshot revalidado")
+            else:
+                value, validators = result
+                entry = {'value': value, 'validators': validators or {}, 'fetched_at': now}
+                logger.info(f"{key}: snapshot atualizado")
+
+            self._remember(key, entry)
+            if persist:
+                self._persist(key, entry)
+            return entry
+
+    def _refresh_in_background(self, key: str, loader: Loader, persist: bool = True) -> None:
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        requested_at = time.time()
+
+        def run():
+            try:
+                self._refresh(key, loader, requested_at, persist)
+            except Exception as e:
+                logger.warning(f"{key}: revalidação em segundo plano falhou ({e}); mantendo snapshot antigo")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=run, name=f"snapshot-refresh-{key}", daemon=True).start()
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def get(self, key: str, loader: Loader, ttl: float, force: bool = False,
+            persist: bool = True) -> Tuple[Any, Dict[str, Any]]:
+        """Retorna (valor, info) para a chave, buscando na origem só quando necessário
+
+        info traz 'age' (segundos), 'stale', 'fetched_at' e 'validators' (ETag e
+        afins da última resposta, que identificam a versão). Se a origem falhar e
+        não houver snapshot algum, a exceção do loader é propagada. Com
+        persist=False a entrada fica só na memória (ex.: consultas filtradas).
+        """
+        entry = self._lookup(key, persist)
+        now = time.time()
+
+        if entry is not None:
+            age = now - entry['fetched_at']
+
+            if force and age >= self.MIN_FORCE_INTERVAL:
+                try:
+                    entry = self._refresh(key, loader, now, persist)
+                except Exception as e:
+                    logger.warning(f"{key}: atualização forçada falhou ({e}); servindo snapshot antigo")
+            elif age >= ttl:
+                # Stale-while-revalidate: responde já e revalida em segundo plano
+                self._refresh_in_background(key, loader, persist)
+        else:
+            entry = self._refresh(key, loader, now, persist)
+
+        age = time.time() - entry['fetched_at']
+        return entry['value'], {
+            'age': age,
+            'stale': age >= ttl,
+            'fetched_at': entry['fetched_at'],
+            'validators': dict(entry.get('validators', {}))
+        }
+
+    def expire(self, key: str) -> None:
+        """Marca a entrada como vencida, mantendo-a para servir se a origem falhar
+
+        Usado após gravar na fonte: o próximo get com force=True busca na hora,
+        sem o intervalo mínimo entre atualizações forçadas.
+        """
+        entry = self._lookup(key)
+        if entry is not None:
+            self._remember(key, dict(entry, fetched_at=0.0))
+
+    def invalidate(self, key: str) -> None:
+        """Remove a chave da memória e do disco"""
+        with self._lock:
+            self._entries.pop(key, None)
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+
+# Instância global (compartilhada por todas as sessões do processo)
+snapshot_cache = SnapshotCache(settings.SHEETS_CACHE_DIR)
@@ -0,0 +1,284 @@
+"""
+Armazenamento local do inventário em SQLite (com índices para relatórios)
+"""
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Colunas da tabela, na mesma ordem de DataManager._prepare_row_data (A-L)
+COLUMNS = [
+    ('inventoryId', 'inventory_id'),        # A - Inventory ID
+    ('itemId', 'item_id'),                  # B - Item ID
+    ('dateTime', 'date_time'),              # C - DateTime
+    ('amount', 'amount'),                   # D - Amount
+    ('building', 'building'),               # E - building
+    ('email', 'email'),                     # F - Email
+    ('invoiceNumber', 'invoice_number'),    # G - Invoice
+    ('sku', 'sku'),                         # H - Sku
+    ('location', 'location'),               # I - Andar
+    ('type', 'type'),                       # J - Tipo de movimentação
+    ('supplier', 'supplier'),               # K - Fornecedor
+    ('shelfLocation', 'shelf_location')     # L - Prateleira
+]
+
+DATE_FORMAT = '%d/%m/%Y %H:%M:%S'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS inventory (
+    id INTEGER PRIMARY KEY,
+    inventory_id TEXT UNIQUE,
+    item_id TEXT NOT NULL DEFAULT '',
+    date_time TEXT NOT NULL DEFAULT '',
+    amount REAL NOT NULL DEFAULT 0,
+    building TEXT NOT NULL DEFAULT '',
+    email TEXT NOT NULL DEFAULT '',
+    invoice_number TEXT NOT NULL DEFAULT '',
+    sku TEXT NOT NULL DEFAULT '',
+    location TEXT NOT NULL DEFAULT '',
+    type TEXT NOT NULL DEFAULT '',
+    supplier TEXT NOT NULL DEFAULT '',
+    shelf_location TEXT NOT NULL DEFAULT '',
+    ts TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_inventory_building ON inventory (building, ts);
+CREATE INDEX IF NOT EXISTS idx_inventory_item_id ON inventory (item_id, ts);
+CREATE INDEX IF NOT EXISTS idx_inventory_type ON inventory (type, ts);
+CREATE INDEX IF NOT EXISTS idx_inventory_ts ON inventory (ts);
+"""
+
+# Agrupamentos permitidos em summarize (evita SQL dinâmico arbitrário)
+GROUP_EXPRESSIONS = {
+    'building': 'building',
+    'itemId': 'item_id',
+    'type': 'type',
+    'supplier': 'supplier',
+    'location': 'location',
+    'day': 'substr(ts, 1, 10)',
+    'month': 'substr(ts, 1, 7)',
+    'year': 'substr(ts, 1, 4)'
+}
+
+
+def parse_timestamp(value: Any) -> Optional[str]:
+    """Converte o DateTime da planilha para ISO ordenável (YYYY-MM-DD HH:MM:SS)"""
+    if not value:
+        return None
+
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+
+    text = str(value).strip()
+    for fmt in (DATE_FORMAT, '%d/%m/%Y %H:%M', '%d/%m/%Y', '%Y-%m-%d %H:%M:%S', '%Y-%m-%dT%H:%M:%S'):
+        try:
+            return datetime.strptime(text, fmt).strftime('%Y-%m-%d %H:%M:%S')
+        except ValueError:
+            continue
+
+    return None
+
+
+def _to_bound(value: Any, end: bool = False) -> Optional[str]:
+    """Converte date/datetime/str em limite ISO para comparação com a coluna ts"""
+    if value is None:
+        return None
+
+    if isinstance(value, datetime):
+        return value.strftime('%Y-%m-%d %H:%M:%S')
+
+    if hasattr(value, 'strftime'):
+        # datetime.date: limite inclusivo até o fim do dia
+        return value.strftime('%Y-%m-%d') + (' 23:59:59' if end else ' 00:00:00')
+
+    return str(value)
+
+
+class InventoryStore:
+    """Backend SQLite para o DataManager"""
+
+    def __init__(self, path: str = 'inventory.db'):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+
+        with self._lock:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.executescript(SCHEMA)
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Escrita
+    # ------------------------------------------------------------------
+    def insert_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Insere registros (ignora inventoryId já existente)"""
+        rows = [self._to_row(record) for record in records]
+
+        if not rows:
+            return 0
+
+        placeholders = ', '.join(['?'] * (len(COLUMNS) + 1))
+        columns = ', '.join([column for _, column in COLUMNS] + ['ts'])
+
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany(
+                f"INSERT OR IGNORE INTO inventory ({columns}) VALUES ({placeholders})",
+                rows
+            )
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def _to_row(self, record: Dict[str, Any]) -> Tuple:
+        values = []
+        for field, _ in COLUMNS:
+            value = record.get(field, 0 if field == 'amount' else '')
+            if field == 'amount':
+                try:
+                    value = float(value or 0)
+                except (TypeError, ValueError):
+                    value = 0.0
+            elif field == 'inventoryId':
+                value = str(value) if value else None
+            else:
+                value = '' if value is None else str(value)
+            values.append(value)
+
+        values.append(parse_timestamp(record.get('dateTime')))
+        return tuple(values)
+
+    def import_records(self, records: Iterable[Dict[str, Any]], batch_size: int = 5000) -> int:
+        """Importa registros em lotes (JSON local, journal ou Google Sheets)"""
+        imported = 0
+        batch = []
+
+        for record in records:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                imported += self.insert_many(batch)
+                batch = []
+
+        if batch:
+            imported += self.insert_many(batch)
+
+        logger.info(f"{imported} registros importados para {self.path}")
+        return imported
+
+    def clear(self) -> None:
+        """Remove todos os registros"""
+        with self._lock:
+            self._conn.execute('DELETE FROM inventory')
+            self._conn.commit()
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def _where(self, filters: Dict[str, Any]) -> Tuple[str, List[Any]]:
+        clauses = []
+        params = []
+
+        for field in ('building', 'itemId', 'type'):
+            value = filters.get(field)
+            if value:
+                clauses.append(f"{GROUP_EXPRESSIONS[field]} = ?")
+                params.append(value)
+
+        start = _to_bound(filters.get('start'))
+        end = _to_bound(filters.get('end'), end=True)
+
+        if start:
+            clauses.append('ts >= ?')
+            params.append(start)
+        if end:
+            clauses.append('ts <= ?')
+            params.append(end)
+
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        return where, params
+
+    def iter_records(self, batch_size: int = 5000, **filters) -> Iterator[Dict[str, Any]]:
+        """Percorre registros em streaming (filtros: building, itemId, type, start, end)
+
+        Lê em páginas de batch_size pela chave primária; o lock só é mantido
+        durante cada consulta, não enquanto o chamador consome os registros.
+        """
+        where, params = self._where(filters)
+        where = f"{where} AND id > ?" if where else 'WHERE id > ?'
+        columns = ', '.join(column for _, column in COLUMNS)
+        last_id = 0
+
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id, {columns} FROM inventory {where} ORDER BY id LIMIT ?",
+                    params + [last_id, batch_size]
+                ).fetchall()
+
+            for row in rows:
+                yield {field: row[column] for field, column in COLUMNS}
+
+            if len(rows) < batch_size:
+                return
+            last_id = rows[-1]['id']
+
+    def summarize(self, group_by: str, **filters) -> List[Dict[str, Any]]:
+        """Agrega quantidade e número de registros por coluna/período"""
+        if group_by not in GROUP_EXPRESSIONS:
+            raise ValueError(f"Agrupamento não suportado: {group_by}")
+
+        expression = GROUP_EXPRESSIONS[group_by]
+        where, params = self._where(filters)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {expression} AS grp, SUM(amount) AS total, COUNT(*) AS records "
+                f"FROM inventory {where} GROUP BY grp ORDER BY grp",
+                params
+            ).fetchall()
+
+        return [
+            {'group': row['grp'], 'amount': row['total'] or 0, 'records': row['records']}
+            for row in rows
+            if row['grp'] is not None
+        ]
+
+    def statistics(self) -> Dict[str, Any]:
+        """Estatísticas no mesmo formato de DataManager.get_statistics"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS total, "
+                "SUM(type = 'entrada') AS entries, "
+                "SUM(type = 'perda') AS losses, "
+                "COUNT(DISTINCT item_id) AS items, "
+                "COUNT(DISTINCT building) AS buildings, "
+                "MIN(ts) AS min_ts, MAX(ts) AS max_ts "
+                "FROM inventory"
+            ).fetchone()
+
+        date_range = 'N/A'
+        if row['min_ts'] and row['max_ts']:
+            min_date = datetime.strptime(row['min_ts'][:10], '%Y-%m-%d').strftime('%d/%m/%Y')
+            max_date = datetime.strptime(row['max_ts'][:10], '%Y-%m-%d').strftime('%d/%m/%Y')
+            date_range = f"{min_date} a {max_date}"
+
+        return {
+            'total_records': row['total'] or 0,
+            'total_entries': row['entries'] or 0,
+            'total_losses': row['losses'] or 0,
+            'unique_items': row['items'] or 0,
+            'unique_buildings': row['buildings'] or 0,
+            'date_range': date_range
+        }
+
+    def count(self) -> int:
+        """Número total de registros"""
+        with self._lock:
+            return self._conn.execute('SELECT COUNT(*) FROM inventory').fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
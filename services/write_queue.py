@@ -0,0 +1,298 @@
+"""
+Fila write-behind para gravações no Google Sheets (com spool local durável)
+"""
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+import logging
+
+from services.journal_store import JournalStore
+from services.rate_limiter import sheets_rate_limiter, was_rejected
+from services.sheets_client import sheets_client_provider
+from services.sheets_row_index import get_row_index
+
+logger = logging.getLogger(__name__)
+
+
+class SheetsWriteQueue:
+    """Agrupa linhas pendentes e envia um único append_rows por flush
+
+    As linhas são gravadas primeiro em um spool local (journal append-only), de
+    modo que sobrevivem a um restart. Um arquivo de ack guarda o último número
+    de sequência confirmado pela planilha.
+
+    Depois de uma falha ambígua (5xx ou timeout de leitura: o append pode ter
+    sido aplicado) ou de um restart com linhas pendentes, a fila lê a coluna de
+    chaves (key_column, o Inventory ID) antes de reenviar e descarta as linhas
+    que já estão na planilha. Só linhas sem chave podem ser duplicadas.
+
+    Um lote que falha max_attempts vezes seguidas é movido para um arquivo de
+    dead-letter ({spool}.dead) para não bloquear o restante da fila.
+    """
+
+    # A cada quantas linhas confirmadas o spool é reescrito quando não esvazia
+    SPOOL_REWRITE_EVERY = 10000
+
+    def __init__(self, spreadsheet_id: str, sheet_name: str, spool_path: str,
+                 batch_size: int = 200, flush_interval: float = 5.0,
+                 retry_interval: float = 10.0, max_retry_interval: float = 300.0,
+                 max_attempts: int = 10, key_column: int = 1):
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.retry_interval = retry_interval
+        self.max_retry_interval = max_retry_interval
+        self.max_attempts = max_attempts
+        self.key_column = key_column
+
+        self.spool = JournalStore(spool_path)
+        self.ack_path = f"{spool_path}.ack"
+        self.dead_letter = JournalStore(f"{spool_path}.dead")
+        self.row_index = get_row_index(spreadsheet_id, sheet_name, key_column)
+
+        self._condition = threading.Condition()
+        self._worker = None
+        self._stop = False
+        self._force_flush = False
+
+        self._pending: List[Dict[str, Any]] = []
+        self._oldest_pending_at: Optional[float] = None
+        self._flushed_seq = 0
+        self._next_seq = 1
+        self._failures = 0
+        self._last_flush_at: Optional[str] = None
+        self._last_error: Optional[str] = None
+        self._flushed_rows = 0
+        self._dead_rows = 0
+        self._rewritten_seq = 0
+        self._verify_before_send = False
+
+        self._load_spool()
+
+    # ------------------------------------------------------------------
+    # Estado persistente
+    # ------------------------------------------------------------------
+    def _load_spool(self) -> None:
+        """Recupera linhas ainda não confirmadas (após restart)"""
+        try:
+            with open(self.ack_path, 'r', encoding='utf-8') as f:
+                self._flushed_seq = json.load(f).get('flushed_seq', 0)
+        except (OSError, ValueError):
+            self._flushed_seq = 0
+
+        max_seq = self._flushed_seq
+        for entry in self.spool.iter_records():
+            max_seq = max(max_seq, entry['seq'])
+            if entry['seq'] > self._flushed_seq:
+                self._pending.append(entry)
+
+        self._next_seq = max_seq + 1
+        self._rewritten_seq = self._flushed_seq
+
+        if self._pending:
+            # Uma queda entre o append_rows e o ack deixa o último lote incerto
+            self._verify_before_send = True
+            self._oldest_pending_at = time.monotonic()
+            logger.info(f"{len(self._pending)} linhas pendentes recuperadas do spool")
+
+    def _save_ack(self) -> None:
+        os.makedirs(os.path.dirname(self.ack_path) or '.', exist_ok=True)
+        temp_path = f"{self.ack_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'flushed_seq': self._flushed_seq}, f)
+        os.replace(temp_path, self.ack_path)
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
+    def enqueue(self, rows: List[List[Any]]) -> int:
+        """Enfileira linhas (não bloqueia na planilha); retorna o seq da última"""
+        if not rows:
+            return self._next_seq - 1
+
+        with self._condition:
+            entries = []
+            for row in rows:
+                entries.append({'seq': self._next_seq, 'row': row})
+                self._next_seq += 1
+
+            # Durável antes de confirmar para o chamador
+            self.spool.append_many(entries)
+
+            if not self._pending:
+                self._oldest_pending_at = time.monotonic()
+            self._pending.extend(entries)
+
+            self._ensure_worker()
+            self._condition.notify_all()
+
+            return entries[-1]['seq']
+
+    def resume(self) -> None:
+        """Inicia o worker se houver linhas pendentes de uma execução anterior"""
+        with self._condition:
+            if self._pending:
+                self._ensure_worker()
+
+    def is_flushed(self, seq: int) -> bool:
+        """Indica se a linha com o seq informado já foi gravada na planilha"""
+        return seq <= self._flushed_seq
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Força um flush imediato e aguarda a fila esvaziar (ou o timeout)"""
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._condition:
+            if not self._pending:
+                return True
+
+            self._force_flush = True
+            self._ensure_worker()
+            self._condition.notify_all()
+
+            while self._pending:
+                remaining = deadline - time.monotonic() if deadline is not None else None
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._condition.wait(remaining)
+
+            return True
+
+    def status(self) -> Dict[str, Any]:
+        """Situação atual da fila"""
+        with self._condition:
+            return {
+                'pending': len(self._pending),
+                'flushed_seq': self._flushed_seq,
+                'last_seq': self._next_seq - 1,
+                'flushed_rows': self._flushed_rows,
+                'last_flush_at': self._last_flush_at,
+                'last_error': self._last_error,
+                'consecutive_failures': self._failures,
+                'dead_lettered': self._dead_rows,
+                'dead_letter_path': self.dead_letter.path,
+                'worker_running': bool(self._worker and self._worker.is_alive())
+            }
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Encerra o worker (as linhas pendentes continuam no spool)"""
+        with self._condition:
+            self._stop = True
+            self._condition.notify_all()
+            worker = self._worker
+
+        if worker:
+            worker.join(timeout)
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._stop = False
+            self._worker = threading.Thread(target=self._run, name='sheets-write-queue', daemon=True)
+            self._worker.start()
+
+    def _next_batch(self) -> Optional[List[Dict[str, Any]]]:
+        """Aguarda até o lote encher, o intervalo vencer ou um flush ser pedido"""
+        with self._condition:
+            while not self._stop:
+                if self._pending:
+                    age = time.monotonic() - (self._oldest_pending_at or time.monotonic())
+                    if self._force_flush or len(self._pending) >= self.batch_size or age >= self.flush_interval:
+                        return list(self._pending[:self.batch_size])
+                    self._condition.wait(self.flush_interval - age)
+                else:
+                    self._force_flush = False
+                    self._condition.wait()
+            return None
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+
+            try:
+                unsent = self._unsent(batch) if self._verify_before_send else batch
+                if unsent:
+                    worksheet = sheets_client_provider.get_worksheet(self.spreadsheet_id, self.sheet_name)
+                    sheets_rate_limiter.call(
+                        'write', worksheet.append_rows,
+                        [entry['row'] for entry in unsent], value_input_option='USER_ENTERED',
+                        idempotent=False
+                    )
+            except Exception as e:
+                sheets_client_provider.invalidate(self.spreadsheet_id, self.sheet_name)
+                with self._condition:
+                    if not was_rejected(e):
+                        self._verify_before_send = True
+                    self._failures += 1
+                    self._last_error = str(e)
+                    failures = self._failures
+                    delay = min(self.retry_interval * 2 ** (self._failures - 1), self.max_retry_interval)
+
+                if failures >= self.max_attempts:
+                    logger.error(
+                        f"Lote de {len(batch)} linhas falhou {failures} vezes em {self.sheet_name}: {e}. "
+                        f"Movido para {self.dead_letter.path}"
+                    )
+                    self.dead_letter.append_many(
+                        {**entry, 'error': str(e), 'failed_at': datetime.now().strftime('%d/%m/%Y %H:%M:%S')}
+                        for entry in batch
+                    )
+                    with self._condition:
+                        self._dead_rows += len(batch)
+                        self._ack_batch(batch)
+                    continue
+
+                logger.error(f"Falha ao gravar {len(batch)} linhas em {self.sheet_name}: {e}. Nova tentativa em {delay:.0f}s")
+
+                with self._condition:
+                    self._condition.wait_for(lambda: self._stop, timeout=delay)
+                continue
+
+            with self._condition:
+                self._verify_before_send = False
+                self._flushed_rows += len(batch)
+                self._last_error = None
+                self._last_flush_at = datetime.now().strftime('%d/%m/%Y %H:%M:%S')
+                self._ack_batch(batch)
+
+            logger.info(f"{len(unsent)} linhas gravadas em {self.sheet_name} em um único append_rows")
+
+    def _unsent(self, batch: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Entradas do lote cuja chave ainda não está na planilha (releitura da coluna)"""
+        self.row_index.invalidate()
+        present = set(self.row_index.keys())
+
+        unsent = [entry for entry in batch if str(entry['row'][self.key_column - 1]).strip() not in present]
+        if len(unsent) < len(batch):
+            logger.info(
+                f"{len(batch) - len(unsent)} linhas do lote já estavam em {self.sheet_name} "
+                f"(append anterior aplicado); não serão reenviadas"
+            )
+        return unsent
+
+    def _ack_batch(self, batch: List[Dict[str, Any]]) -> None:
+        """Remove o lote da fila (gravado ou movido para dead-letter); chamar com o lock"""
+        self._pending = self._pending[len(batch):]
+        self._flushed_seq = batch[-1]['seq']
+        self._failures = 0
+        self._oldest_pending_at = time.monotonic() if self._pending else None
+        self._save_ack()
+
+        if not self._pending:
+            # Tudo confirmado: o spool pode ser descartado
+            self.spool.clear()
+            self._force_flush = False
+        elif (self._flushed_seq - self._rewritten_seq) >= self.SPOOL_REWRITE_EVERY:
+            # Sob carga contínua a fila nunca esvazia: reescreve só o pendente (troca atômica)
+            self.spool.rewrite(self._pending)
+            self._rewritten_seq = self._flushed_seq
+
+        self._condition.notify_all()
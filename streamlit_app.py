@@ -10,6 +10,13 @@ from datetime import datetime, timedelta
 import numpy as np
 import uuid
 
+from config_app import AppConfig
+from data_manager import data_manager
+from services.inventory import inventory_service
+from services.inventory_repository import InventorySnapshot, inventory_repository
+from services.movement_table import MovementTable, date_texts
+from utils.item_catalog import item_catalog
+
 # Configuração
 st.set_page_config(
     page_title="Controle de Perdas e Entradas - Gadgets",
@@ -126,28 +133,6 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Dados do sistema
-ITEMS_BY_BUILDING = {
-    'Spark': ['Headset-spk', 'Mouse-spk', 'Teclado k120-spk', 'Adaptadores usb c-spk', 'Usb Gorila 6m1 spk'],
-    'HQ1': ['Headset-hq1', 'Mouse-hq1', 'Teclado k120-hq1', 'Adaptadores usb c-hq1', 'Usb Gorila 6m1 hq1'],
-    'HQ2': ['Headset-hq2', 'Mouse-hq2', 'Teclado k120-hq2', 'Adaptadores usb c-hq2', 'Usb Gorila 6m1 hq2']
-}
-
-ITEM_NAMES = {
-    'Headset-spk': 'Headset - Spark', 'Mouse-spk': 'Mouse - Spark', 'Teclado k120-spk': 'Teclado K120 - Spark',
-    'Adaptadores usb c-spk': 'Adaptador USB-C - Spark', 'Usb Gorila 6m1 spk': 'USB Gorila 6-em-1 - Spark',
-    'Headset-hq1': 'Headset - HQ1', 'Mouse-hq1': 'Mouse - HQ1', 'Teclado k120-hq1': 'Teclado K120 - HQ1',
-    'Adaptadores usb c-hq1': 'Adaptador USB-C - HQ1', 'Usb Gorila 6m1 hq1': 'USB Gorila 6-em-1 - HQ1',
-    'Headset-hq2': 'Headset - HQ2', 'Mouse-hq2': 'Mouse - HQ2', 'Teclado k120-hq2': 'Teclado K120 - HQ2',
-    'Adaptadores usb c-hq2': 'Adaptador USB-C - HQ2', 'Usb Gorila 6m1 hq2': 'USB Gorila 6-em-1 - HQ2'
-}
-
-BUILDING_FLOORS = {
-    'HQ1': ["2° ANDAR L MAIOR", "2° ANDAR L MENOR", "4° ANDAR", "6° ANDAR L MAIOR", "8° ANDAR L MAIOR"],
-    'HQ2': ["2° ANDAR L MAIOR", "4° ANDAR L MENOR", "8° ANDAR", "12° ANDAR", "15° ANDAR"],
-    'Spark': ["1° ANDAR", "2° ANDAR", "3° ANDAR"]
-}
-
 def generate_id():
     return f'INV_{int(datetime.now().timestamp() * 1000)}_{str(uuid.uuid4()).split("-")[0].upper()}'
 
@@ -173,6 +158,8 @@ def main():
     </div>
     """, unsafe_allow_html=True)
     
+    show_inventory_updates()
+    
     # Layout principal
     col_main, col_sidebar = st.columns([1.6, 1])
     
@@ -185,6 +172,21 @@ def main():
     # Modais
     show_modals()
 
+def show_inventory_updates():
+    """Avisa a sessão sobre registros feitos em outras sessões desde o último rerun"""
+    snapshot = inventory_service.snapshot()
+    seen = st.session_state.get('inventory_version')
+    
+    if inventory_repository.changed_since(seen) and seen is not None:
+        st.toast(f"🔄 Inventário atualizado: {len(snapshot)} registros")
+    
+    st.session_state.inventory_version = snapshot.version
+
+def current_snapshot():
+    """Dados exibidos nesta sessão: a amostra local (botão Exemplo) ou o inventário compartilhado"""
+    sample = st.session_state.get('sample_snapshot')
+    return sample if sample is not None else inventory_service.snapshot()
+
 def show_main_panel():
     st.markdown('<div class="section-title">➖ Registrar Perda</div>', unsafe_allow_html=True)
     
@@ -192,14 +194,14 @@ def show_main_panel():
         col1, col2 = st.columns(2)
         
         with col1:
-            building = st.selectbox("Prédio *", [""] + list(ITEMS_BY_BUILDING.keys()))
+            building = st.selectbox("Prédio *", [""] + item_catalog.buildings())
         with col2:
             email = st.text_input("Email", placeholder="seu.email@exemplo.com.br")
         
         floor = ""
         if building:
             st.markdown(f'<div class="building-group"><strong>🏢 {building}</strong></div>', unsafe_allow_html=True)
-            floor = st.selectbox(f"Andar ({building})", [""] + BUILDING_FLOORS.get(building, []))
+            floor = st.selectbox(f"Andar ({building})", [""] + AppConfig.BUILDING_FLOORS.get(building, []))
         
         if building and floor:
             st.markdown(f'<div class="location-info"><strong>Local:</strong> {building} - {floor}</div>', unsafe_allow_html=True)
@@ -212,13 +214,13 @@ def show_main_panel():
             for i in range(num_items):
                 col_item, col_qty = st.columns([2, 1])
                 with col_item:
-                    item = st.selectbox(f"Item {i+1}", [""] + ITEMS_BY_BUILDING.get(building, []), 
-                                      format_func=lambda x: "Selecione" if x == "" else ITEM_NAMES.get(x, x), key=f"item_{i}")
+                    item = st.selectbox(f"Item {i+1}", [""] + item_catalog.items(building), 
+                                      format_func=lambda x: "Selecione" if x == "" else item_catalog.name(x), key=f"item_{i}")
                 with col_qty:
                     qty = st.number_input("Qtd", 1, 1000, 1, key=f"qty_{i}")
                 
                 if item:
-                    items_data.append({'itemId': item, 'quantity': qty, 'name': ITEM_NAMES.get(item, item)})
+                    items_data.append({'itemId': item, 'quantity': qty, 'name': item_catalog.name(item)})
         
         submitted = st.form_submit_button("📝 Registrar Perda", type="primary", disabled=not (building and floor and items_data))
         
@@ -282,7 +284,7 @@ def show_entry_modal():
     with st.form("entry_form"):
         col1, col2 = st.columns(2)
         with col1:
-            building = st.selectbox("Prédio *", [""] + list(ITEMS_BY_BUILDING.keys()), key="entry_building")
+            building = st.selectbox("Prédio *", [""] + item_catalog.buildings(), key="entry_building")
             email = st.text_input("Email", key="entry_email")
         with col2:
             invoice = st.text_input("Nota Fiscal")
@@ -290,7 +292,7 @@ def show_entry_modal():
         
         floor = ""
         if building:
-            floors = ["ESTOQUE"] + BUILDING_FLOORS.get(building, [])
+            floors = ["ESTOQUE"] + AppConfig.BUILDING_FLOORS.get(building, [])
             floor = st.selectbox(f"Andar ({building})", [""] + floors, key="entry_floor")
         
         items = []
@@ -301,13 +303,13 @@ def show_entry_modal():
             for i in range(num):
                 col_item, col_qty = st.columns([2, 1])
                 with col_item:
-                    item = st.selectbox(f"Item {i+1}", [""] + ITEMS_BY_BUILDING.get(building, []), 
-                                      format_func=lambda x: "Selecione" if x == "" else ITEM_NAMES.get(x, x), key=f"entry_item_{i}")
+                    item = st.selectbox(f"Item {i+1}", [""] + item_catalog.items(building), 
+                                      format_func=lambda x: "Selecione" if x == "" else item_catalog.name(x), key=f"entry_item_{i}")
                 with col_qty:
                     qty = st.number_input("Qtd", 1, 1000, 1, key=f"entry_qty_{i}")
                 
                 if item:
-                    items.append({'itemId': item, 'quantity': qty, 'name': ITEM_NAMES.get(item, item)})
+                    items.append({'itemId': item, 'quantity': qty, 'name': item_catalog.name(item)})
         
         if st.form_submit_button("➕ Registrar Entrada", type="primary", disabled=not (building and floor and items)):
             process_registration(building, floor, email, items, 'entrada', invoice, '', supplier, '')
@@ -372,10 +374,10 @@ def show_dashboard_modal():
         st.rerun()
     
     # Gráficos
-    data = st.session_state.get('inventory_data', [])
+    snapshot = current_snapshot()
     
-    if data:
-        df = pd.DataFrame(data)
+    if snapshot:
+        df = snapshot.frame
         
         # Por prédio
         building_counts = df['building'].value_counts()
@@ -392,6 +394,7 @@ def show_dashboard_modal():
 def process_registration(building, floor, email, items, reg_type, invoice='', sku='', supplier='', shelf=''):
     try:
         timestamp = datetime.now()
+        entries = []
         
         for item in items:
             entry = {
@@ -408,11 +411,18 @@ def process_registration(building, floor, email, items, reg_type, invoice='', sk
                 'supplier': supplier,
                 'shelfLocation': shelf
             }
-            
-            if 'inventory_data' not in st.session_state:
-                st.session_state.inventory_data = []
-            
-            st.session_state.inventory_data.append(entry)
+            entries.append(entry)
+        
+        # Journal local + fila write-behind do Sheets (não bloqueia a interface);
+        # publicado no repositório compartilhado, visível para todas as sessões
+        if not inventory_service.add_entries(entries):
+            st.error("❌ Não foi possível salvar o registro")
+            return
+        
+        # A própria gravação não gera aviso de atualização nesta sessão
+        st.session_state.inventory_version = inventory_repository.version
+        # Registro real: sai do modo de exemplo
+        st.session_state.pop('sample_snapshot', None)
         
         st.markdown(f'<div class="success-message">✅ {reg_type.title()} registrada com sucesso!</div>', unsafe_allow_html=True)
         st.balloons()
@@ -421,23 +431,21 @@ def process_registration(building, floor, email, items, reg_type, invoice='', sk
         st.error(f"❌ Erro: {e}")
 
 def show_table():
-    data = st.session_state.get('inventory_data', [])
+    snapshot = current_snapshot()
     
-    if data:
-        entries = [d for d in data if d.get('type') == 'entrada']
+    if snapshot:
+        frame = snapshot.frame
+        entries = frame[frame['type'] == 'entrada']
         
-        if entries:
-            df = pd.DataFrame([
-                {
-                    'Data': e.get('dateTime', ''),
-                    'Item': e.get('itemId', ''),
-                    'Qtd': f"+{abs(e.get('amount', 0))}",
-                    'Prédio': e.get('building', ''),
-                    'NF': e.get('invoiceNumber', ''),
-                    'Fornecedor': e.get('supplier', '')
-                }
-                for e in entries
-            ])
+        if not entries.empty:
+            df = pd.DataFrame({
+                'Data': date_texts(entries),
+                'Item': entries['itemId'],
+                'Qtd': '+' + entries['amount'].abs().map('{:g}'.format),
+                'Prédio': entries['building'],
+                'NF': entries['invoiceNumber'],
+                'Fornecedor': entries['supplier']
+            })
             
             st.dataframe(df, use_container_width=True, hide_index=True)
             st.metric("📊 Entradas", len(entries))
@@ -445,12 +453,23 @@ def show_table():
 def load_data():
     st.info("📥 Carregando do Google Sheets...")
     # Simular carregamento
+    st.session_state.pop('sample_snapshot', None)
     st.session_state.inventory_status = "✅ Dados carregados"
 
 def save_data():
-    data = st.session_state.get('inventory_data', [])
+    data = inventory_service.snapshot()
     if data:
         st.success(f"💾 {len(data)} registros salvos!")
+        
+        status = data_manager.get_sheets_sync_status()
+        if status['pending']:
+            st.info(f"⏳ {status['pending']} registros aguardando envio ao Google Sheets")
+        if status['last_error']:
+            st.warning(f"⚠️ Última falha ao enviar ao Google Sheets: {status['last_error']}")
+        if status['dead_lettered']:
+            st.error(f"❌ {status['dead_lettered']} registros não puderam ser enviados e foram separados em {status['dead_letter_path']}")
+        if status['rate_limit']['quota_errors']:
+            st.info(f"🐢 Quota do Google Sheets atingida {status['rate_limit']['quota_errors']}x; envios sendo repetidos com backoff")
     else:
         st.warning("⚠️ Nenhum dado para salvar")
 
@@ -472,7 +491,8 @@ def create_sample():
             'shelfLocation': f'P-A{i}'
         })
     
-    st.session_state.inventory_data = sample
+    # Só nesta sessão: não grava nem entra no repositório compartilhado
+    st.session_state.sample_snapshot = InventorySnapshot(0, MovementTable(sample).view())
     st.success("🎲 Dados criados!")
 
 if __name__ == "__main__":
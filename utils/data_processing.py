@@ -1,14 +1,29 @@
 """
 Utilitários para processamento de dados
 """
+import codecs
+import csv
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, Union
 import logging
 
+from utils.item_catalog import item_catalog
+
 logger = logging.getLogger(__name__)
 
+# Formatos aceitos para o dia das movimentações (prefixo de DD/MM/AAAA HH:MM:SS)
+DAY_FORMATS = ['%d/%m/%Y', '%Y-%m-%d']
+
+# Chave numérica ordenável de cada período: (ano, parte) -> ano * fator + parte
+PERIOD_FACTORS = {
+    'weekly': 100,
+    'monthly': 100,
+    'quarterly': 10,
+    'yearly': 1
+}
+
 class DataProcessor:
     """Classe para processamento de dados"""
     
@@ -89,23 +104,7 @@ class DataProcessor:
     @staticmethod
     def categorize_item_type(item_id: str) -> str:
         """Categoriza tipo de item baseado no ID"""
-        if not item_id:
-            return 'Outros'
-        
-        item_lower = item_id.lower()
-        
-        if 'headset' in item_lower:
-            return 'Headsets'
-        elif 'mouse' in item_lower:
-            return 'Mouses'
-        elif 'teclado' in item_lower:
-            return 'Teclados'
-        elif 'adaptador' in item_lower or 'usb c' in item_lower:
-            return 'Adaptadores'
-        elif 'usb gorila' in item_lower or 'gorila' in item_lower:
-            return 'USB Gorila'
-        else:
-            return 'Outros'
+        return item_catalog.category(item_id)
     
     @staticmethod
     def get_week_number(date: datetime) -> int:
@@ -117,36 +116,99 @@ class DataProcessor:
         """Obtém trimestre da data"""
         return (date.month - 1) // 3 + 1
     
+    @staticmethod
+    def parse_days(values: pd.Series) -> pd.Series:
+        """Dia (datetime64 à meia-noite) de cada data/hora
+        
+        Cada dia distinto é interpretado uma única vez, com formato fixo
+        (DAY_FORMATS); valores fora desses formatos viram NaT.
+        """
+        if pd.api.types.is_datetime64_any_dtype(values):
+            return values.dt.normalize()
+        
+        codes, prefixes = pd.factorize(values.astype(str).str.strip().str.slice(0, 10))
+        prefixes = pd.Series(prefixes, dtype=object)
+        
+        days = pd.to_datetime(prefixes, format=DAY_FORMATS[0], errors='coerce')
+        for fmt in DAY_FORMATS[1:]:
+            missing = days.isna()
+            if not missing.any():
+                break
+            days[missing] = pd.to_datetime(prefixes[missing], format=fmt, errors='coerce')
+        
+        parsed = days.to_numpy()[codes]
+        parsed[codes < 0] = np.datetime64('NaT')
+        return pd.Series(parsed, index=values.index)
+    
+    @staticmethod
+    def period_keys(dates: pd.Series, period: str) -> Optional[pd.Series]:
+        """Chave inteira ordenável do período de cada data (None se período inválido)"""
+        if period == 'weekly':
+            iso = dates.dt.isocalendar()
+            return iso['year'].astype('int64') * 100 + iso['week'].astype('int64')
+        if period == 'monthly':
+            return dates.dt.year * 100 + dates.dt.month
+        if period == 'quarterly':
+            return dates.dt.year * 10 + dates.dt.quarter
+        if period == 'yearly':
+            return dates.dt.year.astype('int64')
+        return None
+    
+    @staticmethod
+    def period_label(key: int, period: str) -> str:
+        """Rótulo de exibição de uma chave de período"""
+        year, part = divmod(int(key), PERIOD_FACTORS[period])
+        
+        if period == 'weekly':
+            return f"Sem {part}/{year}"
+        if period == 'monthly':
+            return datetime(year, part, 1).strftime('%b/%Y')
+        if period == 'quarterly':
+            return f"Q{part}/{year}"
+        return str(key)
+    
+    @staticmethod
+    def aggregate_frame_by_period(df: pd.DataFrame, period: str, date_column: str,
+                                  value_columns: Union[str, List[str]],
+                                  group_keys: Optional[List[str]] = None) -> pd.DataFrame:
+        """Soma as colunas de valor por período (e chaves extras), sem alterar df
+        
+        Retorna colunas period (chave ordenável), label, group_keys e os valores,
+        ordenadas por período. Rótulos são calculados só para os períodos distintos.
+        """
+        value_columns = [value_columns] if isinstance(value_columns, str) else list(value_columns)
+        group_keys = list(group_keys or [])
+        columns = ['period', 'label'] + group_keys + value_columns
+        
+        if period not in PERIOD_FACTORS:
+            raise ValueError(f"Período não suportado: {period}")
+        
+        if df.empty:
+            return pd.DataFrame(columns=columns)
+        
+        dates = DataProcessor.parse_days(df[date_column])
+        valid = dates.notna()
+        
+        values = df.loc[valid, group_keys + value_columns].copy()
+        for column in value_columns:
+            values[column] = pd.to_numeric(values[column], errors='coerce').fillna(0)
+        values['period'] = DataProcessor.period_keys(dates[valid], period)
+        
+        grouped = values.groupby(['period'] + group_keys, as_index=False, sort=True)[value_columns].sum()
+        
+        labels = {key: DataProcessor.period_label(key, period) for key in grouped['period'].unique()}
+        grouped['label'] = grouped['period'].map(labels)
+        
+        return grouped[columns]
+    
     @staticmethod
     def aggregate_by_period(df: pd.DataFrame, period: str, date_column: str, value_column: str) -> Dict[str, Any]:
         """Agrega dados por período"""
         try:
-            if df.empty:
-                return {'labels': [], 'values': []}
-            
-            # Converter coluna de data
-            df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
-            df = df.dropna(subset=[date_column])
-            
-            if period == 'weekly':
-                df['period'] = df[date_column].dt.strftime('%Y-W%U')
-                df['label'] = df[date_column].apply(lambda x: f"Sem {x.isocalendar()[1]}/{x.year}")
-            elif period == 'monthly':
-                df['period'] = df[date_column].dt.strftime('%Y-%m')
-                df['label'] = df[date_column].dt.strftime('%b/%Y')
-            elif period == 'quarterly':
-                df['quarter'] = df[date_column].apply(lambda x: DataProcessor.get_quarter(x))
-                df['period'] = df[date_column].dt.year.astype(str) + '-Q' + df['quarter'].astype(str)
-                df['label'] = 'Q' + df['quarter'].astype(str) + '/' + df[date_column].dt.year.astype(str)
-            elif period == 'yearly':
-                df['period'] = df[date_column].dt.year.astype(str)
-                df['label'] = df[date_column].dt.year.astype(str)
-            else:
+            if df.empty or period not in PERIOD_FACTORS:
                 return {'labels': [], 'values': []}
             
-            # Agrupar por período
-            grouped = df.groupby(['period', 'label'])[value_column].sum().reset_index()
-            grouped = grouped.sort_values('period')
+            grouped = DataProcessor.aggregate_frame_by_period(df, period, date_column, value_column)
             
             return {
                 'labels': grouped['label'].tolist(),
@@ -248,21 +310,20 @@ class DataProcessor:
     @staticmethod
     def parse_csv_line(line: str) -> List[str]:
         """Parseia linha CSV considerando aspas"""
-        result = []
-        current = ''
-        in_quotes = False
-        
-        for char in line:
-            if char == '"':
-                in_quotes = not in_quotes
-            elif char == ',' and not in_quotes:
-                result.append(current.strip())
-                current = ''
-            else:
-                current += char
-        
-        result.append(current.strip())
-        return result
+        values = next(csv.reader([line], skipinitialspace=True), [])
+        return [value.strip() for value in values] or ['']
+    
+    @staticmethod
+    def detect_encoding(sample: bytes) -> str:
+        """Detecta a codificação a partir do início do arquivo (UTF-8 com/sem BOM ou latin1)"""
+        if sample.startswith(codecs.BOM_UTF8):
+            return 'utf-8-sig'
+        try:
+            # Incremental: um caractere multibyte cortado no fim da amostra não é erro
+            codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+            return 'utf-8'
+        except UnicodeDecodeError:
+            return 'latin1'
     
     @staticmethod
     def generate_summary_report(data: List[Dict[str, Any]], title: str) -> Dict[str, Any]:
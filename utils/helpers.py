@@ -8,6 +8,8 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import logging
 
+from utils.data_processing import DataProcessor
+
 logger = logging.getLogger(__name__)
 
 def setup_page_config(page_title: str = "Sistema de Controle", layout: str = "wide"):
@@ -224,16 +226,18 @@ def validate_uploaded_file(uploaded_file, allowed_types: List[str] = ['csv', 'xl
     file_extension = uploaded_file.name.split('.')[-1].lower()
     return file_extension in allowed_types
 
-def parse_uploaded_csv(uploaded_file) -> pd.DataFrame:
-    """Parseia arquivo CSV enviado"""
+def parse_uploaded_csv(uploaded_file, nrows: Optional[int] = None) -> pd.DataFrame:
+    """Parseia arquivo CSV enviado (nrows limita a leitura às primeiras linhas)"""
     try:
-        return pd.read_csv(uploaded_file, encoding='utf-8')
-    except UnicodeDecodeError:
-        try:
-            return pd.read_csv(uploaded_file, encoding='latin1')
-        except Exception as e:
-            logger.error(f"Erro ao ler CSV: {e}")
-            return pd.DataFrame()
+        uploaded_file.seek(0)
+        encoding = DataProcessor.detect_encoding(uploaded_file.read(64 * 1024))
+        uploaded_file.seek(0)
+        return pd.read_csv(uploaded_file, encoding=encoding, nrows=nrows)
+    except Exception as e:
+        logger.error(f"Erro ao ler CSV: {e}")
+        return pd.DataFrame()
+    finally:
+        uploaded_file.seek(0)
 
 def parse_uploaded_excel(uploaded_file, sheet_name: str = None) -> pd.DataFrame:
     """Parseia arquivo Excel enviado"""
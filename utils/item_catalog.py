@@ -0,0 +1,97 @@
+"""
+Catálogo de itens: categoria, prédio, nome e preço por itemId
+"""
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional
+import logging
+
+import pandas as pd
+
+from config.settings import settings
+from config_app import AppConfig
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATEGORY = 'Outros'
+
+# Regras para IDs fora do catálogo: primeira categoria com algum trecho contido no ID
+CATEGORY_RULES = [
+    ('Headsets', ('headset',)),
+    ('Mouses', ('mouse',)),
+    ('Teclados', ('teclado',)),
+    ('Adaptadores', ('adaptador', 'usb c')),
+    ('USB Gorila', ('gorila',))
+]
+
+
+class ItemInfo(NamedTuple):
+    category: str
+    building: str
+    name: str
+    price: Optional[float]
+
+
+@lru_cache(maxsize=4096)
+def categorize(item_id: str) -> str:
+    """Categoria pelas regras de substring (memoizada por ID)"""
+    item_lower = item_id.lower()
+    for category, patterns in CATEGORY_RULES:
+        if any(pattern in item_lower for pattern in patterns):
+            return category
+    return DEFAULT_CATEGORY
+
+
+class ItemCatalog:
+    """Catálogo pré-calculado a partir de ITEMS_BY_BUILDING/ITEM_NAMES
+
+    IDs cadastrados são resolvidos por dicionário; os demais caem nas regras
+    de categorize. map() resolve uma Series inteira uma vez por valor distinto.
+    """
+
+    def __init__(self, items_by_building: Dict[str, List[str]], item_names: Dict[str, str],
+                 prices: Dict[str, float]):
+        self.prices = prices
+        self._by_building = {building: list(items) for building, items in items_by_building.items()}
+        self._items: Dict[str, ItemInfo] = {}
+
+        for building, items in items_by_building.items():
+            for item_id in items:
+                category = categorize(item_id)
+                self._items[item_id] = ItemInfo(category, building, item_names.get(item_id, item_id), prices.get(category))
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._items
+
+    def buildings(self) -> List[str]:
+        """Prédios do catálogo, na ordem do AppConfig"""
+        return list(self._by_building)
+
+    def items(self, building: str) -> List[str]:
+        """IDs dos itens de um prédio, na ordem do AppConfig ([] se o prédio não existe)"""
+        return list(self._by_building.get(building, []))
+
+    def name(self, item_id: str) -> str:
+        """Nome de exibição do item (o próprio ID se não estiver cadastrado)"""
+        return self.get(item_id).name
+
+    def get(self, item_id: str) -> ItemInfo:
+        """Dados do item (fora do catálogo: categoria pelas regras, sem prédio)"""
+        info = self._items.get(item_id)
+        if info is None:
+            category = categorize(item_id or '')
+            info = ItemInfo(category, '', item_id or '', self.prices.get(category))
+        return info
+
+    def category(self, item_id: str) -> str:
+        info = self._items.get(item_id)
+        return info.category if info is not None else categorize(item_id or '')
+
+    def map(self, item_ids: pd.Series, field: str = 'category') -> pd.Series:
+        """Campo de ItemInfo para cada ID da Series (calculado só para os IDs distintos)"""
+        codes, uniques = pd.factorize(item_ids.fillna('').astype(str))
+        values = pd.array([getattr(self.get(item_id), field) for item_id in uniques])
+        return pd.Series(values.take(codes), index=item_ids.index, name=field)
+
+
+# Instância global
+item_catalog = ItemCatalog(AppConfig.ITEMS_BY_BUILDING, AppConfig.ITEM_NAMES, settings.ITEM_PRICES)